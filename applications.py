@@ -0,0 +1,169 @@
+# applications.py
+"""Job applications stored in data/application.json.
+
+Applications are indexed by job (job id -> application ids), by seeker
+(seeker id -> application ids) and by (job id, seeker id), which makes the
+duplicate-apply check a dict lookup. The number of distinct
+employer-seeker connections is counted as applications are added, so the
+landing page never has to scan. Like jobs.JobStore, the indexes are built
+once per file version and updated in place on this store's own writes.
+"""
+import os
+import threading
+from datetime import datetime
+
+import utils
+from notifications import publish
+
+APPLICATIONS_FILE = os.path.join(utils.DATA_FOLDER, "application.json")
+APPLICATION_STATUSES = ["applied", "shortlisted", "hired", "rejected"]
+# Allowed status changes; hired and rejected are final
+STATUS_TRANSITIONS = {
+    "applied": {"shortlisted", "hired", "rejected"},
+    "shortlisted": {"hired", "rejected"},
+    "hired": set(),
+    "rejected": set(),
+}
+STATUS_LABELS = {"applied": "📨 Applied", "shortlisted": "⭐ Shortlisted",
+                 "hired": "✅ Hired", "rejected": "❌ Rejected"}
+
+
+class ApplicationIndex:
+    """Per-job, per-seeker and per-pair indexes plus the connections count"""
+
+    def __init__(self, applications=()):
+        self.by_id = {}
+        self.by_job = {}
+        self.by_seeker = {}
+        self.by_pair = {}
+        # (employer id, seeker id) -> number of applications between them
+        self.connections = {}
+        self.max_id = 0
+        for application in applications:
+            self.add(application)
+
+    def add(self, application):
+        try:
+            application_id = int(application.get("id"))
+        except (ValueError, TypeError):
+            return
+        previous = self.by_id.get(application_id)
+        self.by_id[application_id] = application
+        self.max_id = max(self.max_id, application_id)
+        if previous is not None:
+            # Status change: the job, seeker and employer never change
+            return
+        job_id, seeker_id = application.get("job_id"), application.get("seeker_id")
+        self.by_job.setdefault(job_id, []).append(application_id)
+        self.by_seeker.setdefault(seeker_id, []).append(application_id)
+        self.by_pair[(job_id, seeker_id)] = application_id
+        pair = (application.get("employer_id"), seeker_id)
+        self.connections[pair] = self.connections.get(pair, 0) + 1
+
+
+class ApplicationStore(utils.JsonStore):
+    """Apply to jobs, move applications through their statuses and list them"""
+
+    def __init__(self, path=APPLICATIONS_FILE, journal=None):
+        super().__init__(path, journal)
+
+    def _build_index(self, applications):
+        return ApplicationIndex(applications)
+
+    def get_application(self, application_id):
+        try:
+            return self._get_index().by_id.get(int(application_id))
+        except (ValueError, TypeError):
+            return None
+
+    def find(self, job_id, seeker_id):
+        """Return the seeker's application to a job, if any"""
+        index = self._get_index()
+        application_id = index.by_pair.get((job_id, seeker_id))
+        return index.by_id.get(application_id) if application_id is not None else None
+
+    def apply(self, job, seeker_id):
+        """Apply a seeker to an open job.
+
+        Returns (True, application) or (False, error message).
+        """
+        if job is None or job.get("status", "open") != "open":
+            return False, "This job is no longer open"
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            if (job["id"], seeker_id) in index.by_pair:
+                return False, "You have already applied to this job"
+            now = datetime.now().isoformat()
+            application = {
+                "id": utils.reserve_ids(self.path, 1, floor=index.max_id + 1)[0],
+                "job_id": job["id"],
+                "seeker_id": seeker_id,
+                "employer_id": job.get("employer_id"),
+                "status": "applied",
+                "created_at": now,
+                "updated_at": now,
+            }
+            if not self._save(application):
+                self._index = None
+                return False, "Could not save the application"
+            index.add(application)
+            self._after_write()
+        publish(application["employer_id"], "application",
+                f"New application for {job.get('title', 'your job')}",
+                job_id=job["id"], application_id=application["id"])
+        return True, application
+
+    def set_status(self, application_id, status):
+        """Move an application to a new status.
+
+        Returns (True, application) or (False, error message).
+        """
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            application = self.get_application(application_id)
+            if application is None:
+                return False, "Application not found"
+            current = application.get("status", "applied")
+            if status not in STATUS_TRANSITIONS.get(current, ()):
+                return False, f"Cannot change status from {current} to {status}"
+            fields = {"status": status, "updated_at": datetime.now().isoformat()}
+            updated = dict(application, **fields)
+            if not self._save(updated, fields):
+                self._index = None
+                return False, "Could not save the application"
+            index.add(updated)
+            self._after_write()
+        publish(updated["seeker_id"], "application", f"Your application is now {status}",
+                job_id=updated["job_id"], application_id=updated["id"])
+        return True, updated
+
+    def for_job(self, job_id):
+        """Applications to a job, oldest first"""
+        index = self._get_index()
+        return [index.by_id[i] for i in index.by_job.get(job_id, ())]
+
+    def for_seeker(self, seeker_id):
+        """A seeker's applications, newest first"""
+        index = self._get_index()
+        return [index.by_id[i] for i in reversed(index.by_seeker.get(seeker_id, ()))]
+
+    def count_for_job(self, job_id):
+        return len(self._get_index().by_job.get(job_id, ()))
+
+    def count_connections(self):
+        """Number of distinct employer-seeker pairs connected by an application"""
+        return len(self._get_index().connections)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_application_store():
+    """Return the process-wide application store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ApplicationStore()
+    return _store
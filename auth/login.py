@@ -1,6 +1,7 @@
 # login.py
 import streamlit as st
-from utils import authenticate_user, read_json
+from caching import count_users
+from utils import authenticate_user, authenticate_user_by_phone
 
 def login_user(role):
     st.title(f"🔑 {'Job Seeker' if role == 'job' else 'Employer'} Login")
@@ -67,28 +68,22 @@ def login_user(role):
             if not identifier.isdigit() or len(identifier) != 10:
                 st.error("❌ Please enter a valid 10-digit phone number.")
                 return
-            user = authenticate_user(identifier.strip(), password.strip(), role)
+            user = authenticate_user_by_phone(identifier.strip(), password.strip(), role)
         
         if user:
-            st.success(f"🎉 Welcome back, {user['name']}!")
-            st.balloons()
-            
             # Store user info in session state
             st.session_state.current_user = user
             st.session_state.remember_login = remember_me
             st.session_state.page = "dashboard"
             
-            # Show quick stats about their profile
+            # Greet on the dashboard (render_notifications shows pending toasts)
+            # instead of holding this script thread for a delayed redirect
             if role == "job":
-                st.info(f"✨ Profile Summary: {user.get('experience', 'Experience not specified')} | Skills: {', '.join(user.get('work_type', ['Not specified']))}")
+                summary = f"✨ Profile Summary: {user.get('experience', 'Experience not specified')} | Skills: {', '.join(user.get('work_type') or ['Not specified'])}"
             else:
-                st.info(f"🏢 Company: {user.get('company_name', 'Company name not specified')} | Type: {user.get('company_type', 'Not specified')}")
-            
-            # Auto redirect after 2 seconds
-            with st.spinner("Redirecting to dashboard..."):
-                import time
-                time.sleep(1.5)
-                st.rerun()
+                summary = f"🏢 Company: {user.get('company_name', 'Company name not specified')} | Type: {user.get('company_type', 'Not specified')}"
+            st.session_state.pending_toasts = [(f"Welcome back, {user['name']}!", "🎉"), (summary, None)]
+            st.rerun()
         else:
             st.error("❌ Invalid credentials. Please check your information and try again.")
             
@@ -101,9 +96,8 @@ def login_user(role):
                 st.write("• If you used phone to register, use phone to login")
                 
                 # Show registration statistics for encouragement
-                users = read_json("data/users.json")
-                job_seekers = len([u for u in users if u.get('role') == 'job'])
-                employers = len([u for u in users if u.get('role') == 'hire'])
+                job_seekers = count_users('job')
+                employers = count_users('hire')
                 
                 if job_seekers > 0 or employers > 0:
                     st.write(f"**Platform Stats:** {job_seekers} Job Seekers • {employers} Employers registered")
@@ -126,11 +120,9 @@ def login_user(role):
             st.info("🚧 Password recovery feature coming soon! Please contact support if needed.")
     
     # Show recent activity stats
-    users = read_json("data/users.json")
-    if users:
-        recent_registrations = len([u for u in users if u.get('role') == role])
-        if recent_registrations > 0:
-            st.success(f"🎯 {recent_registrations} {role.replace('job', 'Job Seeker').replace('hire', 'Employer')}s have joined our platform!")
+    recent_registrations = count_users(role)
+    if recent_registrations > 0:
+        st.success(f"🎯 {recent_registrations} {role.replace('job', 'Job Seeker').replace('hire', 'Employer')}s have joined our platform!")
     
     # Back button with better styling
     st.markdown("---")
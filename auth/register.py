@@ -1,6 +1,8 @@
 # register.py
 import streamlit as st
-from utils import write_json, read_json, validate_password, validate_phone, validate_aadhaar, get_next_user_id
+from matching import get_matching_engine
+from utils import (AVAILABILITY_OPTIONS, EXPERIENCE_LEVELS, WORK_TYPES, add_user, find_user_by_phone,
+                   hash_password, password_strength, validate_password, validate_phone, validate_aadhaar)
 
 def register_user(role):
     st.title(f"📝 Register as {'Job Seeker' if role == 'job' else 'Employer'}")
@@ -54,13 +56,11 @@ def register_user(role):
         col1, col2 = st.columns(2)
         with col1:
             experience = st.selectbox("📈 Experience Level", 
-                                    ["Select", "Fresher (0-1 years)", "Experienced (1-3 years)", 
-                                     "Senior (3-5 years)", "Expert (5+ years)"], 
+                                    ["Select"] + EXPERIENCE_LEVELS, 
                                     key=f"reg_experience_{role}")
         with col2:
             work_type = st.multiselect("🛠️ Skills/Work Types", 
-                                     ["Maid", "Cook", "Driver", "Cleaner", "Babysitter", 
-                                      "Gardener", "Security Guard", "Electrician", "Plumber", "Other"],
+                                     WORK_TYPES,
                                      key=f"reg_work_type_{role}")
         
         expected_salary = st.slider("💰 Expected Monthly Salary (₹)", 
@@ -68,7 +68,7 @@ def register_user(role):
                                   key=f"reg_salary_{role}")
         
         availability = st.multiselect("⏰ Availability", 
-                                    ["Full Time", "Part Time", "Weekends Only", "Night Shifts"],
+                                    AVAILABILITY_OPTIONS,
                                     key=f"reg_availability_{role}")
     
     # Company information for employers
@@ -102,35 +102,9 @@ def register_user(role):
                                 key=f"reg_password_{role}",
                                 help="Password must be 8+ characters with uppercase, lowercase, digit, and special character")
         
-        # Password strength indicator
+        # Password strength indicator (same rules as validate_password)
         if password:
-            strength_score = 0
-            feedback = []
-            
-            if len(password) >= 8:
-                strength_score += 1
-            else:
-                feedback.append("At least 8 characters")
-            
-            if any(c.isupper() for c in password):
-                strength_score += 1
-            else:
-                feedback.append("One uppercase letter")
-                
-            if any(c.islower() for c in password):
-                strength_score += 1
-            else:
-                feedback.append("One lowercase letter")
-                
-            if any(c.isdigit() for c in password):
-                strength_score += 1
-            else:
-                feedback.append("One number")
-                
-            if any(c in "!@#$%^&*(),.?\":{}|<>" for c in password):
-                strength_score += 1
-            else:
-                feedback.append("One special character")
+            strength_score, feedback = password_strength(password)
             
             # Display strength
             if strength_score == 5:
@@ -239,19 +213,16 @@ def register_user(role):
             return
         
         # Check if phone already exists
-        users = read_json("data/users.json")
-        if any(u["phone"] == phone for u in users):
+        if find_user_by_phone(None, phone):
             st.error("❌ Phone number already registered. Please use a different number or try logging in.")
             return
         
-        # Create new user with all information
-        user_id = get_next_user_id(users)
+        # Create new user with all information (the store assigns the ID)
         user_data = {
-            "id": user_id,
             "role": role,
             "name": name.strip(),
             "phone": phone.strip(),
-            "password": password.strip(),
+            "password": hash_password(password.strip()),
             "email": email.strip() if email else "",
             "city": city.strip() if city else ""
         }
@@ -274,8 +245,11 @@ def register_user(role):
             })
         
         # Save user data
-        users.append(user_data)
-        write_json("data/users.json", users)
+        saved, result = add_user(user_data)
+        if not saved:
+            st.error(f"❌ {result}. Please try again.")
+            return
+        get_matching_engine().apply_write(result)
         
         st.success("🎉 Registration successful! Welcome to our platform!")
         st.balloons()
@@ -0,0 +1,89 @@
+# bench_journal.py
+"""Cold read_json of a journaled file, checked against an in-memory replay.
+
+Writes a snapshot of --records records plus a journal of --updates
+updates (about JOURNAL_COMPACT_BYTES worth by default) and --appends
+appends, then times a cold read_json and compares its result with the
+same changes applied to an in-memory copy. Exits non-zero if the contents
+differ or the read takes longer than --budget seconds.
+
+Usage:
+    python benchmarks/bench_journal.py [--records 50000] [--updates 20000] [--appends 2000] [--budget 2]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+import utils  # noqa: E402
+
+
+def make_files(path, records, updates, appends, seed=42):
+    """Write the snapshot and journal. Returns the expected contents"""
+    rng = random.Random(seed)
+    data = [{"id": i, "name": f"user {i}", "city": "Indore", "unread": 0} for i in range(1, records + 1)]
+    utils.write_json(path, data)
+
+    expected = [dict(record) for record in data]
+    by_id = {record["id"]: record for record in expected}
+    entries = []
+    next_id = records + 1
+    for _ in range(updates + appends):
+        if rng.random() < appends / (updates + appends):
+            record = {"id": next_id, "name": f"user {next_id}", "city": "Pune", "unread": 0}
+            next_id += 1
+            entries.append({"op": "append", "record": record})
+            expected.append(dict(record))
+            by_id[record["id"]] = expected[-1]
+        else:
+            record_id = rng.randint(1, next_id - 1)
+            fields = {"unread": rng.randint(1, 99), "city": rng.choice(utils.CITIES)}
+            entries.append({"op": "update", "id": record_id, "fields": fields})
+            by_id[record_id].update(fields)
+    with open(path + utils.JOURNAL_SUFFIX, "wb") as file:
+        file.write(b"".join(serialization.dumps_line(entry) for entry in entries))
+    return expected
+
+
+def run(records, updates, appends, budget):
+    with tempfile.TemporaryDirectory() as folder:
+        path = os.path.join(folder, "records.json")
+        expected = make_files(path, records, updates, appends)
+        journal_size = os.path.getsize(path + utils.JOURNAL_SUFFIX)
+
+        utils.invalidate_json_cache()
+        start = time.perf_counter()
+        data = utils.read_json(path, strict=True)
+        elapsed = time.perf_counter() - start
+
+    print(f"{records} records + {updates} updates/{appends} appends ({journal_size / 1024:.0f} KB journal): "
+          f"cold read_json {elapsed * 1000:.0f} ms")
+    failures = []
+    if data != expected:
+        failures.append("replayed contents differ from the expected records")
+    if elapsed > budget:
+        failures.append(f"cold read took {elapsed:.2f}s, over the {budget}s budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: journal replay matches and is within budget")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=50000)
+    parser.add_argument("--updates", type=int, default=20000)
+    parser.add_argument("--appends", type=int, default=2000)
+    parser.add_argument("--budget", type=float, default=2.0, help="Maximum seconds for the cold read")
+    args = parser.parse_args(argv)
+    return run(args.records, args.updates, args.appends, args.budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,117 @@
+# bench_matching.py
+"""Candidate matching latency at scale.
+
+Fills a matching.SeekerMatrix with synthetic seekers (columns are filled
+directly, so building a million seekers takes a second rather than the
+time it takes to encode a million dicts) and times scoring one job
+posting plus top-K selection. The target is under 100 ms at 1M seekers.
+
+It then times SeekerMatrix.from_users over --rebuild-users generated user
+records, the rebuild MatchingEngine runs when the store changed under it,
+and checks the result against encoding the same seekers one at a time.
+
+Usage:
+    python benchmarks/bench_matching.py [--seekers 1000000] [--repeat 20] [--top 10] [--rebuild-users 200000]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import utils  # noqa: E402
+from generate_users import generate_users  # noqa: E402
+from matching import COLUMNS, SeekerMatrix  # noqa: E402
+from vocab import AVAILABILITY, CITY, EXPERIENCE, WORK_TYPE  # noqa: E402
+
+
+def make_matrix(count, seed=42):
+    rng = np.random.default_rng(seed)
+    matrix = SeekerMatrix(capacity=count)
+    work_types = len(WORK_TYPE.builtin)
+    # One to three skills per seeker
+    bits = np.zeros(count, dtype=np.uint64)
+    for _ in range(3):
+        picked = rng.integers(0, work_types, count, dtype=np.uint64)
+        keep = rng.random(count) < 0.6
+        bits |= np.where(keep, np.uint64(1) << picked, np.uint64(0))
+    bits |= np.uint64(1) << rng.integers(0, work_types, count, dtype=np.uint64)
+
+    matrix.ids[:] = np.arange(1, count + 1)
+    matrix.work_bits[:] = bits
+    matrix.avail_bits[:] = rng.integers(1, 1 << len(AVAILABILITY.builtin), count, dtype=np.uint8)
+    matrix.city[:] = rng.integers(0, len(CITY.builtin), count, dtype=np.int32)
+    matrix.experience[:] = rng.integers(0, len(EXPERIENCE.builtin), count, dtype=np.int8)
+    matrix.salary[:] = rng.integers(5, 60, count, dtype=np.int32) * 1000
+    matrix.size = count
+    return matrix
+
+
+def run(count, repeat, top):
+    start = time.perf_counter()
+    matrix = make_matrix(count)
+    print(f"{count} seekers built in {time.perf_counter() - start:.2f}s "
+          f"({sum(getattr(matrix, c).nbytes for c in ('ids', 'work_bits', 'avail_bits', 'city', 'experience', 'salary')) / 1e6:.1f} MB)")
+
+    jobs = [
+        {"work_type": work_type, "city": city, "salary": 15000 + 2500 * i,
+         "availability": [utils.AVAILABILITY_OPTIONS[i % len(utils.AVAILABILITY_OPTIONS)]],
+         "min_experience": "Experienced (1-3 years)"}
+        for i, (work_type, city) in enumerate(zip(utils.WORK_TYPES, utils.CITIES))
+    ]
+    matrix.top_matches(jobs[0], top)  # warm up
+
+    timings = []
+    for i in range(repeat):
+        job = jobs[i % len(jobs)]
+        start = time.perf_counter()
+        matches = matrix.top_matches(job, top)
+        timings.append((time.perf_counter() - start) * 1000)
+        assert len(matches) == min(top, count)
+
+    timings.sort()
+    p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+    print(f"match + top-{top}: median {statistics.median(timings):.1f} ms, "
+          f"p95 {p95:.1f} ms, max {timings[-1]:.1f} ms")
+    return statistics.median(timings)
+
+
+def run_rebuild(count):
+    """Time a full rebuild from user records. Returns True if it encodes them correctly"""
+    users = list(generate_users(count, password_hash="x"))
+    start = time.perf_counter()
+    matrix = SeekerMatrix.from_users(users)
+    elapsed = time.perf_counter() - start
+    print(f"rebuild from {count} users ({matrix.size} seekers): {elapsed:.2f}s")
+
+    expected = SeekerMatrix(capacity=matrix.size)
+    for user in users:
+        if user.get("role") == "job":
+            expected.add(user)
+    same = expected.size == matrix.size and all(
+        np.array_equal(getattr(expected, name)[:expected.size], getattr(matrix, name)[:matrix.size])
+        for name in COLUMNS)
+    if not same:
+        print("FAIL: rebuilt columns differ from encoding seekers one by one")
+    return same
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seekers", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--rebuild-users", type=int, default=200000, help="0 to skip the rebuild benchmark")
+    args = parser.parse_args(argv)
+    median = run(args.seekers, args.repeat, args.top)
+    rebuilt = run_rebuild(args.rebuild_users) if args.rebuild_users else True
+    return 0 if median < 100 and rebuilt else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,86 @@
+# bench_messages.py
+"""Send throughput and cold loads of the message registry.
+
+Starts --conversations conversations in a scratch directory, sends
+--messages messages spread across them, then times a cold load of
+data/message.json (a fresh MessageStore with an empty read_json cache)
+and a cold unread count for one user. Exits non-zero if the cold load
+takes longer than --budget seconds or the unread counts are wrong.
+
+Usage:
+    python benchmarks/bench_messages.py [--conversations 200] [--messages 20000] [--budget 0.5]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _size(path):
+    try:
+        return os.path.getsize(path)
+    except OSError:
+        return 0
+
+
+def run(conversations, messages, budget, seed=42):
+    import messages as messaging
+    import utils
+
+    rng = random.Random(seed)
+    store = messaging.MessageStore()
+    pairs = [(store.get_or_create_conversation(1, other)["id"], other) for other in range(2, conversations + 2)]
+    expected_unread = 0
+    start = time.perf_counter()
+    for _ in range(messages):
+        conversation_id, other = rng.choice(pairs)
+        sender = rng.choice((1, other))
+        store.send_message(conversation_id, sender, "Is the job still open? " * rng.randint(1, 4))
+    elapsed = time.perf_counter() - start
+    for conversation in store.conversations_for(1):
+        expected_unread += sum(1 for m in store.log(conversation["id"]).tail(messages)
+                               if m["sender_id"] != 1)
+    registry_bytes = _size(messaging.MESSAGES_FILE) + _size(messaging.MESSAGES_FILE + utils.JOURNAL_SUFFIX)
+    print(f"{messages} messages in {conversations} conversations: {messages / elapsed:.0f} sends/s, "
+          f"registry {registry_bytes / 1024:.1f} KB")
+
+    utils.invalidate_json_cache()
+    start = time.perf_counter()
+    cold = messaging.MessageStore()
+    cold.get_conversation(pairs[0][0])
+    load = time.perf_counter() - start
+    start = time.perf_counter()
+    unread = cold.unread_count(1)
+    count = time.perf_counter() - start
+    print(f"cold registry load {load * 1000:.1f} ms, cold unread count over {conversations} "
+          f"conversations {count * 1000:.1f} ms")
+
+    failures = []
+    if unread != expected_unread:
+        failures.append(f"unread count {unread}, expected {expected_unread}")
+    if load > budget:
+        failures.append(f"cold load took {load:.2f}s, over the {budget}s budget")
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: counters match and the cold load is within budget")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--messages", type=int, default=20000)
+    parser.add_argument("--budget", type=float, default=0.5, help="Maximum seconds for the cold registry load")
+    args = parser.parse_args(argv)
+    with tempfile.TemporaryDirectory() as folder:
+        os.chdir(folder)
+        return run(args.conversations, args.messages, args.budget)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
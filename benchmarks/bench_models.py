@@ -0,0 +1,99 @@
+# bench_models.py
+"""Memory of user records as dicts versus slotted models.
+
+Builds synthetic job seekers and employers shaped like register_user's
+records, keeps them once as plain dicts (as read_json returns them) and
+once as models.JobSeeker/Employer instances, and reports the memory each
+set holds (measured with tracemalloc) plus the load and to_dict time.
+
+Usage:
+    python benchmarks/bench_models.py [--users 1000000]
+"""
+import argparse
+import gc
+import json
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from models import user_from_dict  # noqa: E402
+
+NAMES = ["amit sharma", "ravi kumar", "sunita yadav", "priya patel", "rahul singh", "anita jain"]
+
+
+def make_json_lines(count, seed=42):
+    """Serialized records, so every dict built from them has its own strings (like read_json)"""
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        user = {
+            "id": i,
+            "role": "job" if i % 5 else "hire",
+            "name": f"{rng.choice(NAMES)} {i}",
+            "phone": f"9{i:09d}",
+            "password": "pbkdf2_sha256$260000$" + "%032x" % rng.getrandbits(128),
+            "email": "",
+            "city": rng.choice(utils.CITIES),
+        }
+        if user["role"] == "job":
+            user.update({
+                "aadhaar": f"{i:012d}",
+                "age": rng.randint(18, 60),
+                "gender": rng.choice(["Male", "Female"]),
+                "experience": rng.choice(utils.EXPERIENCE_LEVELS),
+                "work_type": rng.sample(utils.WORK_TYPES, rng.randint(1, 3)),
+                "expected_salary": rng.randint(5, 50) * 1000,
+                "availability": rng.sample(utils.AVAILABILITY_OPTIONS, rng.randint(1, 2)),
+            })
+        else:
+            user.update({
+                "company_name": f"{rng.choice(NAMES).split()[1]} enterprises",
+                "company_type": "Small Business",
+                "company_address": f"{rng.randint(1, 500)} main road {user['city']}",
+            })
+        yield json.dumps(user)
+
+
+def measure(label, build):
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"  {label:<16} {size / 1e6:8.1f} MB  ({size / len(result):6.0f} B/user, built in {elapsed:.1f}s)")
+    return result, size
+
+
+def run(count):
+    lines = list(make_json_lines(count))
+    print(f"{count} users:")
+    dicts, dict_size = measure("dicts", lambda: [json.loads(line) for line in lines])
+    del dicts
+    # Built straight from the JSON too, so the models own their strings
+    models, model_size = measure("slotted models", lambda: [user_from_dict(json.loads(line)) for line in lines])
+    print(f"  slotted models hold {model_size / dict_size:.0%} of the dict memory")
+
+    start = time.perf_counter()
+    for model in models:
+        model.to_dict()
+    print(f"  to_dict: {(time.perf_counter() - start) / count * 1e6:.2f} us/user")
+    return model_size / dict_size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000000)
+    args = parser.parse_args(argv)
+    run(args.users)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+# bench_passwords.py
+"""Login throughput at different password hashing cost settings.
+
+For each setting this hashes one password and then verifies it many times
+through the bounded KDF worker pool, once with the verification cache
+disabled (every login pays the full KDF) and once with it enabled (repeat
+logins).
+
+Usage:
+    python benchmarks/bench_passwords.py [--logins 200] [--workers 4]
+"""
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import passwords  # noqa: E402
+
+SETTINGS = [
+    ("scrypt", (2 ** 13, 8, 1)),
+    ("scrypt", (2 ** 14, 8, 1)),
+    ("scrypt", (2 ** 15, 8, 1)),
+    ("pbkdf2_sha256", (100000,)),
+    ("pbkdf2_sha256", (260000,)),
+    ("pbkdf2_sha256", (600000,)),
+]
+
+
+def _logins_per_second(stored, logins, cache_size):
+    passwords.VERIFY_CACHE_SIZE = cache_size
+    passwords.clear_verify_cache()
+    if cache_size:
+        # Repeat logins: the first one fills the cache
+        passwords.verify_password("Abcdef12@", stored)
+    start = time.perf_counter()
+    futures = [passwords.verify_password_async("Abcdef12@", stored) for _ in range(logins)]
+    assert all(f.result() for f in futures)
+    return logins / (time.perf_counter() - start)
+
+
+def run(logins, workers):
+    passwords.KDF_WORKERS = workers
+    passwords._executor = None
+
+    print(f"{logins} logins per setting, {workers} KDF workers")
+    print(f"{'scheme':<15} {'params':<18} {'hash ms':>8} {'cold logins/s':>14} {'cached logins/s':>16}")
+    for scheme, params in SETTINGS:
+        start = time.perf_counter()
+        stored = passwords.hash_password("Abcdef12@", scheme=scheme, params=params)
+        hash_ms = (time.perf_counter() - start) * 1000
+        cold = _logins_per_second(stored, logins, cache_size=0)
+        cached = _logins_per_second(stored, logins, cache_size=1024)
+        print(f"{scheme:<15} {str(params):<18} {hash_ms:>8.1f} {cold:>14.1f} {cached:>16.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", type=int, default=passwords.KDF_WORKERS)
+    args = parser.parse_args(argv)
+    run(args.logins, args.workers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
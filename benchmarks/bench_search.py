@@ -0,0 +1,95 @@
+# bench_search.py
+"""Profile search latency for the pure-Python index and SQLite FTS5.
+
+Builds synthetic profiles shaped like register_user's records, indexes
+them with search.SearchIndex and in a temporary SqliteUserStore, then
+times exact, multi-word and misspelt queries.
+
+Usage:
+    python benchmarks/bench_search.py [--profiles 1000000] [--repeat 20] [--skip-sqlite]
+"""
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import utils  # noqa: E402
+from search import SearchIndex  # noqa: E402
+from storage import SqliteUserStore  # noqa: E402
+
+FIRST_NAMES = ["amit", "ravi", "sunita", "priya", "rahul", "anita", "vijay", "pooja", "suresh", "kavita",
+               "manoj", "neha", "deepak", "rekha", "arjun", "meena", "sanjay", "geeta", "rohit", "lata"]
+LAST_NAMES = ["sharma", "verma", "yadav", "patel", "singh", "kumar", "jain", "gupta", "mishra", "jaat"]
+QUERIES = ["sharma", "ravi kumar", "indore driver", "sunita yadav cook", "drivr", "sharmaa", "priya mumbai"]
+
+
+def make_profiles(count, seed=42):
+    rng = random.Random(seed)
+    for i in range(1, count + 1):
+        role = "job" if i % 5 else "hire"
+        user = {
+            "id": i,
+            "role": role,
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}{i % 997 if i % 3 == 0 else ''}",
+            "city": rng.choice(utils.CITIES),
+        }
+        if role == "job":
+            user["work_type"] = rng.sample(utils.WORK_TYPES, rng.randint(1, 3))
+        else:
+            user["company_name"] = f"{rng.choice(LAST_NAMES)} enterprises"
+            user["company_address"] = f"{rng.randint(1, 500)} main road {user['city']}"
+        yield user
+
+
+def _time_queries(label, search, repeat):
+    for query in QUERIES:
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            results = search(query)
+            timings.append((time.perf_counter() - start) * 1000)
+        print(f"  {label:<8} {query!r:<22} median {statistics.median(timings):7.2f} ms "
+              f"({len(results)} results)")
+
+
+def run(count, repeat, skip_sqlite):
+    start = time.perf_counter()
+    index = SearchIndex(make_profiles(count))
+    print(f"{count} profiles indexed in {time.perf_counter() - start:.1f}s "
+          f"({len(index.postings)} distinct words)")
+    _time_queries("python", lambda q: index.search(q, limit=20), repeat)
+
+    if skip_sqlite:
+        return
+    with tempfile.TemporaryDirectory() as folder:
+        store = SqliteUserStore(os.path.join(folder, "users.db"))
+        start = time.perf_counter()
+        batch = []
+        for user in make_profiles(count):
+            batch.append(user)
+            if len(batch) >= 10000:
+                store.add_users(batch, check_duplicates=False)
+                batch = []
+        if batch:
+            store.add_users(batch, check_duplicates=False)
+        print(f"{count} profiles loaded into SQLite/FTS5 in {time.perf_counter() - start:.1f}s")
+        _time_queries("fts5", lambda q: store.search(q, limit=20), repeat)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--profiles", type=int, default=1000000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--skip-sqlite", action="store_true")
+    args = parser.parse_args(argv)
+    run(args.profiles, args.repeat, args.skip_sqlite)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# bench_serialization.py
+"""Load/dump time and file size of the data file codecs.
+
+Serializes synthetic user lists with every codec serialization.py can use
+here (stdlib, orjson, msgspec), in pretty and compact form, plus msgpack
+when it is installed, and reports dump time, load time and size.
+
+Usage:
+    python benchmarks/bench_serialization.py [--users 10000,100000,1000000] [--repeat 3]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+import utils  # noqa: E402
+
+
+def make_users(count, seed=42):
+    rng = random.Random(seed)
+    users = []
+    for i in range(1, count + 1):
+        user = {
+            "id": i,
+            "role": "job" if i % 5 else "hire",
+            "name": f"user {i}",
+            "phone": f"9{i:09d}",
+            "password": "scrypt$16384$8$1$" + "%032x" % rng.getrandbits(128),
+            "email": f"user{i}@example.com",
+            "city": rng.choice(utils.CITIES),
+        }
+        if user["role"] == "job":
+            user.update({
+                "aadhaar": f"{i:012d}",
+                "age": rng.randint(18, 60),
+                "experience": rng.choice(utils.EXPERIENCE_LEVELS),
+                "work_type": rng.sample(utils.WORK_TYPES, rng.randint(1, 3)),
+                "expected_salary": rng.randint(5, 50) * 1000,
+                "availability": rng.sample(utils.AVAILABILITY_OPTIONS, rng.randint(1, 2)),
+            })
+        else:
+            user.update({"company_name": f"company {i}", "company_address": f"{i} main road"})
+        users.append(user)
+    return users
+
+
+def formats():
+    """(label, dump, load) for every format available here"""
+    for name in serialization.available_codecs():
+        codec = serialization.make_codec(name)
+        for pretty in (True, False):
+            yield (f"{name} {'pretty' if pretty else 'compact'}",
+                   lambda data, c=codec, p=pretty: c.dumps(data, pretty=p), codec.loads)
+    if serialization.msgpack is not None:
+        yield ("msgpack", lambda data: serialization.pack_snapshot(data, (0, 0, 0)),
+               lambda raw: serialization.unpack_snapshot(raw, (0, 0, 0)))
+
+
+def best_of(repeat, function, *args):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function(*args)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def run(counts, repeat):
+    for count in counts:
+        users = make_users(count)
+        print(f"{count} users:")
+        for label, dump, load in formats():
+            dump_time, raw = best_of(repeat, dump, users)
+            load_time, loaded = best_of(repeat, load, raw)
+            assert len(loaded) == count
+            print(f"  {label:<16} dump {dump_time * 1000:9.1f} ms  load {load_time * 1000:9.1f} ms  "
+                  f"size {len(raw) / 1e6:8.1f} MB")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", default="10000,100000,1000000",
+                        help="Comma-separated user counts")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+    run([int(count) for count in args.users.split(",")], args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
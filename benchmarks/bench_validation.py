@@ -0,0 +1,133 @@
+# bench_validation.py
+"""Per-record validation cost on the bulk import path.
+
+Compares the previous regex-per-rule validators (copied here as the
+baseline) with validation.validate_many on synthetic registration rows.
+
+Usage:
+    python benchmarks/bench_validation.py [--records 100000]
+"""
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import validation  # noqa: E402
+
+
+def legacy_validate_password(password):
+    if not password or not isinstance(password, str):
+        return "Password is required."
+    if len(password) < 8:
+        return "Password must be at least 8 characters long."
+    if not re.search(r"[A-Z]", password):
+        return "Password must include at least one uppercase letter."
+    if not re.search(r"[a-z]", password):
+        return "Password must include at least one lowercase letter."
+    if not re.search(r"\d", password):
+        return "Password must include at least one digit."
+    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
+        return "Password must include at least one special character."
+    return None
+
+
+def legacy_validate_phone(phone):
+    if not phone:
+        return False
+    cleaned_phone = re.sub(r'[^\d+]', '', str(phone))
+    if cleaned_phone.startswith('+91'):
+        cleaned_phone = cleaned_phone[3:]
+    elif cleaned_phone.startswith('91') and len(cleaned_phone) == 12:
+        cleaned_phone = cleaned_phone[2:]
+    return cleaned_phone.isdigit() and len(cleaned_phone) == 10
+
+
+def legacy_validate_aadhaar(aadhaar):
+    if not aadhaar:
+        return False
+    cleaned_aadhaar = re.sub(r'[^\d]', '', str(aadhaar))
+    return cleaned_aadhaar.isdigit() and len(cleaned_aadhaar) == 12
+
+
+def legacy_validate_email(email):
+    if not email or not isinstance(email, str):
+        return False
+    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
+    return bool(re.match(email_pattern, email.strip()))
+
+
+def legacy_validate_record(record):
+    errors = {}
+    if not record.get("name"):
+        errors["name"] = "Name is required."
+    if not legacy_validate_phone(record.get("phone")):
+        errors["phone"] = "Invalid phone number."
+    if record.get("email") and not legacy_validate_email(record["email"]):
+        errors["email"] = "Invalid email format."
+    if record.get("role") == "job" and not legacy_validate_aadhaar(record.get("aadhaar")):
+        errors["aadhaar"] = "Invalid Aadhaar number."
+    password_error = legacy_validate_password(record.get("password"))
+    if password_error:
+        errors["password"] = password_error
+    return errors
+
+
+# Characters where str methods and the regex classes could disagree
+EDGE_PASSWORDS = ["Abcdefg²!", "Abcdefg½!", "Abcdefg٣!", "Abcdefg१!", "ABCDEFG1!", "abcdefg1!",
+                  "Ábcdefg1!", "Abcdéfg1!", "Abcdefg1\u00a0", "Abc1!", ""]
+
+
+def make_records(count, seed=42):
+    rng = random.Random(seed)
+    passwords = ["Abcdef12@", "weakpass", "NoDigits!!", "Str0ng#Passw0rd", "short1A!"]
+    records = []
+    for i in range(count):
+        records.append({
+            "name": f"user {i}",
+            "role": "job" if i % 4 else "hire",
+            "phone": f"+91 9{rng.randrange(10 ** 9):09d}",
+            "email": f"user{i}@example.com" if i % 3 else "",
+            "aadhaar": f"{rng.randrange(10 ** 12):012d}",
+            "password": rng.choice(passwords),
+        })
+    return records
+
+
+def _time(label, fn, records):
+    start = time.perf_counter()
+    fn(records)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {elapsed:>8.3f}s  {elapsed / len(records) * 1e6:>7.2f} us/record")
+    return elapsed
+
+
+def run(count):
+    records = make_records(count)
+    print(f"{count} records")
+    legacy = _time("legacy (regex per rule)", lambda rs: [legacy_validate_record(r) for r in rs], records)
+    current = _time("validation.validate_many", validation.validate_many, records)
+    print(f"speedup: {legacy / current:.2f}x")
+
+    # Both must agree on which records are valid
+    legacy_valid = [not legacy_validate_record(r) for r in records]
+    current_valid = [not errors for errors in validation.validate_many(records)]
+    assert legacy_valid == current_valid, "validators disagree"
+    for password in EDGE_PASSWORDS:
+        assert validation.validate_password(password) == legacy_validate_password(password), \
+            f"validators disagree on {password!r}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--records", type=int, default=100000)
+    args = parser.parse_args(argv)
+    run(args.records)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
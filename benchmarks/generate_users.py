@@ -0,0 +1,108 @@
+# generate_users.py
+"""Synthetic users.json datasets for benchmarks.
+
+Writes job seekers and employers shaped like register_user's records
+(about four seekers per employer) across the built-in cities, work types,
+experience levels and availability options. Records are streamed to the
+file, so even 5M users never sit in memory at once.
+
+Every user's password is PASSWORD, stored as one precomputed hash: hashing
+millions of passwords would take hours, and the KDF has its own benchmark
+in bench_passwords.py.
+
+Usage:
+    python benchmarks/generate_users.py data/users.json [--users 100000] [--seed 42]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import serialization  # noqa: E402
+import utils  # noqa: E402
+
+PASSWORD = "Abcdef12@"
+FIRST_NAMES = ["amit", "ravi", "sunita", "priya", "rahul", "anita", "vijay", "pooja", "suresh", "kavita",
+               "manoj", "neha", "deepak", "rekha", "arjun", "meena", "sanjay", "geeta", "rohit", "lata"]
+LAST_NAMES = ["sharma", "verma", "yadav", "patel", "singh", "kumar", "jain", "gupta", "mishra", "jaat"]
+GENDERS = ["Male", "Female", "Other"]
+COMPANY_TYPES = ["Individual/Family", "Small Business", "Medium Enterprise", "Large Corporation", "NGO/Non-Profit"]
+
+
+def phone_for(user_id):
+    """The phone number generate_users gives the user with this ID"""
+    return f"6{user_id:09d}"
+
+
+def name_for(user_id):
+    """The name generate_users gives the user with this ID (unique per ID)"""
+    rng = random.Random(user_id)
+    return f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)} {user_id}"
+
+
+def generate_users(count, seed=42, password_hash=None):
+    """Yield count user records with IDs 1..count"""
+    rng = random.Random(seed)
+    password_hash = password_hash or utils.hash_password(PASSWORD)
+    for user_id in range(1, count + 1):
+        role = "hire" if user_id % 5 == 0 else "job"
+        name = name_for(user_id)
+        user = {
+            "id": user_id,
+            "role": role,
+            "name": name,
+            "phone": phone_for(user_id),
+            "password": password_hash,
+            "email": f"{name.replace(' ', '.')}@example.com" if rng.random() < 0.6 else "",
+            "city": rng.choice(utils.CITIES),
+        }
+        if role == "job":
+            user.update({
+                "aadhaar": f"{rng.randrange(10 ** 11, 10 ** 12)}",
+                "age": rng.randint(18, 60),
+                "gender": rng.choice(GENDERS),
+                "experience": rng.choice(utils.EXPERIENCE_LEVELS),
+                "work_type": rng.sample(utils.WORK_TYPES, rng.randint(1, 3)),
+                "expected_salary": rng.randrange(5000, 50001, 1000),
+                "availability": rng.sample(utils.AVAILABILITY_OPTIONS, rng.randint(1, 2)),
+            })
+        else:
+            user.update({
+                "company_name": f"{rng.choice(LAST_NAMES).title()} {rng.choice(['Enterprises', 'Traders', 'Home'])}",
+                "company_type": rng.choice(COMPANY_TYPES),
+                "company_address": f"{rng.randint(1, 500)} Main Road, {user['city']}",
+            })
+        yield user
+
+
+def write_users(path, count, seed=42):
+    """Stream a JSON array of count users to path. Returns the file size"""
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(b"[\n")
+        for position, user in enumerate(generate_users(count, seed)):
+            if position:
+                file.write(b",\n")
+            file.write(serialization.dumps(user))
+        file.write(b"\n]\n")
+    utils.invalidate_json_cache(path)
+    return os.path.getsize(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("path", help="Users file to write, e.g. data/users.json")
+    parser.add_argument("--users", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args(argv)
+    start = time.perf_counter()
+    size = write_users(args.path, args.users, args.seed)
+    print(f"Wrote {args.users} users ({size / 1e6:.1f} MB) to {args.path} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
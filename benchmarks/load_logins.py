@@ -0,0 +1,113 @@
+# load_logins.py
+"""Login throughput through the real Streamlit page script.
+
+Registers job seekers in a scratch data directory, then drives the login
+page with streamlit.testing.v1.AppTest: for each login a fresh session
+opens the login page, switches to phone login, submits the credentials
+and runs until the script lands on the dashboard. Reports logins/sec and
+the p50/p95/p99 latency of the submit. AppTest drives one session at a
+time per process, so parallel workers are separate processes.
+
+--app points the harness at another checkout's main.py (its modules are
+imported instead of this tree's), to compare before and after a change.
+
+Usage:
+    python benchmarks/load_logins.py [--logins 200] [--users 50] [--workers 4] [--app path/to/main.py]
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PASSWORD = "Abcdef12@"
+
+
+def make_users(count):
+    import utils
+
+    phones = []
+    for i in range(count):
+        phone = f"7{i:09d}"
+        saved, result = utils.add_user({
+            "role": "job", "name": f"load user {i}", "phone": phone,
+            "password": utils.hash_password(PASSWORD), "city": "Indore",
+            "work_type": ["Cook"], "experience": "Fresher (0-1 years)", "availability": ["Full Time"],
+        })
+        if not saved:
+            raise SystemExit(f"Could not create load test user: {result}")
+        phones.append(phone)
+    return phones
+
+
+def login_once(app, phone, timeout):
+    """Log one fresh session in. Returns the submit latency in seconds"""
+    from streamlit.testing.v1 import AppTest
+
+    at = AppTest.from_file(app, default_timeout=timeout)
+    at.session_state["page"] = "login"
+    at.session_state["role"] = "job"
+    at.run()
+    at.radio(key="login_method_job").set_value("Phone Number").run()
+    at.text_input(key="login_phone_job").input(phone)
+    at.text_input(key="login_password_job").input(PASSWORD)
+    start = time.perf_counter()
+    at.button(key="login_btn_job").click().run()
+    elapsed = time.perf_counter() - start
+    if at.exception or at.session_state["page"] != "dashboard":
+        raise RuntimeError(f"Login for {phone} did not reach the dashboard: {at.exception}")
+    return elapsed
+
+
+def percentile(sorted_values, fraction):
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * fraction))]
+
+
+def _login_batch(args):
+    app, workdir, phones, count, timeout = args
+    os.chdir(workdir)
+    sys.path.insert(0, os.path.dirname(app))
+    # Warm imports and the page script before timing
+    login_once(app, phones[0], timeout)
+    started = time.time()
+    timings = [login_once(app, phones[i % len(phones)], timeout) for i in range(count)]
+    return timings, started, time.time()
+
+
+def run(app, logins, users, workers, timeout):
+    workdir = tempfile.mkdtemp(prefix="kaambazaar-logins-")
+    os.chdir(workdir)
+    phones = make_users(users)
+
+    shares = [logins // workers + (1 if w < logins % workers else 0) for w in range(workers)]
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(workers) as pool:
+        results = pool.map(_login_batch, [(app, workdir, phones[w::workers] or phones, share, timeout)
+                                          for w, share in enumerate(shares) if share])
+    timings = sorted(t for batch, _, _ in results for t in batch)
+    wall = max(end for _, _, end in results) - min(start for _, start, _ in results)
+
+    print(f"app={app} workdir={workdir}")
+    print(f"{logins} logins by {workers} workers in {wall:.2f}s: {logins / wall:.1f} logins/sec")
+    print(f"submit latency p50 {percentile(timings, 0.50) * 1000:.0f} ms, "
+          f"p95 {percentile(timings, 0.95) * 1000:.0f} ms, p99 {percentile(timings, 0.99) * 1000:.0f} ms")
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--timeout", type=float, default=60)
+    parser.add_argument("--app", default=os.path.join(REPO_ROOT, "main.py"))
+    args = parser.parse_args(argv)
+    app = os.path.abspath(args.app)
+    sys.path.insert(0, os.path.dirname(app))
+    return run(app, args.logins, args.users, args.workers, args.timeout)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
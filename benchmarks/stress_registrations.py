@@ -0,0 +1,115 @@
+# stress_registrations.py
+"""Multi-process registration stress test.
+
+Runs many concurrent save_user calls from separate processes against a
+scratch data directory and checks that no registration was lost, no two
+users share an ID and a phone number contested by every worker was only
+registered once.
+
+Usage:
+    python benchmarks/stress_registrations.py --processes 8 --per-process 50
+    python benchmarks/stress_registrations.py --backend sqlite
+    python benchmarks/stress_registrations.py --journal
+"""
+import argparse
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CONTESTED_PHONE = "9000000000"
+
+
+def _register_batch(args):
+    worker, count = args
+    import utils
+
+    saved = 0
+    errors = []
+    for i in range(count):
+        phone = f"8{worker:04d}{i:05d}"
+        ok, result = utils.save_user({
+            "name": f"worker{worker}-{i}",
+            "email": f"w{worker}.{i}@example.com",
+            "phone": phone,
+            "password": "Abcdef12@",
+            "role": "job",
+        })
+        if ok:
+            saved += 1
+        else:
+            errors.append(result)
+
+    # Every worker races for the same phone number; only one may win
+    contested, _ = utils.save_user({
+        "name": f"contested{worker}",
+        "email": f"contested{worker}@example.com",
+        "phone": CONTESTED_PHONE,
+        "password": "Abcdef12@",
+        "role": "job",
+    })
+    return saved, int(contested), errors
+
+
+def run(processes, per_process, backend, journal):
+    workdir = tempfile.mkdtemp(prefix="kaambazaar-stress-")
+    os.chdir(workdir)
+    os.environ["KAAMBAZAAR_STORAGE"] = backend
+    os.environ["KAAMBAZAAR_USERS_DB"] = os.path.join("data", "users.db")
+    os.environ["KAAMBAZAAR_JSON_WRITE_MODE"] = "journal" if journal else "atomic"
+    # A small compaction threshold so journal mode also exercises compaction
+    os.environ["KAAMBAZAAR_JOURNAL_COMPACT_BYTES"] = str(64 * 1024)
+
+    context = multiprocessing.get_context("spawn")
+    start = time.perf_counter()
+    with context.Pool(processes) as pool:
+        results = pool.map(_register_batch, [(w, per_process) for w in range(processes)])
+    elapsed = time.perf_counter() - start
+
+    import utils
+    users = utils.get_all_users()
+    ids = [u["id"] for u in users]
+    phones = [utils.normalize_phone(u.get("phone")) for u in users]
+    saved = sum(r[0] for r in results)
+    contested_wins = sum(r[1] for r in results)
+    errors = [e for r in results for e in r[2]]
+    expected = processes * per_process + 1
+
+    print(f"backend={backend} journal={journal} workdir={workdir}")
+    print(f"{saved + contested_wins} registrations in {elapsed:.2f}s "
+          f"({(saved + contested_wins) / elapsed:.0f}/s)")
+
+    failures = []
+    if errors:
+        failures.append(f"{len(errors)} registrations failed, e.g. {errors[0]}")
+    if contested_wins != 1:
+        failures.append(f"contested phone registered {contested_wins} times")
+    if len(users) != expected:
+        failures.append(f"expected {expected} users on disk, found {len(users)}")
+    if len(set(ids)) != len(ids):
+        failures.append(f"{len(ids) - len(set(ids))} duplicate IDs")
+    if len(set(phones)) != len(phones):
+        failures.append(f"{len(phones) - len(set(phones))} duplicate phones")
+
+    for failure in failures:
+        print(f"FAIL: {failure}")
+    if not failures:
+        print("OK: no lost updates, duplicate IDs or duplicate phones")
+    return 1 if failures else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--processes", type=int, default=8)
+    parser.add_argument("--per-process", type=int, default=50)
+    parser.add_argument("--backend", choices=["json", "sqlite"], default="json")
+    parser.add_argument("--journal", action="store_true", help="Use the JSON journal write mode")
+    args = parser.parse_args(argv)
+    return run(args.processes, args.per_process, args.backend, args.journal)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
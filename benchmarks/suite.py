@@ -0,0 +1,197 @@
+# suite.py
+"""Benchmark suite with a JSON report for comparing commits.
+
+Generates a users.json of --users synthetic users (generate_users.py) in a
+scratch directory, then times:
+
+- utils functions: read_json (cold and cached), write_json,
+  authenticate_user, find_user_by_phone, get_next_user_id and save_user
+- page renders through streamlit.testing.v1.AppTest: the landing page,
+  the login page and the registration page, each in a fresh session
+
+Each benchmark reports the median, p95 and mean of its runs in ms. The
+report is written to --output together with the commit it ran on, and
+--compare prints the change against an earlier report.
+
+Usage:
+    python benchmarks/suite.py [--users 10000] [--repeat 20] [--output bench_report.json] [--compare old.json]
+    python benchmarks/suite.py --only utils
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from generate_users import PASSWORD, name_for, phone_for, write_users  # noqa: E402
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))] * 1000, 3),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 3),
+    }
+
+
+def measure(repeat, function, setup=None):
+    """Time repeat calls of function(). setup(i) runs untimed before call i"""
+    timings = []
+    for i in range(repeat):
+        argument = setup(i) if setup else None
+        start = time.perf_counter()
+        function() if setup is None else function(argument)
+        timings.append(time.perf_counter() - start)
+    return summarize(timings)
+
+
+def bench_utils(count, repeat, rng):
+    import utils
+
+    results = {}
+    results["read_json_cold"] = measure(
+        max(3, repeat // 4), lambda _: utils.read_json(utils.USERS_FILE),
+        setup=lambda i: utils.invalidate_json_cache())
+    results["read_json_cached"] = measure(repeat, lambda: utils.read_json(utils.USERS_FILE))
+
+    users = utils.read_json(utils.USERS_FILE)
+    copy_path = os.path.join(utils.DATA_FOLDER, "users_copy.json")
+    results["write_json"] = measure(max(3, repeat // 4), lambda: utils.write_json(copy_path, users))
+
+    def random_id(_):
+        return rng.randint(1, count)
+
+    results["authenticate_user"] = measure(
+        repeat, lambda user_id: utils.authenticate_user(
+            name_for(user_id), PASSWORD, "hire" if user_id % 5 == 0 else "job"),
+        setup=random_id)
+    results["find_user_by_phone"] = measure(
+        repeat, lambda user_id: utils.find_user_by_phone(None, phone_for(user_id)), setup=random_id)
+    results["get_next_user_id"] = measure(repeat, lambda: utils.get_next_user_id())
+
+    def new_user(i):
+        return {"name": f"bench user {i}", "email": f"bench{i}@example.com", "phone": f"5{i:09d}",
+                "password": PASSWORD, "role": "job", "city": "Indore"}
+
+    def save(user):
+        saved, result = utils.save_user(user)
+        if not saved:
+            raise RuntimeError(f"save_user failed: {result}")
+
+    results["save_user"] = measure(max(3, repeat // 4), save, setup=new_user)
+    return results
+
+
+def bench_pages(repeat, timeout):
+    from streamlit.testing.v1 import AppTest
+
+    app = os.path.join(REPO_ROOT, "main.py")
+    pages = {
+        "landing_page": {},
+        "login_user": {"page": "login", "role": "job"},
+        "register_user": {"page": "register", "role": "job"},
+    }
+
+    def render(state):
+        at = AppTest.from_file(app, default_timeout=timeout)
+        for key, value in state.items():
+            at.session_state[key] = value
+        start = time.perf_counter()
+        at.run()
+        elapsed = time.perf_counter() - start
+        if at.exception:
+            raise RuntimeError(f"Page raised: {at.exception}")
+        return elapsed
+
+    results = {}
+    for name, state in pages.items():
+        render(state)  # warm up imports and caches
+        results[name] = summarize([render(state) for _ in range(repeat)])
+    return results
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report, baseline):
+    print(f"\nCompared with {baseline.get('commit')} ({baseline.get('users')} users):")
+    for group, results in report["results"].items():
+        for name, result in results.items():
+            old = baseline.get("results", {}).get(group, {}).get(name)
+            if not old or not old.get("median_ms"):
+                continue
+            change = result["median_ms"] / old["median_ms"] - 1
+            print(f"  {group}.{name:<22} {old['median_ms']:10.2f} -> {result['median_ms']:10.2f} ms ({change:+.0%})")
+
+
+def run(args):
+    workdir = tempfile.mkdtemp(prefix="kaambazaar-bench-")
+    os.chdir(workdir)
+    start = time.perf_counter()
+    size = write_users(os.path.join("data", "users.json"), args.users, args.seed)
+    print(f"Generated {args.users} users ({size / 1e6:.1f} MB) in {time.perf_counter() - start:.1f}s at {workdir}")
+
+    report = {
+        "commit": git_commit(),
+        "created_at": datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "users": args.users,
+        "repeat": args.repeat,
+        "results": {},
+    }
+    rng = random.Random(args.seed)
+    if args.only in (None, "utils"):
+        report["results"]["utils"] = bench_utils(args.users, args.repeat, rng)
+    if args.only in (None, "pages"):
+        report["results"]["pages"] = bench_pages(args.repeat, args.timeout)
+
+    for group, results in report["results"].items():
+        for name, result in results.items():
+            print(f"  {group}.{name:<22} median {result['median_ms']:10.2f} ms  p95 {result['p95_ms']:10.2f} ms")
+
+    output = os.path.join(REPO_ROOT, args.output)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump(report, file, indent=2)
+    print(f"Report written to {output}")
+
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as file:
+            compare(report, json.load(file))
+    return 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--only", choices=["utils", "pages"], default=None)
+    parser.add_argument("--timeout", type=float, default=120)
+    parser.add_argument("--output", default="bench_report.json", help="Report path (relative to the repo root)")
+    parser.add_argument("--compare", default=None, help="Earlier report to compare against")
+    args = parser.parse_args(argv)
+    if args.compare:
+        # run() moves into a scratch directory
+        args.compare = os.path.abspath(args.compare)
+    return run(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,119 @@
+# caching.py
+"""Cached page data for Streamlit reruns.
+
+Every widget interaction reruns the page script from the top, so the
+stats, counts and user lookups the pages show are wrapped in
+st.cache_data here. Each cached function takes the generation of the
+store it reads as its first argument. Any write bumps that store's
+generation, and the next call then misses for the entries of that store
+only. Entries of other stores stay cached. The generation is a cheap read
+(the .meta sidecar or one SQLite row), unlike the data behind it.
+
+KAAMBAZAAR_CACHE_TTL (seconds, 0 for none) and KAAMBAZAAR_CACHE_MAX_ENTRIES
+bound each cached function. Hits and misses are counted per page for the
+debug panel in views/cache_debug_view.py.
+"""
+import os
+import threading
+
+import streamlit as st
+
+import utils
+from applications import get_application_store
+
+CACHE_TTL = float(os.environ.get("KAAMBAZAAR_CACHE_TTL", "300")) or None
+CACHE_MAX_ENTRIES = int(os.environ.get("KAAMBAZAAR_CACHE_MAX_ENTRIES", "1000"))
+CACHE_DEBUG = os.environ.get("KAAMBAZAAR_CACHE_DEBUG", "0").lower() in ("1", "true", "yes")
+
+# page -> {"hits": n, "misses": n}, for the whole process
+_page_stats = {}
+_page_stats_lock = threading.Lock()
+# Set by a cached function's body, which only runs on a miss
+_calls = threading.local()
+
+
+def _cache(function):
+    return st.cache_data(ttl=CACHE_TTL, max_entries=CACHE_MAX_ENTRIES, show_spinner=False)(function)
+
+
+def _missed():
+    _calls.missed = True
+
+
+def _lookup(cached_function, *args):
+    """Call a cached function and count the hit or miss against the current page"""
+    _calls.missed = False
+    result = cached_function(*args)
+    page = st.session_state.get("page", "landing")
+    with _page_stats_lock:
+        stats = _page_stats.setdefault(page, {"hits": 0, "misses": 0})
+        stats["misses" if _calls.missed else "hits"] += 1
+    return result
+
+
+def users_generation():
+    return utils.get_user_store().generation()
+
+
+def applications_generation():
+    return get_application_store().generation()
+
+
+@_cache
+def _platform_stats(generation):
+    _missed()
+    return utils.get_platform_stats()
+
+
+@_cache
+def _count_users(generation, role):
+    _missed()
+    return utils.count_users(role)
+
+
+@_cache
+def _get_user(generation, user_id):
+    _missed()
+    return utils.get_user_store().get_user(user_id)
+
+
+@_cache
+def _count_connections(generation):
+    _missed()
+    return get_application_store().count_connections()
+
+
+def platform_stats():
+    """PlatformStats for the landing page"""
+    return _lookup(_platform_stats, users_generation())
+
+
+def count_users(role=None):
+    return _lookup(_count_users, users_generation(), role)
+
+
+def get_user(user_id):
+    """A user record by ID (a copy - cached values are never shared)"""
+    return _lookup(_get_user, users_generation(), user_id)
+
+
+def count_connections():
+    return _lookup(_count_connections, applications_generation())
+
+
+def get_page_stats():
+    """Return {page: {"hits", "misses", "hit_rate"}} since the process started"""
+    with _page_stats_lock:
+        stats = {page: dict(counts) for page, counts in _page_stats.items()}
+    for counts in stats.values():
+        lookups = counts["hits"] + counts["misses"]
+        counts["hit_rate"] = counts["hits"] / lookups if lookups else 0.0
+    return stats
+
+
+def clear():
+    """Drop every cached entry and reset the hit counters"""
+    for function in (_platform_stats, _count_users, _get_user, _count_connections):
+        function.clear()
+    with _page_stats_lock:
+        _page_stats.clear()
@@ -1,4 +1,6 @@
+from vocab import WORK_TYPE
+
 ROLES = ["Job Seeker", "Hirer"]
-WORK_TYPES = ["Maid", "Cook", "Driver", "Cleaner", "Babysitter"]
+WORK_TYPES = WORK_TYPE.builtin
 PASSWORD_MIN_LENGTH = 6
 PHONE_LENGTH = 10
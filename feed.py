@@ -0,0 +1,220 @@
+# feed.py
+"""Personalized job feeds for job seekers.
+
+A seeker's feed holds the open postings in their city or matching one of
+their skills, ranked by skill overlap, city, salary fit and recency. Feeds
+are materialized once and kept sorted; when a posting is created or
+closed only the feeds of seekers in that city or with that skill are
+touched (found through per-city and per-work-type indexes over the
+materialized feeds), so reading a page costs O(page size).
+
+Recency is folded into the score as the posting's creation time scaled to
+"points per week", which ranks newer postings higher the same way at any
+moment, so feeds never need re-scoring as time passes.
+
+Only the KAAMBAZAAR_FEED_CACHE_SIZE most recently read feeds are kept in
+memory; an evicted seeker's feed is rebuilt from the job indexes on their
+next visit.
+"""
+import bisect
+import os
+import threading
+from collections import OrderedDict
+from datetime import datetime
+
+from jobs import get_job_store
+from vocab import fold
+
+FEED_CACHE_SIZE = int(os.environ.get("KAAMBAZAAR_FEED_CACHE_SIZE", "10000"))
+DEFAULT_PAGE_SIZE = 5
+
+# Score weights; a posting one week newer is worth RECENCY_WEIGHT points
+SKILL_WEIGHT = 3.0
+CITY_WEIGHT = 2.0
+SALARY_WEIGHT = 1.0
+RECENCY_WEIGHT = 1.0
+RECENCY_SECONDS = 7 * 24 * 3600
+
+
+def seeker_profile(seeker):
+    """Return the (city, skills, expected salary) a seeker's feed depends on"""
+    skills = seeker.get("work_type") or []
+    if isinstance(skills, str):
+        skills = [skills]
+    try:
+        expected_salary = int(seeker.get("expected_salary") or 0)
+    except (ValueError, TypeError):
+        expected_salary = 0
+    return fold(seeker.get("city")), frozenset(fold(s) for s in skills if fold(s)), expected_salary
+
+
+def score_job(profile, job):
+    """Rank a posting for a seeker profile; higher is better"""
+    city, skills, expected_salary = profile
+    score = 0.0
+    if fold(job.get("work_type")) in skills:
+        score += SKILL_WEIGHT
+    if city and fold(job.get("city")) == city:
+        score += CITY_WEIGHT
+    salary = job.get("salary") or 0
+    if not expected_salary or salary >= expected_salary:
+        score += SALARY_WEIGHT
+    elif salary > 0:
+        score += SALARY_WEIGHT * salary / expected_salary
+    try:
+        created = datetime.fromisoformat(job.get("created_at") or "").timestamp()
+    except (ValueError, TypeError):
+        created = 0
+    return score + RECENCY_WEIGHT * created / RECENCY_SECONDS
+
+
+def belongs_in_feed(profile, job):
+    """True if an open posting is in the seeker's city or needs one of their skills"""
+    city, skills, _ = profile
+    if job.get("status", "open") != "open":
+        return False
+    return bool(city and fold(job.get("city")) == city) or fold(job.get("work_type")) in skills
+
+
+class Feed:
+    """One seeker's ranked postings, kept as a sorted list of (-score, -job id)"""
+
+    def __init__(self, seeker_id, profile):
+        self.seeker_id = seeker_id
+        self.profile = profile
+        self.entries = []
+        self.keys = {}
+
+    def add(self, job):
+        self.discard(job["id"])
+        key = (-score_job(self.profile, job), -job["id"])
+        bisect.insort(self.entries, key)
+        self.keys[job["id"]] = key
+
+    def discard(self, job_id):
+        key = self.keys.pop(job_id, None)
+        if key is not None:
+            position = bisect.bisect_left(self.entries, key)
+            if position < len(self.entries) and self.entries[position] == key:
+                del self.entries[position]
+
+    def page(self, page, page_size):
+        start = max(page - 1, 0) * page_size
+        return [-job_id for _, job_id in self.entries[start:start + page_size]]
+
+
+class FeedEngine:
+    """Materializes seeker feeds and keeps them current as postings change"""
+
+    def __init__(self, job_store=None, max_feeds=FEED_CACHE_SIZE):
+        self.jobs = job_store or get_job_store()
+        self.max_feeds = max_feeds
+        self._lock = threading.Lock()
+        self._feeds = OrderedDict()
+        self._by_city = {}
+        self._by_work_type = {}
+        # job id -> seeker ids whose feed holds the posting
+        self._holders = {}
+        self._epoch = None
+        self.jobs.subscribe(self.job_changed)
+
+    def _sync(self):
+        # Postings written by another process: start over lazily
+        epoch = self.jobs.current_epoch()
+        if epoch != self._epoch:
+            self._feeds.clear()
+            self._by_city.clear()
+            self._by_work_type.clear()
+            self._holders.clear()
+            self._epoch = epoch
+
+    def _index(self, feed):
+        city, skills, _ = feed.profile
+        self._by_city.setdefault(city, set()).add(feed.seeker_id)
+        for skill in skills:
+            self._by_work_type.setdefault(skill, set()).add(feed.seeker_id)
+
+    def _unindex(self, feed):
+        city, skills, _ = feed.profile
+        self._by_city.get(city, set()).discard(feed.seeker_id)
+        for skill in skills:
+            self._by_work_type.get(skill, set()).discard(feed.seeker_id)
+        for job_id in feed.keys:
+            self._holders.get(job_id, set()).discard(feed.seeker_id)
+
+    def _place(self, feed, job):
+        """Add the posting to the feed or take it out, whichever its state calls for"""
+        if belongs_in_feed(feed.profile, job):
+            feed.add(job)
+            self._holders.setdefault(job["id"], set()).add(feed.seeker_id)
+        else:
+            feed.discard(job["id"])
+            self._holders.get(job["id"], set()).discard(feed.seeker_id)
+
+    def _build(self, seeker_id, profile):
+        city, skills, _ = profile
+        feed = Feed(seeker_id, profile)
+        for job_id in self.jobs.candidate_ids([city] if city else [], skills):
+            job = self.jobs.get_job(job_id)
+            if job is not None:
+                self._place(feed, job)
+        return feed
+
+    def _get(self, seeker):
+        seeker_id = seeker.get("id")
+        profile = seeker_profile(seeker)
+        feed = self._feeds.get(seeker_id)
+        if feed is not None and feed.profile == profile:
+            self._feeds.move_to_end(seeker_id)
+            return feed
+        if feed is not None:
+            self._unindex(feed)
+        feed = self._feeds[seeker_id] = self._build(seeker_id, profile)
+        self._index(feed)
+        while len(self._feeds) > self.max_feeds:
+            _, evicted = self._feeds.popitem(last=False)
+            self._unindex(evicted)
+        return feed
+
+    def get_feed(self, seeker, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """Return (postings on the requested page, total postings) for a seeker"""
+        with self._lock:
+            self._sync()
+            feed = self._get(seeker)
+            job_ids = feed.page(page, page_size)
+            total = len(feed.entries)
+        jobs = [self.jobs.get_job(job_id) for job_id in job_ids]
+        return [job for job in jobs if job is not None], total
+
+    def job_changed(self, job_id):
+        """Update the feeds a created, edited or closed posting belongs to"""
+        with self._lock:
+            self._sync()
+            # Re-read under the lock so out-of-order events apply the latest state
+            job = self.jobs.get_job(job_id)
+            if job is None:
+                return
+            # Feeds that may gain the posting, plus those already holding it
+            affected = set(self._by_city.get(fold(job.get("city")), ()))
+            affected.update(self._by_work_type.get(fold(job.get("work_type")), ()))
+            affected.update(self._holders.get(job_id, ()))
+            for seeker_id in affected:
+                feed = self._feeds.get(seeker_id)
+                if feed is not None:
+                    self._place(feed, job)
+            if not self._holders.get(job_id):
+                self._holders.pop(job_id, None)
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_feed_engine():
+    """Return the process-wide feed engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = FeedEngine()
+    return _engine
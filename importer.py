@@ -0,0 +1,220 @@
+# importer.py
+"""Streaming bulk import/export of users (CSV or JSON Lines).
+
+Rows are read, validated and written one batch at a time, so memory stays
+flat no matter how large the input is. Each batch is written with a single
+UserStore.add_users call (one transaction / one file write). Rows that fail
+validation or duplicate an existing phone/email go to a rejects file.
+
+Used by `python manage.py import-users` and `python manage.py export-users`.
+"""
+import csv
+import json
+import multiprocessing
+import os
+
+import utils
+from models import normalize_user
+from passwords import hash_password, is_hashed
+from storage import DuplicateUserError
+from validation import validate_record
+from vocab import canonicalize_record
+
+# Fields collected by the registration form, in export column order
+USER_FIELDS = [
+    "id", "role", "name", "phone", "email", "password", "city",
+    "aadhaar", "age", "gender", "experience", "work_type", "expected_salary", "availability",
+    "company_name", "company_type", "company_address",
+]
+LIST_FIELDS = {"work_type", "availability"}
+INT_FIELDS = {"age", "expected_salary"}
+LIST_SEPARATOR = ";"
+
+
+def detect_format(path, fmt=None):
+    """Return "csv" or "jsonl" from an explicit format or the file extension"""
+    if fmt:
+        return fmt
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+
+def iter_rows(path, fmt=None):
+    """Yield (line_number, row dict) from a CSV or JSON Lines file"""
+    fmt = detect_format(path, fmt)
+    with open(path, "r", encoding="utf-8", newline="") as file:
+        if fmt == "csv":
+            for line_number, row in enumerate(csv.DictReader(file), start=2):
+                yield line_number, row
+            return
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield line_number, {"_error": f"Invalid JSON: {e}"}
+                continue
+            yield line_number, row if isinstance(row, dict) else {"_error": "Expected a JSON object"}
+
+
+def _clean(row, default_role):
+    """Turn a raw CSV/JSON row into a registration-shaped user dict"""
+    user = {}
+    for field in USER_FIELDS:
+        value = row.get(field)
+        if value is None or value == "":
+            continue
+        if field in LIST_FIELDS and isinstance(value, str):
+            value = [item.strip() for item in value.split(LIST_SEPARATOR) if item.strip()]
+        elif field in INT_FIELDS and isinstance(value, str):
+            try:
+                value = int(value)
+            except ValueError:
+                pass
+        elif isinstance(value, str):
+            value = value.strip()
+        user[field] = value
+    user.setdefault("role", default_role)
+    user.pop("id", None)
+    return user
+
+
+def validate_row(item):
+    """Validate and prepare one row. Runs in worker processes.
+
+    Returns (line_number, user record or None, errors dict, raw row).
+    """
+    line_number, row, default_role = item
+    if "_error" in row:
+        return line_number, None, {"row": row["_error"]}, row
+
+    user = canonicalize_record(_clean(row, default_role))
+    password = user.get("password")
+    # Re-imported exports carry hashes, which can't (and needn't) be re-validated
+    already_hashed = is_hashed(password)
+    errors = validate_record(user, roles=utils.ROLES, check_password=not already_hashed)
+    if not errors and not already_hashed:
+        # The KDF is the expensive part of an import, so it runs here
+        user["password"] = hash_password(password)
+
+    if errors:
+        return line_number, None, errors, row
+    return line_number, normalize_user(user), {}, row
+
+
+def _batches(rows, batch_size, default_role):
+    batch = []
+    for line_number, row in rows:
+        batch.append((line_number, row, default_role))
+        if len(batch) >= batch_size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+class ImportResult:
+    def __init__(self):
+        self.read = 0
+        self.imported = 0
+        self.rejected = 0
+
+    def __str__(self):
+        return f"read {self.read}, imported {self.imported}, rejected {self.rejected}"
+
+
+def _write_batch(store, accepted, reject):
+    """Store one batch, falling back to row by row if a concurrent signup collides"""
+    if not accepted:
+        return 0
+    try:
+        return store.add_users([user for _, user, _ in accepted])
+    except DuplicateUserError:
+        pass
+    stored = 0
+    for line_number, user, row in accepted:
+        user.pop("id", None)
+        try:
+            store.add_user(user)
+            stored += 1
+        except DuplicateUserError as e:
+            reject(line_number, {"duplicate": str(e)}, row)
+    return stored
+
+
+def import_users(path, fmt=None, rejects_path=None, batch_size=1000, workers=1,
+                 default_role="job", store=None):
+    """Stream users from a CSV/JSONL file into the user store. Returns an ImportResult"""
+    store = store or utils.get_user_store()
+    rejects_path = rejects_path or path + ".rejects.jsonl"
+    result = ImportResult()
+    pool = multiprocessing.Pool(workers) if workers > 1 else None
+
+    with open(rejects_path, "w", encoding="utf-8") as rejects_file:
+        def reject(line_number, errors, row):
+            result.rejected += 1
+            rejects_file.write(json.dumps({"line": line_number, "errors": errors, "row": row},
+                                          ensure_ascii=False, default=str) + "\n")
+
+        try:
+            for batch in _batches(iter_rows(path, fmt), batch_size, default_role):
+                result.read += len(batch)
+                if pool is not None:
+                    validated = pool.map(validate_row, batch, chunksize=max(1, len(batch) // (workers * 4)))
+                else:
+                    validated = [validate_row(item) for item in batch]
+
+                # Duplicates against earlier batches are caught by the store's
+                # indexes; within a batch by these sets, which never outgrow it
+                seen_phones = set()
+                seen_emails = set()
+                accepted = []
+                for line_number, user, errors, row in validated:
+                    if errors:
+                        reject(line_number, errors, row)
+                        continue
+                    phone = utils.normalize_phone(user.get("phone"))
+                    email = utils.normalize_email(user.get("email"))
+                    if phone in seen_phones or store.find_by_phone(phone):
+                        reject(line_number, {"phone": "Phone number already registered"}, row)
+                        continue
+                    if email and (email in seen_emails or store.find_by_email(email)):
+                        reject(line_number, {"email": "Email already registered"}, row)
+                        continue
+                    seen_phones.add(phone)
+                    if email:
+                        seen_emails.add(email)
+                    accepted.append((line_number, user, row))
+
+                result.imported += _write_batch(store, accepted, reject)
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
+    if result.rejected == 0:
+        os.remove(rejects_path)
+    return result
+
+
+def export_users(path, fmt=None, include_passwords=False, store=None):
+    """Stream every stored user to a CSV/JSONL file. Returns the number written"""
+    store = store or utils.get_user_store()
+    fmt = detect_format(path, fmt)
+    fields = [f for f in USER_FIELDS if include_passwords or f != "password"]
+    count = 0
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        writer = None
+        if fmt == "csv":
+            writer = csv.DictWriter(file, fieldnames=fields, extrasaction="ignore")
+            writer.writeheader()
+        for user in store.iter_users():
+            if not include_passwords:
+                user = {k: v for k, v in user.items() if k != "password"}
+            if writer is not None:
+                writer.writerow({k: LIST_SEPARATOR.join(v) if isinstance(v, list) else v
+                                 for k, v in user.items()})
+            else:
+                file.write(json.dumps(user, ensure_ascii=False) + "\n")
+            count += 1
+    return count
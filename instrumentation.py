@@ -0,0 +1,235 @@
+# instrumentation.py
+"""Call counts and latency percentiles for hot paths.
+
+Off by default. With KAAMBAZAAR_INSTRUMENT=1 the functions decorated
+with @timed() (read_json, write_json, authentication, the validators and
+the page functions in main.py) and code wrapped in `with timer(name):`
+record their call count, total time and recent durations. p50/p95/p99
+come from the last SAMPLE_SIZE calls of each name.
+
+When disabled, @timed() returns the function itself and timer() returns
+a shared no-op context manager, so instrumented code runs as if it
+weren't. The switch is read at import, so changing it needs a restart.
+
+Stats are shown on the admin page (views/admin_view.py) and exported in
+the Prometheus text format:
+- KAAMBAZAAR_METRICS_FILE: a file rewritten at most every
+  METRICS_FILE_INTERVAL seconds, for node_exporter's textfile collector
+  or any local scraper.
+- KAAMBAZAAR_METRICS_PORT: a /metrics HTTP endpoint on localhost.
+"""
+import functools
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from contextlib import nullcontext
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+ENABLED = os.environ.get("KAAMBAZAAR_INSTRUMENT", "0").lower() in ("1", "true", "yes")
+SAMPLE_SIZE = int(os.environ.get("KAAMBAZAAR_INSTRUMENT_SAMPLES", "2048"))
+METRICS_FILE = os.environ.get("KAAMBAZAAR_METRICS_FILE", "")
+METRICS_FILE_INTERVAL = float(os.environ.get("KAAMBAZAAR_METRICS_FILE_INTERVAL", "5"))
+METRICS_PORT = int(os.environ.get("KAAMBAZAAR_METRICS_PORT", "0"))
+QUANTILES = (0.5, 0.95, 0.99)
+
+_NULL_TIMER = nullcontext()
+
+
+class Metric:
+    """Call count, total time and the most recent durations of one name"""
+
+    __slots__ = ("count", "total", "samples", "lock")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+        self.lock = threading.Lock()
+
+    def record(self, seconds):
+        with self.lock:
+            self.count += 1
+            self.total += seconds
+            self.samples.append(seconds)
+
+    def clear(self):
+        with self.lock:
+            self.count = 0
+            self.total = 0.0
+            self.samples.clear()
+
+    def summary(self):
+        with self.lock:
+            count, total, samples = self.count, self.total, sorted(self.samples)
+        summary = {"count": count, "total_s": total, "mean_ms": total / count * 1000 if count else 0.0}
+        for quantile in QUANTILES:
+            value = samples[min(len(samples) - 1, int(len(samples) * quantile))] if samples else 0.0
+            summary[f"p{round(quantile * 100)}_ms"] = value * 1000
+        return summary
+
+
+_metrics = {}
+_metrics_lock = threading.Lock()
+
+
+def get_metric(name):
+    metric = _metrics.get(name)
+    if metric is None:
+        with _metrics_lock:
+            metric = _metrics.setdefault(name, Metric())
+    return metric
+
+
+class _Timer:
+    __slots__ = ("metric", "start")
+
+    def __init__(self, metric):
+        self.metric = metric
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.metric.record(time.perf_counter() - self.start)
+        return False
+
+
+def timer(name):
+    """Context manager timing its block under name (a no-op when disabled)"""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(get_metric(name))
+
+
+def timed(name=None):
+    """Decorator recording each call of the function (the function itself when disabled)"""
+    def decorate(function):
+        if not ENABLED:
+            return function
+        metric = get_metric(name or f"{function.__module__}.{function.__qualname__}")
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                metric.record(time.perf_counter() - start)
+        return wrapper
+    return decorate
+
+
+def snapshot():
+    """Return {name: summary} for every name called so far, sorted by total time"""
+    with _metrics_lock:
+        metrics = list(_metrics.items())
+    summaries = {name: summary for name, summary in ((n, m.summary()) for n, m in metrics) if summary["count"]}
+    return dict(sorted(summaries.items(), key=lambda item: item[1]["total_s"], reverse=True))
+
+
+def reset():
+    """Zero every metric (decorated functions keep their Metric objects)"""
+    with _metrics_lock:
+        metrics = list(_metrics.values())
+    for metric in metrics:
+        metric.clear()
+
+
+def _label(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def prometheus_text():
+    """The current stats in the Prometheus text exposition format"""
+    lines = [
+        "# HELP kaambazaar_call_duration_seconds Duration of instrumented calls (recent samples).",
+        "# TYPE kaambazaar_call_duration_seconds summary",
+    ]
+    for name, summary in snapshot().items():
+        label = _label(name)
+        for quantile in QUANTILES:
+            value = summary[f"p{round(quantile * 100)}_ms"] / 1000
+            lines.append(f'kaambazaar_call_duration_seconds{{name="{label}",quantile="{quantile}"}} {value:.9f}')
+        lines.append(f'kaambazaar_call_duration_seconds_sum{{name="{label}"}} {summary["total_s"]:.9f}')
+        lines.append(f'kaambazaar_call_duration_seconds_count{{name="{label}"}} {summary["count"]}')
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path):
+    """Atomically write the stats to a Prometheus text file"""
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as file:
+            file.write(prometheus_text())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+_last_export = 0.0
+_export_lock = threading.Lock()
+
+
+def maybe_export():
+    """Rewrite METRICS_FILE if it is configured and due. Called after each page run"""
+    global _last_export
+    if not ENABLED or not METRICS_FILE:
+        return
+    now = time.monotonic()
+    if now - _last_export < METRICS_FILE_INTERVAL:
+        return
+    with _export_lock:
+        if now - _last_export < METRICS_FILE_INTERVAL:
+            return
+        _last_export = now
+    try:
+        write_prometheus(METRICS_FILE)
+    except OSError as e:
+        print(f"Error writing metrics to {METRICS_FILE}: {e}")
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def start_metrics_server(port=None):
+    """Serve /metrics on localhost from a daemon thread, once per process"""
+    global _server
+    port = METRICS_PORT if port is None else port
+    if not ENABLED or not port or _server is not None:
+        return _server or None
+    with _server_lock:
+        if _server is None:
+            try:
+                server = ThreadingHTTPServer(("127.0.0.1", port), _MetricsHandler)
+            except OSError as e:
+                # Don't retry on every rerun
+                print(f"Metrics endpoint not started on port {port}: {e}")
+                _server = False
+                return None
+            threading.Thread(target=server.serve_forever, name="metrics-server", daemon=True).start()
+            _server = server
+    return _server
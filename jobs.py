@@ -0,0 +1,262 @@
+# jobs.py
+"""Job postings stored in data/job.json.
+
+Searches go through in-memory inverted indexes (city -> job ids,
+work type -> job ids, employer -> job ids) and a sorted salary index, so
+listing the jobs in a city or a salary band only touches matching
+postings. The indexes are built once per file version and updated
+incrementally on every create/update/close made through the store.
+"""
+import bisect
+import os
+import threading
+from datetime import datetime
+
+import utils
+from vocab import canonicalize_record, fold
+
+JOBS_FILE = os.path.join(utils.DATA_FOLDER, "job.json")
+JOB_STATUSES = ["open", "closed"]
+DEFAULT_PAGE_SIZE = 10
+
+
+def _job_id(job):
+    try:
+        return int(job.get("id"))
+    except (ValueError, TypeError):
+        return None
+
+
+def _salary(job):
+    try:
+        return int(job.get("salary") or 0)
+    except (ValueError, TypeError):
+        return 0
+
+
+class JobIndex:
+    """Inverted and salary indexes over the open job postings"""
+
+    def __init__(self, jobs=()):
+        self.by_id = {}
+        self.by_city = {}
+        self.by_work_type = {}
+        self.by_employer = {}
+        self.open_ids = []
+        # Sorted (salary, job id) pairs for range queries
+        self.salaries = []
+        self.max_id = 0
+        for job in jobs:
+            self.add(job)
+
+    @staticmethod
+    def _insert(ids, job_id):
+        position = bisect.bisect_left(ids, job_id)
+        if position == len(ids) or ids[position] != job_id:
+            ids.insert(position, job_id)
+
+    @staticmethod
+    def _discard(ids, job_id):
+        position = bisect.bisect_left(ids, job_id)
+        if position < len(ids) and ids[position] == job_id:
+            del ids[position]
+
+    def _posting_lists(self, job):
+        lists = [self.by_employer.setdefault(job.get("employer_id"), [])]
+        if job.get("status", "open") == "open":
+            lists.append(self.open_ids)
+            city = fold(job.get("city"))
+            if city:
+                lists.append(self.by_city.setdefault(city, []))
+            work_type = fold(job.get("work_type"))
+            if work_type:
+                lists.append(self.by_work_type.setdefault(work_type, []))
+        return lists
+
+    def add(self, job):
+        job_id = _job_id(job)
+        if job_id is None:
+            return
+        if job_id in self.by_id:
+            self.remove(self.by_id[job_id])
+        self.by_id[job_id] = job
+        self.max_id = max(self.max_id, job_id)
+        # Job IDs only grow, so appending usually keeps the lists sorted
+        for ids in self._posting_lists(job):
+            self._insert(ids, job_id)
+        if job.get("status", "open") == "open":
+            bisect.insort(self.salaries, (_salary(job), job_id))
+
+    def remove(self, job):
+        job_id = _job_id(job)
+        if self.by_id.pop(job_id, None) is None:
+            return
+        for ids in self._posting_lists(job):
+            self._discard(ids, job_id)
+        if job.get("status", "open") == "open":
+            pair = (_salary(job), job_id)
+            position = bisect.bisect_left(self.salaries, pair)
+            if position < len(self.salaries) and self.salaries[position] == pair:
+                del self.salaries[position]
+
+    def salary_range(self, min_salary=None, max_salary=None):
+        """Return the sorted IDs of open jobs paying within [min_salary, max_salary]"""
+        low = bisect.bisect_left(self.salaries, (min_salary, -1)) if min_salary is not None else 0
+        high = (bisect.bisect_right(self.salaries, (max_salary, float("inf")))
+                if max_salary is not None else len(self.salaries))
+        return sorted(job_id for _, job_id in self.salaries[low:high])
+
+
+class JobStore(utils.JsonStore):
+    """Create, update, close and search job postings"""
+
+    def __init__(self, path=JOBS_FILE, journal=None):
+        super().__init__(path, journal)
+        # Bumped whenever the index is rebuilt from disk, i.e. when changes
+        # may have happened that listeners were not told about
+        self.epoch = 0
+        self._listeners = []
+
+    def _build_index(self, jobs):
+        self.epoch += 1
+        return JobIndex(jobs)
+
+    def current_epoch(self):
+        """Reload the index if the file changed on disk and return its epoch"""
+        with self._lock:
+            self._get_index()
+            return self.epoch
+
+    def subscribe(self, listener):
+        """Call listener(job_id) after every create/update made through this store"""
+        self._listeners.append(listener)
+
+    def _notify(self, job_id):
+        # Called outside the store lock, so listeners may read the store
+        for listener in self._listeners:
+            listener(job_id)
+
+    def get_job(self, job_id):
+        try:
+            return self._get_index().by_id.get(int(job_id))
+        except (ValueError, TypeError):
+            return None
+
+    def create_job(self, employer_id, job_data):
+        """Create an open job posting. Returns the stored record or None"""
+        now = datetime.now().isoformat()
+        job = canonicalize_record({
+            "id": None,
+            "employer_id": employer_id,
+            "title": (job_data.get("title") or "").strip(),
+            "work_type": (job_data.get("work_type") or "").strip(),
+            "city": (job_data.get("city") or "").strip(),
+            "salary": _salary(job_data),
+            "availability": job_data.get("availability", []),
+            "description": (job_data.get("description") or "").strip(),
+            "status": "open",
+            "created_at": now,
+            "updated_at": now,
+        })
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            job["id"] = utils.reserve_ids(self.path, 1, floor=index.max_id + 1)[0]
+            if not self._save(job):
+                self._index = None
+                return None
+            index.add(job)
+            self._after_write()
+        self._notify(job["id"])
+        return job
+
+    def update_job(self, job_id, fields):
+        """Merge fields into a posting. Returns the updated record or None"""
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            job = self.get_job(job_id)
+            if job is None:
+                return None
+            fields = canonicalize_record(dict(fields, updated_at=datetime.now().isoformat()))
+            if "salary" in fields:
+                fields["salary"] = _salary(fields)
+            updated = dict(job, **fields)
+            if not self._save(updated, fields):
+                self._index = None
+                return None
+            index.add(updated)
+            self._after_write()
+        self._notify(updated["id"])
+        return updated
+
+    def close_job(self, job_id):
+        """Close a posting so it no longer shows up in searches"""
+        return self.update_job(job_id, {"status": "closed", "closed_at": datetime.now().isoformat()})
+
+    def candidate_ids(self, cities=(), work_types=()):
+        """Return the IDs of open jobs in any of the cities or of any of the work types"""
+        index = self._get_index()
+        with self._lock:
+            ids = set()
+            for city in cities:
+                ids.update(index.by_city.get(fold(city), ()))
+            for work_type in work_types:
+                ids.update(index.by_work_type.get(fold(work_type), ()))
+            return ids
+
+    def search(self, city=None, work_type=None, min_salary=None, max_salary=None,
+               employer_id=None, include_closed=False, page=1, page_size=DEFAULT_PAGE_SIZE):
+        """Find postings matching every given filter, newest first.
+
+        Returns (jobs on the requested page, total matches). Only the
+        postings in the smallest matching index list are visited.
+        """
+        index = self._get_index()
+        with self._lock:
+            candidates = []
+            if employer_id is not None:
+                candidates.append(index.by_employer.get(employer_id, []))
+            if city:
+                candidates.append(index.by_city.get(fold(city), []))
+            if work_type:
+                candidates.append(index.by_work_type.get(fold(work_type), []))
+            if min_salary is not None or max_salary is not None:
+                candidates.append(index.salary_range(min_salary, max_salary))
+            if not candidates:
+                candidates.append(index.open_ids)
+            driver = list(min(candidates, key=len))
+
+        matches = []
+        for job_id in reversed(driver):
+            job = index.by_id.get(job_id)
+            if job is None:
+                continue
+            if not include_closed and job.get("status", "open") != "open":
+                continue
+            if employer_id is not None and job.get("employer_id") != employer_id:
+                continue
+            if city and fold(job.get("city")) != fold(city):
+                continue
+            if work_type and fold(job.get("work_type")) != fold(work_type):
+                continue
+            if min_salary is not None and _salary(job) < min_salary:
+                continue
+            if max_salary is not None and _salary(job) > max_salary:
+                continue
+            matches.append(job_id)
+
+        start = max(page - 1, 0) * page_size
+        return [index.by_id[i] for i in matches[start:start + page_size]], len(matches)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_job_store():
+    """Return the process-wide job store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = JobStore()
+    return _store
@@ -1,8 +1,17 @@
 # main.py
 import streamlit as st
+import caching
+import instrumentation
 from auth.register import register_user
 from auth.login import login_user
-from utils import read_json
+from instrumentation import timed
+from views.admin_view import is_admin, render_admin_stats
+from views.cache_debug_view import cache_debug_enabled, render_cache_debug
+from views.hire_view import render_hire_view
+from views.job_view import render_job_view
+from views.messages_view import render_messages
+from views.notifications_view import render_notifications
+from views.profile_view import run_profiled
 
 # Initialize session state variables
 if "page" not in st.session_state:
@@ -16,6 +25,7 @@ def go_to(page):
     st.session_state.page = page
     st.rerun()
 
+@timed("page.landing_page")
 def landing_page():
     # Hero section with beautiful styling
     st.markdown("""
@@ -29,25 +39,27 @@ def landing_page():
     </div>
     """, unsafe_allow_html=True)
     
-    # Statistics Section
-    users = read_json("data/users.json")
-    job_seekers = [u for u in users if u.get('role') == 'job']
-    employers = [u for u in users if u.get('role') == 'hire']
+    # Statistics Section - counts are maintained by the user store on every write
+    # and cached until its generation changes
+    stats = caching.platform_stats()
+    job_seekers = stats.role_count('job')
+    employers = stats.role_count('hire')
+    total_users = stats.total_users
     
     st.markdown("### 📊 Platform Impact")
     
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        st.metric("👥 Job Seekers", len(job_seekers), delta="Active")
+        st.metric("👥 Job Seekers", job_seekers, delta="Active")
     with col2:
-        st.metric("🏢 Employers", len(employers), delta="Hiring")
+        st.metric("🏢 Employers", employers, delta="Hiring")
     with col3:
-        # Calculate total connections/applications (placeholder)
-        total_connections = len(job_seekers) * 2  # Estimated
-        st.metric("🤝 Connections", total_connections, delta="+12%")
+        # Distinct employer-seeker pairs, counted by the application store as applications come in
+        total_connections = caching.count_connections()
+        st.metric("🤝 Connections", total_connections, delta="Applications")
     with col4:
-        success_rate = "85%" if len(users) > 5 else "Growing"
+        success_rate = "85%" if total_users > 5 else "Growing"
         st.metric("✅ Success Rate", success_rate, delta="High")
     
     # Before & After Impact Section
@@ -100,22 +112,21 @@ def landing_page():
             with st.expander(category):
                 for job in jobs:
                     # Show count of job seekers in this category
-                    job_count = len([u for u in job_seekers if job.lower() in [skill.lower() for skill in u.get('work_type', [])]])
+                    job_count = stats.work_type_count(job)
                     st.write(f"• {job} {f'({job_count} available)' if job_count > 0 else ''}")
     
     # Success Stories (if users exist)
-    if len(users) > 0:
+    if total_users > 0:
         st.markdown("---")
         st.markdown("### 🎉 **Platform Growth**")
         
-        recent_job_seekers = len([u for u in job_seekers if u.get('city')])
-        cities_represented = len(set([u.get('city', '').lower() for u in users if u.get('city')]))
+        cities_represented = stats.city_count()
         
         col1, col2, col3 = st.columns(3)
         with col1:
             st.info(f"🌍 **{cities_represented if cities_represented > 0 else 1}+ Cities** covered across India")
         with col2:
-           st.info(f"💼 **{len(set([skill for u in job_seekers for skill in u.get('work_type', [])]))} Skills** available on platform")
+           st.info(f"💼 **{stats.skill_count()} Skills** available on platform")
         with col3:
             avg_experience = "Entry to Expert" if job_seekers else "All Levels"
             st.info(f"📈 **{avg_experience}** experience levels")
@@ -164,6 +175,7 @@ def landing_page():
     </div>
     """, unsafe_allow_html=True)
 
+@timed("page.auth_choice")
 def auth_choice():
     role_name = "Job Seeker" if st.session_state.role == "job" else "Employer"
     st.title(f"Welcome {role_name}")
@@ -185,12 +197,15 @@ def auth_choice():
         st.session_state.role = None
         go_to("landing")
 
+@timed("page.login_page")
 def login_page():
     login_user(st.session_state.role)
 
+@timed("page.register_page")
 def register_page():
     register_user(st.session_state.role)
 
+@timed("page.dashboard_page")
 def dashboard_page():
     if not st.session_state.current_user:
         st.error("Please login first")
@@ -198,20 +213,18 @@ def dashboard_page():
         return
     
     user = st.session_state.current_user
-    st.title(f"Welcome, {user['name']}!")
+    render_notifications(user)
     
     if user['role'] == 'job':
-        st.write("🔍 **Job Seeker Dashboard**")
-        st.write("Here you can:")
-        st.write("- Search for available jobs")
-        st.write("- Apply to positions")
-        st.write("- View your applications")
+        render_job_view(user)
     else:
-        st.write("🏢 **Employer Dashboard**")
-        st.write("Here you can:")
-        st.write("- Post job openings")
-        st.write("- View applications")
-        st.write("- Manage your listings")
+        render_hire_view(user)
+    
+    st.markdown("---")
+    render_messages(user)
+    
+    if is_admin(user) and st.button("📈 Performance stats", key="admin_stats_btn"):
+        go_to("admin_stats")
     
     # Logout button
     st.write("")
@@ -220,6 +233,11 @@ def dashboard_page():
         st.session_state.role = None
         go_to("landing")
 
+def admin_stats_page():
+    render_admin_stats(st.session_state.current_user)
+    if st.button("← Back to Dashboard", key="admin_back_btn"):
+        go_to("dashboard")
+
 def main():
     # Page navigation
     if st.session_state.page == "landing":
@@ -232,11 +250,18 @@ def main():
         register_page()
     elif st.session_state.page == "dashboard":
         dashboard_page()
+    elif st.session_state.page == "admin_stats":
+        admin_stats_page()
     else:
         # Fallback to landing page
         st.session_state.page = "landing"
         landing_page()
 
+    if cache_debug_enabled():
+        render_cache_debug()
+    instrumentation.start_metrics_server()
+    instrumentation.maybe_export()
+
 if __name__ == "__main__":
     st.set_page_config(
         page_title="Job Portal",
@@ -244,4 +269,4 @@ if __name__ == "__main__":
         layout="centered",
         initial_sidebar_state="collapsed"
     )
-    main()
\ No newline at end of file
+    run_profiled(main)
\ No newline at end of file
@@ -0,0 +1,137 @@
+# manage.py
+"""Maintenance commands for KaamBazaar data.
+
+Usage:
+    python manage.py migrate [--source data/users.json] [--db data/users.db]
+    python manage.py repair-ids [--backend json|sqlite] [--path FILE]
+    python manage.py import-users FILE [--format csv|jsonl] [--rejects FILE] [--workers N]
+    python manage.py export-users FILE [--format csv|jsonl] [--include-passwords]
+    python manage.py normalize [--backend json|sqlite] [--path FILE] [--dry-run]
+"""
+import argparse
+import sys
+
+import importer
+import jobs
+import models
+import storage
+import utils
+import vocab
+
+
+def cmd_migrate(args):
+    """Import users from the JSON file into the SQLite database"""
+    imported, skipped, reassigned = storage.migrate_json_to_sqlite(args.source, args.db)
+    print(f"Imported {imported} users into {args.db} ({skipped} already present, "
+          f"{reassigned} given new IDs)")
+    return 0
+
+
+def cmd_repair_ids(args):
+    """Fix missing/duplicate user IDs and resync the ID sequence"""
+    store = storage.create_store(args.backend, args.path)
+    repaired = store.repair_ids()
+    print(f"Repaired {repaired} user IDs; next ID is {store.next_id()}")
+    return 0
+
+
+def cmd_import_users(args):
+    """Stream users from a CSV/JSONL file into the user store"""
+    result = importer.import_users(
+        args.file, fmt=args.format, rejects_path=args.rejects, batch_size=args.batch_size,
+        workers=args.workers, default_role=args.role,
+    )
+    print(f"Import finished: {result}")
+    if result.rejected:
+        print(f"Rejected rows written to {args.rejects or args.file + '.rejects.jsonl'}")
+    return 0
+
+
+def cmd_export_users(args):
+    """Stream every stored user to a CSV/JSONL file"""
+    count = importer.export_users(args.file, fmt=args.format, include_passwords=args.include_passwords)
+    print(f"Exported {count} users to {args.file}")
+    return 0
+
+
+def _changed_fields(record, normalize=vocab.canonicalize_record):
+    canonical = normalize(record)
+    return {key: value for key, value in canonical.items() if record.get(key) != value}
+
+
+def cmd_normalize(args):
+    """Rewrite users in the current schema and job vocabulary fields in canonical form"""
+    store = storage.create_store(args.backend, args.path)
+    updates = {}
+    for user in store.iter_users():
+        fields = _changed_fields(user, models.normalize_user)
+        if fields and user.get("id") is not None:
+            updates[user["id"]] = fields
+    if not args.dry_run and updates:
+        store.update_users(updates)
+    print(f"{'Would normalize' if args.dry_run else 'Normalized'} {len(updates)} users")
+
+    changed_jobs = [job.get("id") for job in utils.read_json(args.jobs)
+                    if isinstance(job, dict) and _changed_fields(job)]
+    if not args.dry_run and changed_jobs:
+        utils.update_json(args.jobs, lambda data: [
+            vocab.canonicalize_record(job) if isinstance(job, dict) else job for job in data])
+    print(f"{'Would normalize' if args.dry_run else 'Normalized'} {len(changed_jobs)} job postings")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="KaamBazaar maintenance commands")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    migrate = subparsers.add_parser("migrate", help="Import data/users.json into the SQLite backend")
+    migrate.add_argument("--source", default=utils.USERS_FILE, help="JSON users file to import")
+    migrate.add_argument("--db", default=storage.USERS_DB, help="SQLite database to import into")
+    migrate.set_defaults(func=cmd_migrate)
+
+    repair = subparsers.add_parser("repair-ids", help="Fix missing/duplicate IDs and resync the ID sequence")
+    repair.add_argument("--backend", choices=["json", "sqlite"], default=None,
+                        help="Storage backend (defaults to KAAMBAZAAR_STORAGE)")
+    repair.add_argument("--path", default=None, help="Users file or database to repair")
+    repair.set_defaults(func=cmd_repair_ids)
+
+    import_users = subparsers.add_parser("import-users", help="Bulk import users from CSV or JSON Lines")
+    import_users.add_argument("file", help="Input file (.csv or .jsonl)")
+    import_users.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                              help="Input format (defaults to the file extension)")
+    import_users.add_argument("--rejects", default=None,
+                              help="Where to write rejected rows (defaults to FILE.rejects.jsonl)")
+    import_users.add_argument("--batch-size", type=int, default=1000,
+                              help="Rows validated and written per storage transaction")
+    import_users.add_argument("--workers", type=int, default=1,
+                              help="Processes used to validate rows and hash passwords")
+    import_users.add_argument("--role", choices=utils.ROLES, default="job",
+                              help="Role for rows without a role column")
+    import_users.set_defaults(func=cmd_import_users)
+
+    export_users = subparsers.add_parser("export-users", help="Export users to CSV or JSON Lines")
+    export_users.add_argument("file", help="Output file (.csv or .jsonl)")
+    export_users.add_argument("--format", choices=["csv", "jsonl"], default=None,
+                              help="Output format (defaults to the file extension)")
+    export_users.add_argument("--include-passwords", action="store_true",
+                              help="Include password hashes in the export")
+    export_users.set_defaults(func=cmd_export_users)
+
+    normalize = subparsers.add_parser("normalize", help="Canonicalize cities, work types and experience levels")
+    normalize.add_argument("--backend", choices=["json", "sqlite"], default=None,
+                           help="Storage backend (defaults to KAAMBAZAAR_STORAGE)")
+    normalize.add_argument("--path", default=None, help="Users file or database to normalize")
+    normalize.add_argument("--jobs", default=jobs.JOBS_FILE, help="Job postings file to normalize")
+    normalize.add_argument("--dry-run", action="store_true", help="Only report how many records would change")
+    normalize.set_defaults(func=cmd_normalize)
+
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
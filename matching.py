@@ -0,0 +1,281 @@
+# matching.py
+"""Candidate matching for employers.
+
+Job seekers are encoded into compact columnar numpy arrays:
+
+    work_bits     uint64 bitset of the seeker's work types
+    avail_bits    uint8 bitset of availability options
+    city          int32 city code (-1 if unknown)
+    experience    int8 experience level (0 = fresher ... 3 = expert, -1 unknown)
+    salary        int32 expected monthly salary (0 if unknown)
+
+Bit positions and codes are the vocabulary IDs from vocab.py.
+
+A job posting is scored against every seeker in one vectorized pass and
+the best K are picked with argpartition, so a match never loops over
+seekers in Python. See benchmarks/bench_matching.py.
+"""
+import threading
+
+import numpy as np
+
+import utils
+from models import int_or_none
+from vocab import AVAILABILITY, CITY, EXPERIENCE, WORK_TYPE
+
+# Relative weight of each criterion in the match score
+WEIGHTS = {
+    "work_type": 4.0,
+    "city": 2.0,
+    "salary": 2.0,
+    "availability": 1.0,
+    "experience": 1.0,
+}
+
+# Work types past the 64th (interned from free text) can't be matched on
+MAX_WORK_TYPES = 64
+MAX_AVAILABILITY = 8
+
+COLUMNS = ("ids", "work_bits", "avail_bits", "city", "experience", "salary")
+
+
+def _as_list(value):
+    if isinstance(value, str):
+        return [value] if value else []
+    return list(value or [])
+
+
+def _salary(value):
+    return int_or_none(value or 0) or 0
+
+
+def _encode(values, encode):
+    """[encode(value) for value in values], calling encode once per distinct value"""
+    keys = [tuple(value) if isinstance(value, list) else value for value in values]
+    codes = {key: encode(key) for key in set(keys)}
+    return [codes[key] for key in keys]
+
+
+def mask(vocabulary, values, bits):
+    """Bitmask with the bit of every value's vocabulary ID set"""
+    result = 0
+    for value in _as_list(values):
+        label_id = vocabulary.id_of(value)
+        if 0 <= label_id < bits:
+            result |= 1 << label_id
+    return result
+
+
+class SeekerMatrix:
+    """Columnar encoding of job seekers, grown in place as seekers are added"""
+
+    def __init__(self, capacity=1024):
+        self.size = 0
+        # seeker id -> row, built on the first put() or remove()
+        self._rows = None
+        self._allocate(capacity)
+
+    def _allocate(self, capacity):
+        old = getattr(self, "ids", None)
+        columns = {
+            "ids": np.zeros(capacity, dtype=np.int64),
+            "work_bits": np.zeros(capacity, dtype=np.uint64),
+            "avail_bits": np.zeros(capacity, dtype=np.uint8),
+            "city": np.full(capacity, -1, dtype=np.int32),
+            "experience": np.full(capacity, -1, dtype=np.int8),
+            "salary": np.zeros(capacity, dtype=np.int32),
+        }
+        for name, column in columns.items():
+            if old is not None:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+
+    @classmethod
+    def from_users(cls, users):
+        """Encode every job seeker in users, one np.array call per column.
+
+        Seekers share a few hundred distinct cities, skill lists and
+        salaries, so each distinct value is encoded once.
+        """
+        seekers = []
+        ids = []
+        for user in users:
+            if isinstance(user, dict) and user.get("role") == "job":
+                seeker_id = int_or_none(user.get("id"))
+                if seeker_id is not None:
+                    seekers.append(user)
+                    ids.append(seeker_id)
+        n = len(seekers)
+        matrix = cls(capacity=max(n, 1024))
+        matrix.ids[:n] = ids
+        matrix.work_bits[:n] = _encode(
+            [s.get("work_type") for s in seekers], lambda v: mask(WORK_TYPE, v, MAX_WORK_TYPES))
+        matrix.avail_bits[:n] = _encode(
+            [s.get("availability") for s in seekers], lambda v: mask(AVAILABILITY, v, MAX_AVAILABILITY))
+        matrix.city[:n] = _encode([s.get("city") for s in seekers], CITY.id_of)
+        matrix.experience[:n] = _encode([s.get("experience") for s in seekers], EXPERIENCE.id_of)
+        matrix.salary[:n] = _encode([s.get("expected_salary") for s in seekers], _salary)
+        matrix.size = n
+        return matrix
+
+    def _get_rows(self):
+        if self._rows is None:
+            self._rows = dict(zip(self.ids[:self.size].tolist(), range(self.size)))
+        return self._rows
+
+    def _encode_row(self, i, seeker):
+        self.work_bits[i] = mask(WORK_TYPE, seeker.get("work_type"), MAX_WORK_TYPES)
+        self.avail_bits[i] = mask(AVAILABILITY, seeker.get("availability"), MAX_AVAILABILITY)
+        self.city[i] = CITY.id_of(seeker.get("city"))
+        self.experience[i] = EXPERIENCE.id_of(seeker.get("experience"))
+        self.salary[i] = _salary(seeker.get("expected_salary"))
+
+    def add(self, seeker):
+        """Append one seeker record (amortized O(1))"""
+        seeker_id = int_or_none(seeker.get("id"))
+        if seeker_id is None:
+            return
+        if self.size == len(self.ids):
+            self._allocate(len(self.ids) * 2)
+        i = self.size
+        self.ids[i] = seeker_id
+        self._encode_row(i, seeker)
+        self.size += 1
+        if self._rows is not None:
+            self._rows[seeker_id] = i
+
+    def put(self, seeker):
+        """Add a seeker, or re-encode their row if they're already in the matrix"""
+        i = self._get_rows().get(int_or_none(seeker.get("id")))
+        if i is None:
+            self.add(seeker)
+        else:
+            self._encode_row(i, seeker)
+
+    def remove(self, seeker_id):
+        """Drop a seeker by moving the last row into their place"""
+        rows = self._get_rows()
+        i = rows.pop(int_or_none(seeker_id), None)
+        if i is None:
+            return
+        last = self.size - 1
+        if i != last:
+            for name in COLUMNS:
+                column = getattr(self, name)
+                column[i] = column[last]
+            rows[int(self.ids[i])] = i
+        self.size = last
+
+    def score(self, job):
+        """Return the match score of every seeker for a job posting"""
+        n = self.size
+        work_bits = self.work_bits[:n]
+        scores = np.zeros(n, dtype=np.float32)
+
+        job_work = np.uint64(mask(WORK_TYPE, job.get("work_type"), MAX_WORK_TYPES))
+        if job_work:
+            scores += WEIGHTS["work_type"] * ((work_bits & job_work) != 0)
+
+        job_city = CITY.id_of(job.get("city"))
+        if job_city >= 0:
+            scores += WEIGHTS["city"] * (self.city[:n] == job_city)
+
+        job_salary = int(job.get("salary") or 0)
+        if job_salary > 0:
+            # Full marks if the seeker asks for no more than the offer, then
+            # falling linearly to zero at twice the offer
+            expected = self.salary[:n].astype(np.float32)
+            overshoot = np.maximum(expected - job_salary, 0) / job_salary
+            scores += WEIGHTS["salary"] * np.clip(1.0 - overshoot, 0.0, 1.0)
+
+        job_avail = np.uint8(mask(AVAILABILITY, job.get("availability"), MAX_AVAILABILITY))
+        if job_avail:
+            scores += WEIGHTS["availability"] * ((self.avail_bits[:n] & job_avail) != 0)
+
+        min_experience = EXPERIENCE.id_of(job.get("min_experience"))
+        if min_experience >= 0:
+            scores += WEIGHTS["experience"] * (self.experience[:n] >= min_experience)
+
+        return scores
+
+    def top_matches(self, job, k=10, require_work_type=True):
+        """Return [(seeker id, score)] for the k best seekers, best first"""
+        if self.size == 0:
+            return []
+        scores = self.score(job)
+        if require_work_type:
+            job_work = np.uint64(mask(WORK_TYPE, job.get("work_type"), MAX_WORK_TYPES))
+            if job_work:
+                scores[(self.work_bits[:self.size] & job_work) == 0] = -np.inf
+
+        k = min(k, self.size)
+        best = np.argpartition(-scores, k - 1)[:k]
+        best = best[np.argsort(-scores[best], kind="stable")]
+        return [(int(self.ids[i]), float(scores[i])) for i in best if np.isfinite(scores[i])]
+
+
+class MatchingEngine:
+    """Keeps a SeekerMatrix in sync with the user store"""
+
+    def __init__(self, store=None):
+        self.store = store
+        self._lock = threading.Lock()
+        self._matrix = None
+        self._generation = None
+
+    def _get_store(self):
+        return self.store or utils.get_user_store()
+
+    def matrix(self):
+        store = self._get_store()
+        generation = store.generation()
+        with self._lock:
+            if self._matrix is None or generation != self._generation:
+                self._matrix = SeekerMatrix.from_users(store.iter_users())
+                self._generation = generation
+            return self._matrix
+
+    def apply_write(self, user):
+        """Fold one written user record (a signup or an update) into the matrix.
+
+        Seekers are added or re-encoded in place, and writes to other users
+        just move the tracked generation on. Only applies when this was the
+        sole write since the matrix was synced; otherwise the next match
+        rebuilds from the store.
+        """
+        if not isinstance(user, dict):
+            return
+        generation = self._get_store().generation()
+        with self._lock:
+            if self._matrix is None or generation != self._generation + 1:
+                return
+            if user.get("role") == "job":
+                self._matrix.put(user)
+            else:
+                # No-op unless a seeker became an employer
+                self._matrix.remove(user.get("id"))
+            self._generation = generation
+
+    def match(self, job, k=10):
+        """Return [(seeker record, score)] for the k best seekers for a job"""
+        store = self._get_store()
+        results = []
+        for seeker_id, score in self.matrix().top_matches(job, k):
+            seeker = store.get_user(seeker_id)
+            if seeker is not None:
+                results.append((seeker, score))
+        return results
+
+
+_engine = None
+_engine_lock = threading.Lock()
+
+
+def get_matching_engine():
+    """Return the process-wide matching engine"""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                _engine = MatchingEngine()
+    return _engine
@@ -0,0 +1,336 @@
+# messages.py
+"""Messaging between employers and job seekers.
+
+data/message.json is the conversation registry: one record per pair of
+users with its participants and creation time. It only changes when a
+conversation starts, through its journal.
+
+The messages themselves live in append-only per-conversation logs:
+
+    data/messages/<conversation id>/000000.jsonl   one JSON message per line
+    data/messages/<conversation id>/000000.idx     8-byte offset of each line
+    data/messages/<conversation id>/state.json     last message and unread counters
+
+Each segment holds SEGMENT_MESSAGES messages, so message n lives in
+segment n // SEGMENT_MESSAGES and its offset is entry n % SEGMENT_MESSAGES
+of that segment's index. Reading the last N messages seeks straight to
+them: O(N) whatever the length of the history.
+
+state.json is a small per-conversation record rewritten on every send and
+read, so the registry doesn't grow with the traffic. It records how many
+messages it has counted ("seq") and isn't fsynced: the log is the source
+of truth, and messages logged after the last state write (after a crash)
+are counted again on load.
+"""
+import os
+import struct
+import threading
+from datetime import datetime
+
+import serialization
+import utils
+from notifications import publish
+
+MESSAGES_FILE = os.path.join(utils.DATA_FOLDER, "message.json")
+MESSAGES_FOLDER = os.path.join(utils.DATA_FOLDER, "messages")
+SEGMENT_MESSAGES = 1000
+MAX_MESSAGE_LENGTH = 2000
+PREVIEW_LENGTH = 80
+
+STATE_FILE = "state.json"
+
+_OFFSET = struct.Struct(">Q")
+
+
+def _count_message(state, participants, message):
+    """Return state with message counted: new preview, unread bumped for the others"""
+    unread = dict(state.get("unread") or {})
+    for user_id in participants:
+        if user_id != message.get("sender_id"):
+            unread[str(user_id)] = unread.get(str(user_id), 0) + 1
+    return dict(state, seq=message["seq"] + 1, last_message_at=message.get("sent_at"),
+                last_message=(message.get("text") or "")[:PREVIEW_LENGTH], unread=unread)
+
+
+class MessageLog:
+    """Append-only, segmented message log of one conversation"""
+
+    def __init__(self, folder):
+        self.folder = folder
+
+    def _path(self, segment, suffix):
+        return os.path.join(self.folder, f"{segment:06d}{suffix}")
+
+    @property
+    def state_path(self):
+        return os.path.join(self.folder, STATE_FILE)
+
+    def lock(self):
+        """Cross-process lock serialising appends and state writes"""
+        return utils.file_lock(os.path.join(self.folder, "log"))
+
+    def _segment_count(self, segment):
+        try:
+            return os.path.getsize(self._path(segment, ".idx")) // _OFFSET.size
+        except FileNotFoundError:
+            return 0
+
+    def count(self):
+        """Number of messages in the log, from the index sizes alone"""
+        try:
+            segments = [int(name[:-4]) for name in os.listdir(self.folder) if name.endswith(".idx")]
+        except FileNotFoundError:
+            return 0
+        if not segments:
+            return 0
+        last = max(segments)
+        return last * SEGMENT_MESSAGES + self._segment_count(last)
+
+    def append(self, message):
+        """Append a message and return it with its sequence number.
+
+        The line is written before its index entry, so a crash in between
+        leaves an unindexed tail that readers never see.
+        """
+        os.makedirs(self.folder, exist_ok=True)
+        with self.lock():
+            seq = self.count()
+            segment = seq // SEGMENT_MESSAGES
+            message = dict(message, seq=seq)
+            with open(self._path(segment, ".jsonl"), "ab") as log:
+                log.seek(0, os.SEEK_END)
+                offset = log.tell()
+                log.write(serialization.dumps_line(message))
+                log.flush()
+                os.fsync(log.fileno())
+            with open(self._path(segment, ".idx"), "ab") as index:
+                index.write(_OFFSET.pack(offset))
+                index.flush()
+                os.fsync(index.fileno())
+        return message
+
+    def _read_segment(self, segment, start, stop):
+        """Read messages [start, stop) of one segment"""
+        with open(self._path(segment, ".idx"), "rb") as index:
+            index.seek(start * _OFFSET.size)
+            entries = index.read((stop - start) * _OFFSET.size)
+        # Ignore a torn trailing entry
+        entries = entries[:len(entries) - len(entries) % _OFFSET.size]
+        offsets = [offset for (offset,) in _OFFSET.iter_unpack(entries)]
+        if not offsets:
+            return []
+        messages = []
+        with open(self._path(segment, ".jsonl"), "rb") as log:
+            for offset in offsets:
+                log.seek(offset)
+                try:
+                    messages.append(serialization.loads(log.readline()))
+                except ValueError:
+                    continue
+        return messages
+
+    def read(self, start, stop):
+        """Return messages with sequence numbers in [start, stop), oldest first"""
+        messages = []
+        while start < stop:
+            segment = start // SEGMENT_MESSAGES
+            segment_stop = min(stop, (segment + 1) * SEGMENT_MESSAGES)
+            messages.extend(self._read_segment(segment, start % SEGMENT_MESSAGES,
+                                               segment_stop - segment * SEGMENT_MESSAGES))
+            start = segment_stop
+        return messages
+
+    def tail(self, n):
+        """Return the last n messages, oldest first"""
+        total = self.count()
+        return self.read(max(total - n, 0), total)
+
+    def read_state(self):
+        """Return the conversation's state record, or None if it has none"""
+        try:
+            with open(self.state_path, "rb") as file:
+                return serialization.loads(file.read())
+        except (OSError, ValueError):
+            return None
+
+    def write_state(self, state):
+        """Replace the state record. Call with lock() held"""
+        os.makedirs(self.folder, exist_ok=True)
+        temp_path = self.state_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(serialization.dumps(state))
+        os.replace(temp_path, self.state_path)
+
+
+class ConversationIndex:
+    """In-memory lookups over the conversation registry"""
+
+    def __init__(self, conversations=()):
+        self.by_id = {}
+        self.by_pair = {}
+        self.by_user = {}
+        self.max_id = 0
+        for conversation in conversations:
+            self.add(conversation)
+
+    def add(self, conversation):
+        try:
+            conversation_id = int(conversation.get("id"))
+        except (ValueError, TypeError):
+            return
+        self.by_id[conversation_id] = conversation
+        self.max_id = max(self.max_id, conversation_id)
+        participants = conversation.get("participants") or []
+        self.by_pair[frozenset(participants)] = conversation_id
+        for user_id in participants:
+            self.by_user.setdefault(user_id, set()).add(conversation_id)
+
+
+class MessageStore(utils.JsonStore):
+    """Conversations, message logs and unread counters"""
+
+    def __init__(self, path=MESSAGES_FILE, folder=MESSAGES_FOLDER):
+        # The registry only ever grows through its journal
+        super().__init__(path, journal=True)
+        self.folder = folder
+        # conversation id -> (state.json signature, state)
+        self._states = {}
+
+    def _build_index(self, conversations):
+        return ConversationIndex(conversations)
+
+    def _get_record(self, conversation_id):
+        try:
+            return self._get_index().by_id.get(int(conversation_id))
+        except (ValueError, TypeError):
+            return None
+
+    def _get_state(self, conversation):
+        """Return a conversation's state, counting messages logged since it was written"""
+        log = self.log(conversation["id"])
+        signature = utils.get_file_signature(log.state_path)
+        with self._lock:
+            cached = self._states.get(conversation["id"])
+            if cached is not None and cached[0] == signature:
+                return cached[1]
+            state = log.read_state()
+            if state is None:
+                # Conversations started before state.json kept these fields in the registry
+                state = {"seq": log.count() if "unread" in conversation else 0,
+                         "last_message_at": conversation.get("last_message_at"),
+                         "last_message": conversation.get("last_message", ""),
+                         "unread": dict(conversation.get("unread") or {})}
+            total = log.count()
+            if total > state.get("seq", 0):
+                for message in log.read(state.get("seq", 0), total):
+                    state = _count_message(state, conversation.get("participants", []), message)
+            self._states[conversation["id"]] = (signature, state)
+            return state
+
+    def _set_state(self, conversation, log, state):
+        log.write_state(state)
+        with self._lock:
+            self._states[conversation["id"]] = (utils.get_file_signature(log.state_path), state)
+
+    def _with_state(self, conversation):
+        state = self._get_state(conversation)
+        return dict(conversation, last_message_at=state.get("last_message_at"),
+                    last_message=state.get("last_message", ""), unread=state.get("unread") or {})
+
+    def log(self, conversation_id):
+        return MessageLog(os.path.join(self.folder, str(int(conversation_id))))
+
+    def get_conversation(self, conversation_id):
+        conversation = self._get_record(conversation_id)
+        return self._with_state(conversation) if conversation is not None else None
+
+    def get_or_create_conversation(self, user_id, other_id):
+        """Return the conversation between two users, starting one if needed"""
+        if user_id == other_id:
+            return None
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            conversation_id = index.by_pair.get(frozenset((user_id, other_id)))
+            if conversation_id is not None:
+                return self._with_state(index.by_id[conversation_id])
+            conversation = {
+                "id": utils.reserve_ids(self.path, 1, floor=index.max_id + 1)[0],
+                "participants": [user_id, other_id],
+                "created_at": datetime.now().isoformat(),
+            }
+            if not self._save(conversation):
+                self._index = None
+                return None
+            index.add(conversation)
+            self._after_write()
+        return self._with_state(conversation)
+
+    def conversations_for(self, user_id):
+        """Return a user's conversations, most recently active first"""
+        index = self._get_index()
+        conversations = [self._with_state(index.by_id[i]) for i in index.by_user.get(user_id, ())]
+        return sorted(conversations, key=lambda c: c.get("last_message_at") or c.get("created_at") or "",
+                      reverse=True)
+
+    def send_message(self, conversation_id, sender_id, text):
+        """Append a message and bump the other participants' unread counters.
+
+        Returns the stored message, or None if the sender isn't a participant
+        or the message is empty.
+        """
+        text = (text or "").strip()[:MAX_MESSAGE_LENGTH]
+        if not text:
+            return None
+        conversation = self._get_record(conversation_id)
+        if conversation is None or sender_id not in conversation.get("participants", []):
+            return None
+        log = self.log(conversation["id"])
+        with log.lock():
+            state = self._get_state(conversation)
+            message = log.append({"sender_id": sender_id, "text": text, "sent_at": datetime.now().isoformat()})
+            self._set_state(conversation, log, _count_message(state, conversation["participants"], message))
+        sender = utils.get_user_store().get_user(sender_id) or {}
+        for user_id in conversation["participants"]:
+            if user_id != sender_id:
+                publish(user_id, "message", f"New message from {sender.get('name', 'someone')}",
+                        conversation_id=conversation["id"])
+        return message
+
+    def last_messages(self, conversation_id, n=50):
+        """Return the last n messages of a conversation, oldest first"""
+        return self.log(conversation_id).tail(n)
+
+    def mark_read(self, conversation_id, user_id):
+        """Reset a user's unread counter for a conversation"""
+        conversation = self._get_record(conversation_id)
+        if conversation is None:
+            return
+        log = self.log(conversation["id"])
+        with log.lock():
+            state = self._get_state(conversation)
+            unread = state.get("unread") or {}
+            if unread.get(str(user_id)):
+                self._set_state(conversation, log, dict(state, unread=dict(unread, **{str(user_id): 0})))
+
+    def unread_count(self, user_id, conversation_id=None):
+        """Unread messages for a user in one conversation, or across all of them"""
+        if conversation_id is not None:
+            conversation = self._get_record(conversation_id)
+            if conversation is None:
+                return 0
+            return (self._get_state(conversation).get("unread") or {}).get(str(user_id), 0)
+        return sum(self.unread_count(user_id, c) for c in self._get_index().by_user.get(user_id, ()))
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_message_store():
+    """Return the process-wide message store"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = MessageStore()
+    return _store
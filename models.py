@@ -0,0 +1,129 @@
+# models.py
+"""Typed user records.
+
+JobSeeker and Employer keep their fields in __slots__ instead of a
+per-record dict, and their city, work type, experience and availability
+values are the shared label strings from vocab.py, so a million loaded
+users cost a fraction of the memory of a million dicts (see
+benchmarks/bench_models.py).
+
+user_from_dict() is the one validated load path for records of any age:
+it canonicalizes vocabulary fields and folds legacy shapes (a string
+availability or work type, an employer "address" instead of
+"company_address", numbers stored as strings) into the current schema.
+Fields the model doesn't know are kept in `extra`, so nothing is lost on
+a round trip. The stores, matching and the views keep plain dicts;
+normalize_user() turns a dict into the canonical dict shape that
+registration, the importer and `manage.py normalize` write.
+"""
+import sys
+
+from vocab import AVAILABILITY, CITY, EXPERIENCE, WORK_TYPE
+
+
+def int_or_none(value):
+    """int(value), or None for blanks and anything that isn't a number"""
+    if value is None or value == "":
+        return None
+    try:
+        return int(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _str(value):
+    return value.strip() if isinstance(value, str) else ("" if value is None else str(value))
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+class UserModel:
+    """Fields common to every user"""
+
+    __slots__ = ("id", "role", "name", "phone", "email", "password", "city",
+                 "created_at", "updated_at", "extra")
+    # Fields written by to_dict, in output order
+    FIELDS = ("id", "role", "name", "phone", "email", "password", "city", "created_at", "updated_at")
+    # Keys from older record shapes that from_dict folds into current fields
+    LEGACY_FIELDS = ()
+    KNOWN = frozenset(FIELDS)
+
+    @classmethod
+    def from_dict(cls, record):
+        """Build a model from a stored or submitted record, normalizing legacy shapes"""
+        model = cls.__new__(cls)
+        model.id = int_or_none(record.get("id"))
+        model.role = _intern(record.get("role") or "")
+        model.name = _str(record.get("name"))
+        model.phone = _str(record.get("phone"))
+        model.email = _str(record.get("email")).lower()
+        model.password = record.get("password") or ""
+        model.city = CITY.canonical(_str(record.get("city"))) if record.get("city") else ""
+        model.created_at = record.get("created_at")
+        model.updated_at = record.get("updated_at")
+        model._load_role_fields(record)
+        extra = {key: value for key, value in record.items() if key not in cls.KNOWN}
+        model.extra = extra or None
+        return model
+
+    def _load_role_fields(self, record):
+        pass
+
+    def to_dict(self):
+        """Return the record as a dict in the current schema (unset fields omitted)"""
+        record = {}
+        for field in self.FIELDS:
+            value = getattr(self, field)
+            if value is not None:
+                record[field] = list(value) if isinstance(value, tuple) else value
+        if self.extra:
+            record.update(self.extra)
+        return record
+
+    def __repr__(self):
+        return f"{type(self).__name__}(id={self.id!r}, name={self.name!r}, city={self.city!r})"
+
+
+class JobSeeker(UserModel):
+    __slots__ = ("aadhaar", "age", "gender", "experience", "work_type", "expected_salary", "availability")
+    FIELDS = UserModel.FIELDS + __slots__
+    KNOWN = frozenset(FIELDS)
+
+    def _load_role_fields(self, record):
+        self.aadhaar = _str(record.get("aadhaar")) or None
+        self.age = int_or_none(record.get("age"))
+        self.gender = _intern(record.get("gender")) or None
+        experience = record.get("experience")
+        self.experience = EXPERIENCE.canonical(experience) if experience else None
+        # Tuples of shared label strings: no per-record list or string copies
+        self.work_type = tuple(WORK_TYPE.canonical_list(record.get("work_type")))
+        self.expected_salary = int_or_none(record.get("expected_salary"))
+        self.availability = tuple(AVAILABILITY.canonical_list(record.get("availability")))
+
+
+class Employer(UserModel):
+    __slots__ = ("company_name", "company_type", "company_address")
+    FIELDS = UserModel.FIELDS + __slots__
+    # Older records (utils.create_user_record) stored the address as "address"
+    LEGACY_FIELDS = ("address",)
+    KNOWN = frozenset(FIELDS + LEGACY_FIELDS)
+
+    def _load_role_fields(self, record):
+        self.company_name = _str(record.get("company_name")) or None
+        self.company_type = _intern(record.get("company_type")) or None
+        self.company_address = _str(record.get("company_address") or record.get("address")) or None
+
+
+MODELS = {"job": JobSeeker, "hire": Employer}
+
+
+def user_from_dict(record):
+    """Load any user record into its model class"""
+    return MODELS.get(record.get("role"), UserModel).from_dict(record)
+
+
+def normalize_user(record):
+    """Return a record in the current, canonical dict shape"""
+    return user_from_dict(record).to_dict()
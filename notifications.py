@@ -0,0 +1,93 @@
+# notifications.py
+"""Per-user notifications (new messages, applications, ...).
+
+publish() appends the event to the user's log in data/notifications/.
+Delivery is poll-only: a user's sequence number is the byte length of
+their log, so checking for news is a single os.stat, and dashboards only
+rerun when the number moved (see views/notifications_view.py). A
+Streamlit session can't be pushed to from another session's thread, so
+there is no in-process subscriber path.
+
+Logs are append-only and each event is one short line written with a
+single O_APPEND write, which the OS keeps whole even with concurrent
+writers.
+"""
+import json
+import os
+import threading
+from datetime import datetime
+
+import utils
+
+NOTIFICATIONS_FOLDER = os.path.join(utils.DATA_FOLDER, "notifications")
+# How often dashboards check the sequence number, in seconds
+POLL_SECONDS = float(os.environ.get("KAAMBAZAAR_NOTIFY_POLL_SECONDS", "5"))
+
+
+class NotificationBroker:
+    """Per-user append-only event logs, polled by sequence number"""
+
+    def __init__(self, folder=NOTIFICATIONS_FOLDER):
+        self.folder = folder
+
+    def _path(self, user_id):
+        return os.path.join(self.folder, f"{int(user_id)}.jsonl")
+
+    def publish(self, user_id, kind, text, **data):
+        """Append an event to a user's log"""
+        event = dict(data, kind=kind, text=text, at=datetime.now().isoformat())
+        line = (json.dumps(event, ensure_ascii=False) + "\n").encode("utf-8")
+        try:
+            os.makedirs(self.folder, exist_ok=True)
+            fd = os.open(self._path(user_id), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+            try:
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"Error publishing notification for user {user_id}: {e}")
+            return None
+        return event
+
+    def sequence(self, user_id):
+        """Cheap change marker for a user's notifications (0 if there are none)"""
+        try:
+            return os.stat(self._path(user_id)).st_size
+        except (OSError, ValueError, TypeError):
+            return 0
+
+    def events_since(self, user_id, sequence):
+        """Return (events published after sequence, new sequence)"""
+        try:
+            with open(self._path(user_id), "rb") as file:
+                file.seek(sequence)
+                lines = file.readlines()
+                sequence = file.tell()
+        except (OSError, ValueError, TypeError):
+            return [], sequence
+        events = []
+        for line in lines:
+            try:
+                events.append(json.loads(line))
+            except ValueError:
+                continue
+        return events, sequence
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Return the process-wide notification broker"""
+    global _broker
+    if _broker is None:
+        with _broker_lock:
+            if _broker is None:
+                _broker = NotificationBroker()
+    return _broker
+
+
+def publish(user_id, kind, text, **data):
+    """Publish an event to a user through the process-wide broker"""
+    return get_broker().publish(user_id, kind, text, **data)
@@ -0,0 +1,176 @@
+# passwords.py
+"""Salted password hashing for stored user records.
+
+Hashes are stored as self-describing strings so cost settings can change
+without a migration:
+
+    scrypt$<n>$<r>$<p>$<salt>$<hash>
+    pbkdf2_sha256$<iterations>$<salt>$<hash>
+
+Records registered before hashing keep their plaintext password until the
+user's next successful login, which rehashes it (see utils.authenticate_user).
+"""
+import base64
+import hashlib
+import hmac
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+# Cost settings - tune with the benchmark in benchmarks/bench_passwords.py
+PASSWORD_SCHEME = os.environ.get("KAAMBAZAAR_PASSWORD_SCHEME", "scrypt").lower()
+SCRYPT_N = int(os.environ.get("KAAMBAZAAR_SCRYPT_N", 2 ** 14))
+SCRYPT_R = int(os.environ.get("KAAMBAZAAR_SCRYPT_R", 8))
+SCRYPT_P = int(os.environ.get("KAAMBAZAAR_SCRYPT_P", 1))
+PBKDF2_ITERATIONS = int(os.environ.get("KAAMBAZAAR_PBKDF2_ITERATIONS", 260000))
+
+# hashlib releases the GIL while deriving keys, so a few worker threads
+# verify logins in parallel without letting a burst of logins start an
+# unbounded number of KDF runs
+KDF_WORKERS = int(os.environ.get("KAAMBAZAAR_KDF_WORKERS", 4))
+VERIFY_CACHE_SIZE = int(os.environ.get("KAAMBAZAAR_VERIFY_CACHE_SIZE", 1024))
+
+SALT_BYTES = 16
+HASH_BYTES = 32
+_SCHEMES = ("scrypt", "pbkdf2_sha256")
+
+_executor = None
+_executor_lock = threading.Lock()
+
+# Successful verifications, keyed by a keyed hash of (stored hash, password)
+# so the cache never holds anything usable outside this process
+_verify_cache = OrderedDict()
+_verify_cache_lock = threading.Lock()
+_cache_key_secret = os.urandom(32)
+
+
+def _b64encode(raw):
+    return base64.b64encode(raw).decode("ascii")
+
+
+def _b64decode(text):
+    return base64.b64decode(text.encode("ascii"))
+
+
+def _current_params(scheme):
+    if scheme == "scrypt":
+        return (SCRYPT_N, SCRYPT_R, SCRYPT_P)
+    return (PBKDF2_ITERATIONS,)
+
+
+def _derive(scheme, params, password, salt):
+    password = password.encode("utf-8")
+    if scheme == "scrypt":
+        n, r, p = params
+        # Leave headroom above the 128 * n * r bytes scrypt needs
+        return hashlib.scrypt(password, salt=salt, n=n, r=r, p=p,
+                              maxmem=256 * n * r + 1024 * 1024, dklen=HASH_BYTES)
+    (iterations,) = params
+    return hashlib.pbkdf2_hmac("sha256", password, salt, iterations, dklen=HASH_BYTES)
+
+
+def _parse(stored):
+    """Split a stored hash into (scheme, params, salt, hash), or None for plaintext"""
+    if not isinstance(stored, str) or "$" not in stored:
+        return None
+    parts = stored.split("$")
+    try:
+        if parts[0] == "scrypt" and len(parts) == 6:
+            params = tuple(int(x) for x in parts[1:4])
+        elif parts[0] == "pbkdf2_sha256" and len(parts) == 4:
+            params = (int(parts[1]),)
+        else:
+            return None
+        return parts[0], params, _b64decode(parts[-2]), _b64decode(parts[-1])
+    except (ValueError, TypeError):
+        return None
+
+
+def is_hashed(stored):
+    """True if stored is a password hash rather than a legacy plaintext password"""
+    return _parse(stored) is not None
+
+
+def hash_password(password, scheme=None, params=None):
+    """Hash a password with a fresh salt using the configured scheme and cost"""
+    scheme = (scheme or PASSWORD_SCHEME).lower()
+    if scheme not in _SCHEMES:
+        raise ValueError(f"Unknown password scheme: {scheme}")
+    params = tuple(params) if params else _current_params(scheme)
+    salt = os.urandom(SALT_BYTES)
+    derived = _derive(scheme, params, password, salt)
+    fields = [scheme] + [str(x) for x in params] + [_b64encode(salt), _b64encode(derived)]
+    return "$".join(fields)
+
+
+def needs_rehash(stored):
+    """True if stored is plaintext or was hashed with other than the current settings"""
+    parsed = _parse(stored)
+    if parsed is None:
+        return True
+    scheme, params, _, _ = parsed
+    return scheme != PASSWORD_SCHEME or params != _current_params(scheme)
+
+
+def _cache_key(password, stored):
+    message = stored.encode("utf-8") + b"\0" + password.encode("utf-8")
+    return hmac.new(_cache_key_secret, message, hashlib.sha256).digest()
+
+
+def _verify(password, stored):
+    parsed = _parse(stored)
+    if parsed is None:
+        # Legacy plaintext record
+        return hmac.compare_digest(str(stored).encode("utf-8"), password.encode("utf-8"))
+    scheme, params, salt, expected = parsed
+    return hmac.compare_digest(_derive(scheme, params, password, salt), expected)
+
+
+def verify_password(password, stored):
+    """Check a password against a stored hash (or legacy plaintext).
+
+    Successful checks are remembered in a small LRU cache so repeated logins
+    skip the KDF.
+    """
+    if not password or not stored or not isinstance(password, str):
+        return False
+
+    key = _cache_key(password, str(stored))
+    with _verify_cache_lock:
+        if key in _verify_cache:
+            _verify_cache.move_to_end(key)
+            return True
+
+    if not _verify(password, stored):
+        return False
+
+    with _verify_cache_lock:
+        _verify_cache[key] = True
+        while len(_verify_cache) > VERIFY_CACHE_SIZE:
+            _verify_cache.popitem(last=False)
+    return True
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        with _executor_lock:
+            if _executor is None:
+                _executor = ThreadPoolExecutor(max_workers=KDF_WORKERS, thread_name_prefix="kdf")
+    return _executor
+
+
+def verify_password_async(password, stored):
+    """Submit a verification to the bounded KDF worker pool. Returns a Future"""
+    return _get_executor().submit(verify_password, password, stored)
+
+
+def verify_password_pooled(password, stored, timeout=30):
+    """Verify a password in the KDF worker pool and wait for the result"""
+    return verify_password_async(password, stored).result(timeout=timeout)
+
+
+def clear_verify_cache():
+    with _verify_cache_lock:
+        _verify_cache.clear()
@@ -0,0 +1,133 @@
+# profiling.py
+"""Sampled cProfile + tracemalloc profiling of page reruns.
+
+With KAAMBAZAAR_PROFILE=1 every KAAMBAZAAR_PROFILE_EVERY-th rerun in the
+process runs under cProfile and tracemalloc. The default is 1 in 50,
+cheap enough to leave on in production. An admin can also profile every
+rerun of their own session with ?profile=1 (see views/profile_view.py).
+
+Each profiled rerun writes two files to KAAMBAZAAR_PROFILE_DIR:
+- <stamp>-<page>.prof, for pstats or snakeviz
+- <stamp>-<page>.tracemalloc, a tracemalloc.Snapshot.dump() file
+It also keeps the top-N functions by cumulative time and the top-N
+allocation sites in a ProfileReport.
+
+Both profilers are process-wide, so only one rerun is profiled at a
+time. Reruns that come up while another is being profiled run
+unprofiled. Allocations made meanwhile by other sessions' threads show
+up in the snapshot.
+"""
+import cProfile
+import io
+import itertools
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+
+ENABLED = os.environ.get("KAAMBAZAAR_PROFILE", "0").lower() in ("1", "true", "yes")
+SAMPLE_EVERY = max(1, int(os.environ.get("KAAMBAZAAR_PROFILE_EVERY", "50")))
+PROFILE_DIR = os.environ.get("KAAMBAZAAR_PROFILE_DIR", "profiles")
+TOP_N = int(os.environ.get("KAAMBAZAAR_PROFILE_TOP", "20"))
+TRACE_FRAMES = int(os.environ.get("KAAMBAZAAR_PROFILE_FRAMES", "1"))
+
+_reruns = itertools.count(1)
+_profile_lock = threading.Lock()
+_ALLOCATION_FILTERS = [
+    tracemalloc.Filter(False, tracemalloc.__file__),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+]
+
+
+class ProfileReport:
+    """Where one profiled rerun spent its time and memory"""
+
+    __slots__ = ("label", "created_at", "duration", "prof_path", "snapshot_path",
+                 "top_functions", "top_allocations", "allocated")
+
+    def __init__(self, label, duration, prof_path, snapshot_path, top_functions, top_allocations, allocated):
+        self.label = label
+        self.created_at = datetime.now().isoformat(timespec="seconds")
+        self.duration = duration
+        self.prof_path = prof_path
+        self.snapshot_path = snapshot_path
+        self.top_functions = top_functions
+        self.top_allocations = top_allocations
+        self.allocated = allocated
+
+
+def should_profile(forced=False):
+    """Count a rerun and say whether to profile it"""
+    rerun = next(_reruns)
+    return forced or (ENABLED and rerun % SAMPLE_EVERY == 0)
+
+
+def _top_functions(profiler):
+    stream = io.StringIO()
+    pstats.Stats(profiler, stream=stream).strip_dirs().sort_stats("cumulative").print_stats(TOP_N)
+    return stream.getvalue()
+
+
+def _top_allocations(snapshot):
+    statistics = snapshot.filter_traces(_ALLOCATION_FILTERS).statistics("lineno")
+    return [str(stat) for stat in statistics[:TOP_N]], sum(stat.size for stat in statistics)
+
+
+def _write_report(label, profiler, snapshot, duration):
+    os.makedirs(PROFILE_DIR, exist_ok=True)
+    safe_label = "".join(c if c.isalnum() or c in "-_" else "_" for c in label) or "rerun"
+    stem = os.path.join(PROFILE_DIR, f"{datetime.now():%Y%m%d-%H%M%S-%f}-{safe_label}")
+    prof_path, snapshot_path = stem + ".prof", stem + ".tracemalloc"
+    profiler.dump_stats(prof_path)
+    snapshot.dump(snapshot_path)
+    top_allocations, allocated = _top_allocations(snapshot)
+    return ProfileReport(label, duration, prof_path, snapshot_path,
+                         _top_functions(profiler), top_allocations, allocated)
+
+
+@contextmanager
+def profile(label, on_report=None):
+    """Profile the block, then call on_report(ProfileReport).
+
+    on_report is called even when the block raises, which a Streamlit
+    rerun does through st.rerun(). The block runs unprofiled if another
+    rerun is being profiled.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        yield
+        return
+    profiler = cProfile.Profile()
+    started_tracing = not tracemalloc.is_tracing()
+    try:
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler or debugger owns the hook
+            profiler = None
+        if profiler is None:
+            yield
+            return
+        if started_tracing:
+            tracemalloc.start(TRACE_FRAMES)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            profiler.disable()
+            duration = time.perf_counter() - start
+            snapshot = tracemalloc.take_snapshot()
+            if started_tracing:
+                tracemalloc.stop()
+            try:
+                report = _write_report(label, profiler, snapshot, duration)
+            except OSError as e:
+                print(f"Error writing profile to {PROFILE_DIR}: {e}")
+                report = None
+            if report is not None and on_report is not None:
+                on_report(report)
+    finally:
+        _profile_lock.release()
@@ -0,0 +1,152 @@
+# search.py
+"""Ranked full-text and fuzzy search over user profiles.
+
+Profiles are indexed on name, city, work_type, company_name and
+company_address. Text is case-folded and split into word tokens, and an
+inverted index maps each token to the users that contain it, weighted by
+field (a name hit counts more than an address hit) and scaled by rarity.
+Query words that aren't in the index, like typos and half-typed words,
+are matched to indexed words that share most of their trigrams.
+
+SearchIndex is the pure-Python index used by the JSON store. The SQLite
+store uses FTS5 instead and only borrows TrigramMatcher for typos (see
+storage.SqliteUserStore.search). Both are updated as users register.
+"""
+import heapq
+import math
+import re
+
+# Field -> ranking weight
+SEARCH_FIELDS = {
+    "name": 3.0,
+    "work_type": 2.0,
+    "city": 2.0,
+    "company_name": 2.0,
+    "company_address": 1.0,
+}
+FUZZY_THRESHOLD = 0.3
+FUZZY_VARIANTS = 3
+DEFAULT_LIMIT = 20
+
+_TOKEN = re.compile(r"\w+", re.UNICODE)
+
+
+def tokenize(text):
+    """Split text into case-folded word tokens"""
+    if not text:
+        return []
+    if isinstance(text, (list, tuple)):
+        text = " ".join(str(t) for t in text)
+    return _TOKEN.findall(str(text).casefold())
+
+
+def trigrams(token):
+    padded = f"${token}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def profile_tokens(user):
+    """Return {token: weight} for a user's searchable fields"""
+    weights = {}
+    for field, weight in SEARCH_FIELDS.items():
+        for token in tokenize(user.get(field)):
+            weights[token] = max(weights.get(token, 0.0), weight)
+    return weights
+
+
+class TrigramMatcher:
+    """Finds indexed words that look like a (possibly misspelt) query word"""
+
+    def __init__(self, terms=()):
+        self.by_trigram = {}
+        self.terms = set()
+        for term in terms:
+            self.add(term)
+
+    def add(self, term):
+        if term in self.terms:
+            return
+        self.terms.add(term)
+        for gram in trigrams(term):
+            self.by_trigram.setdefault(gram, set()).add(term)
+
+    def similar(self, token, threshold=FUZZY_THRESHOLD, limit=FUZZY_VARIANTS):
+        """Return up to limit [(term, similarity)], most similar first"""
+        grams = trigrams(token)
+        shared = {}
+        for gram in grams:
+            for term in self.by_trigram.get(gram, ()):
+                shared[term] = shared.get(term, 0) + 1
+        scored = []
+        for term, count in shared.items():
+            # Jaccard similarity of the two trigram sets (a padded word of
+            # n characters has n trigrams)
+            similarity = count / (len(grams) + len(term) - count)
+            if similarity >= threshold:
+                scored.append((similarity, term))
+        return [(term, similarity) for similarity, term in heapq.nlargest(limit, scored)]
+
+    def expand(self, token):
+        """Return [(term, factor)]: the token itself if indexed, plus near misses"""
+        variants = [(token, 1.0)] if token in self.terms else []
+        variants.extend((term, similarity) for term, similarity in self.similar(token) if term != token)
+        return variants
+
+
+class SearchIndex:
+    """Inverted index of profile tokens with trigram fuzzy matching"""
+
+    def __init__(self, users=()):
+        self.postings = {}
+        self.roles = {}
+        self.matcher = TrigramMatcher()
+        for user in users:
+            self.add(user)
+
+    @staticmethod
+    def _user_id(user):
+        try:
+            return int(user.get("id"))
+        except (ValueError, TypeError):
+            return None
+
+    def add(self, user):
+        user_id = self._user_id(user)
+        if user_id is None:
+            return
+        self.roles[user_id] = user.get("role")
+        for token, weight in profile_tokens(user).items():
+            self.postings.setdefault(token, {})[user_id] = weight
+            self.matcher.add(token)
+
+    def remove(self, user):
+        user_id = self._user_id(user)
+        if user_id is None:
+            return
+        self.roles.pop(user_id, None)
+        for token in profile_tokens(user):
+            posting = self.postings.get(token)
+            if posting is not None:
+                posting.pop(user_id, None)
+                if not posting:
+                    del self.postings[token]
+
+    def replace(self, old_user, new_user):
+        self.remove(old_user)
+        self.add(new_user)
+
+    def search(self, query, role=None, limit=DEFAULT_LIMIT):
+        """Return [(user id, score)] for the best matches, best first"""
+        total = max(len(self.roles), 1)
+        scores = {}
+        for token in set(tokenize(query)):
+            for term, factor in self.matcher.expand(token):
+                posting = self.postings.get(term)
+                if not posting:
+                    continue
+                idf = math.log(1 + total / len(posting))
+                for user_id, weight in posting.items():
+                    scores[user_id] = scores.get(user_id, 0.0) + weight * idf * factor
+        if role is not None:
+            scores = {user_id: score for user_id, score in scores.items() if self.roles.get(user_id) == role}
+        return heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
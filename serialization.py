@@ -0,0 +1,158 @@
+# serialization.py
+"""JSON codecs for the data files.
+
+Parsing data/*.json is the main CPU cost of a cold page render, so the
+codec is pluggable: orjson or msgspec are used when installed and the
+stdlib json module otherwise. KAAMBAZAAR_JSON_CODEC picks one explicitly
+("orjson", "msgspec", "stdlib"); the default "auto" takes the fastest
+available. Every codec reads what any other wrote.
+
+KAAMBAZAAR_JSON_FORMAT chooses how snapshots are written: "pretty"
+(indented and human-readable, the default) or "compact" (no whitespace,
+smaller and faster to parse). orjson only indents by two spaces, so its
+pretty output differs in whitespace from the stdlib's four.
+
+With KAAMBAZAAR_MSGPACK_SNAPSHOT=1 and the msgpack package installed,
+write_json also leaves a binary <file>.msgpack next to the JSON file.
+It records the signature of the JSON file it mirrors, and read_json only
+uses it while the JSON file is unchanged, so a hand edit of the JSON is
+never masked by a stale snapshot.
+"""
+import json
+import os
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+CODEC_NAME = os.environ.get("KAAMBAZAAR_JSON_CODEC", "auto").lower()
+JSON_FORMAT = os.environ.get("KAAMBAZAAR_JSON_FORMAT", "pretty").lower()
+MSGPACK_SNAPSHOT = os.environ.get("KAAMBAZAAR_MSGPACK_SNAPSHOT", "0").lower() in ("1", "true", "yes")
+MSGPACK_SUFFIX = ".msgpack"
+
+
+class StdlibCodec:
+    name = "stdlib"
+
+    def loads(self, data):
+        return json.loads(data)
+
+    def dumps(self, obj, pretty=False):
+        if pretty:
+            text = json.dumps(obj, indent=4, ensure_ascii=False)
+        else:
+            text = json.dumps(obj, ensure_ascii=False, separators=(",", ":"))
+        return text.encode("utf-8")
+
+
+class OrjsonCodec:
+    name = "orjson"
+
+    def loads(self, data):
+        # orjson.JSONDecodeError subclasses json.JSONDecodeError
+        return orjson.loads(data)
+
+    def dumps(self, obj, pretty=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if pretty:
+            option |= orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+
+
+class MsgspecCodec:
+    name = "msgspec"
+
+    def __init__(self):
+        self._encoder = msgspec.json.Encoder()
+        self._decoder = msgspec.json.Decoder()
+
+    def loads(self, data):
+        try:
+            return self._decoder.decode(data.encode("utf-8") if isinstance(data, str) else data)
+        except msgspec.DecodeError as e:
+            # Callers catch ValueError, as for the other codecs
+            raise ValueError(str(e)) from e
+
+    def dumps(self, obj, pretty=False):
+        encoded = self._encoder.encode(obj)
+        return msgspec.json.format(encoded, indent=4) if pretty else encoded
+
+
+def available_codecs():
+    """Return the names of the codecs that can run here, fastest first"""
+    names = []
+    if orjson is not None:
+        names.append("orjson")
+    if msgspec is not None:
+        names.append("msgspec")
+    names.append("stdlib")
+    return names
+
+
+def make_codec(name="auto"):
+    """Build a codec by name; "auto" picks the fastest installed one"""
+    name = (name or "auto").lower()
+    if name == "auto":
+        name = available_codecs()[0]
+    if name == "orjson" and orjson is not None:
+        return OrjsonCodec()
+    if name == "msgspec" and msgspec is not None:
+        return MsgspecCodec()
+    if name not in ("stdlib", "orjson", "msgspec"):
+        raise ValueError(f"Unknown JSON codec: {name}")
+    # A configured codec that isn't installed degrades to the stdlib
+    return StdlibCodec()
+
+
+codec = make_codec(CODEC_NAME)
+
+
+def loads(data):
+    """Parse JSON text or bytes. Raises ValueError on invalid input"""
+    return codec.loads(data)
+
+
+def dumps(obj, pretty=False):
+    """Serialize to UTF-8 JSON bytes"""
+    return codec.dumps(obj, pretty=pretty)
+
+
+def dumps_line(obj):
+    """Serialize to one compact JSON Lines record (bytes, newline-terminated)"""
+    return codec.dumps(obj) + b"\n"
+
+
+def dumps_snapshot(obj):
+    """Serialize a data file's contents in the configured on-disk format"""
+    return codec.dumps(obj, pretty=JSON_FORMAT != "compact")
+
+
+def msgpack_enabled():
+    return MSGPACK_SNAPSHOT and msgpack is not None
+
+
+def pack_snapshot(data, source_signature):
+    """Encode data as a msgpack snapshot of the JSON file with source_signature"""
+    return msgpack.packb({"source": list(source_signature), "data": data}, use_bin_type=True)
+
+
+def unpack_snapshot(raw, source_signature):
+    """Return the data of a msgpack snapshot, or None if it mirrors another version"""
+    try:
+        snapshot = msgpack.unpackb(raw, raw=False, strict_map_key=False)
+    except Exception:
+        return None
+    if not isinstance(snapshot, dict) or snapshot.get("source") != list(source_signature):
+        return None
+    return snapshot.get("data")
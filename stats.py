@@ -0,0 +1,98 @@
+# stats.py
+"""Platform statistics kept up to date on every user write.
+
+The landing and login pages used to rebuild role lists, city and skill
+sets from every user on each rerun. A PlatformStats aggregate is instead
+updated incrementally by the user stores, so the pages read counts in O(1).
+Cities and work types are counted under their vocab.fold() key, the same
+one job search and the feeds match on.
+"""
+from vocab import fold
+
+
+def _work_types(user):
+    work_types = user.get("work_type") or []
+    if isinstance(work_types, str):
+        work_types = [work_types]
+    return work_types
+
+
+def stat_deltas(user, sign=1):
+    """Return the (kind, key, delta) changes a user makes to the aggregate"""
+    deltas = [("role", user.get("role") or "", sign)]
+    city = fold(user.get("city"))
+    if city:
+        deltas.append(("city", city, sign))
+    if user.get("role") == "job":
+        # Count each work type once per seeker
+        for work_type in {fold(w) for w in _work_types(user)}:
+            if work_type:
+                deltas.append(("work_type", work_type, sign))
+    return deltas
+
+
+class PlatformStats:
+    """Counts of users by role, city and (for job seekers) work type"""
+
+    KINDS = ("role", "city", "work_type")
+
+    def __init__(self):
+        self.counts = {kind: {} for kind in self.KINDS}
+
+    @classmethod
+    def from_users(cls, users):
+        stats = cls()
+        for user in users:
+            stats.add_user(user)
+        return stats
+
+    @classmethod
+    def from_rows(cls, rows):
+        """Build from (kind, key, count) rows, e.g. the SQLite user_stats table"""
+        stats = cls()
+        for kind, key, count in rows:
+            if kind in stats.counts and count > 0:
+                stats.counts[kind][key] = count
+        return stats
+
+    def apply(self, deltas):
+        for kind, key, delta in deltas:
+            counts = self.counts[kind]
+            count = counts.get(key, 0) + delta
+            if count > 0:
+                counts[key] = count
+            else:
+                counts.pop(key, None)
+
+    def add_user(self, user):
+        self.apply(stat_deltas(user, 1))
+
+    def remove_user(self, user):
+        self.apply(stat_deltas(user, -1))
+
+    def copy(self):
+        stats = PlatformStats()
+        stats.counts = {kind: dict(counts) for kind, counts in self.counts.items()}
+        return stats
+
+    @property
+    def total_users(self):
+        return sum(self.counts["role"].values())
+
+    def role_count(self, role):
+        return self.counts["role"].get(role, 0)
+
+    def city_count(self):
+        """Number of distinct cities users come from"""
+        return len(self.counts["city"])
+
+    def skill_count(self):
+        """Number of distinct work types offered by job seekers"""
+        return len(self.counts["work_type"])
+
+    def work_type_count(self, work_type):
+        """Number of job seekers offering a work type (case-insensitive)"""
+        return self.counts["work_type"].get(fold(work_type), 0)
+
+    def to_dict(self):
+        return {kind: dict(counts) for kind, counts in self.counts.items()}
@@ -0,0 +1,813 @@
+# storage.py
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+
+import serialization
+import utils
+from search import DEFAULT_LIMIT, SEARCH_FIELDS, SearchIndex, TrigramMatcher, tokenize
+from stats import PlatformStats, stat_deltas
+
+# Backend selection - "json" keeps the original data/users.json file,
+# "sqlite" uses an embedded database with indexed lookup columns
+STORAGE_BACKEND = os.environ.get("KAAMBAZAAR_STORAGE", "json").lower()
+USERS_DB = os.environ.get("KAAMBAZAAR_USERS_DB", os.path.join(utils.DATA_FOLDER, "users.db"))
+
+
+class DuplicateUserError(ValueError):
+    """Raised when a new user's email or phone is already registered"""
+
+
+def check_duplicate(record, find_by_email, find_by_phone, seen_emails=None, seen_phones=None):
+    """Raise DuplicateUserError if the record's email or phone is taken.
+
+    seen_emails/seen_phones hold the normalized keys of the rest of the
+    current batch, so duplicates inside one batch are caught as well.
+    """
+    email = utils.normalize_email(record.get("email"))
+    if email and ((seen_emails is not None and email in seen_emails) or find_by_email(email)):
+        raise DuplicateUserError("Email already registered")
+    phone = utils.normalize_phone(record.get("phone"))
+    if phone and ((seen_phones is not None and phone in seen_phones) or find_by_phone(phone)):
+        raise DuplicateUserError("Phone number already registered")
+    if seen_emails is not None and email:
+        seen_emails.add(email)
+    if seen_phones is not None and phone:
+        seen_phones.add(phone)
+
+
+class UserStore:
+    """Interface shared by all user storage backends.
+
+    Writes are safe across processes: IDs are assigned and duplicate
+    email/phone checks are made while holding the backend's write lock.
+    """
+
+    def all_users(self):
+        """Return every user record, ordered by ID"""
+        raise NotImplementedError
+
+    def iter_users(self):
+        """Iterate over every user record without building a list where possible"""
+        return iter(self.all_users())
+
+    def count_users(self, role=None):
+        """Count users, optionally only those with the given role"""
+        return len([u for u in self.all_users() if role is None or u.get("role") == role])
+
+    def get_user(self, user_id):
+        """Return the user with the given ID or None"""
+        raise NotImplementedError
+
+    def find_by_email(self, email):
+        """Return the user registered with this email or None"""
+        raise NotImplementedError
+
+    def find_by_phone(self, phone):
+        """Return the user registered with this phone number or None"""
+        raise NotImplementedError
+
+    def find_by_name(self, name, role):
+        """Return all users with this exact name and role"""
+        raise NotImplementedError
+
+    def find_by_normalized_name(self, name, role):
+        """Return all users with this role whose name matches ignoring case and spacing"""
+        wanted = utils.normalize_name(name)
+        return [u for u in self.iter_users()
+                if u.get("role") == role and utils.normalize_name(u.get("name")) == wanted]
+
+    def next_id(self):
+        """Return the next free user ID without reserving it"""
+        raise NotImplementedError
+
+    def reserve_ids(self, count=1):
+        """Reserve count consecutive IDs from the persisted sequence. Returns a range"""
+        raise NotImplementedError
+
+    def repair_ids(self):
+        """Offline maintenance: fix missing/duplicate IDs and resync the sequence.
+
+        Returns the number of repaired users.
+        """
+        raise NotImplementedError
+
+    def add_user(self, user_record, check_duplicates=True):
+        """Persist a new user, assigning an ID if missing. Returns the stored record.
+
+        Raises DuplicateUserError if the email or phone is already registered.
+        """
+        if self.add_users([user_record], check_duplicates=check_duplicates):
+            return user_record
+        return None
+
+    def add_users(self, user_records, check_duplicates=True):
+        """Persist many users in one write. Returns the number of stored records"""
+        raise NotImplementedError
+
+    def update_user(self, user_id, fields):
+        """Merge fields into an existing user. Returns the updated record or None"""
+        raise NotImplementedError
+
+    def update_users(self, updates):
+        """Apply {user id: fields} in one write. Returns the updated records"""
+        updated = (self.update_user(user_id, fields) for user_id, fields in updates.items())
+        return [user for user in updated if user is not None]
+
+    def generation(self):
+        """Return a counter that changes on every write to the store"""
+        raise NotImplementedError
+
+    def get_stats(self):
+        """Return a PlatformStats snapshot, maintained incrementally on writes"""
+        raise NotImplementedError
+
+    def search(self, query, role=None, limit=DEFAULT_LIMIT):
+        """Return the user records best matching a free-text query, best first"""
+        users = self.all_users()
+        by_id = {u.get("id"): u for u in users}
+        return [by_id[i] for i, _ in SearchIndex(users).search(query, role, limit)]
+
+
+class UserIndex:
+    """In-memory secondary indexes over a list of user records.
+
+    Maps normalized phone -> id, normalized email -> id and (role, name) -> ids,
+    so lookups don't scan or re-normalize every stored user. Also keeps the
+    PlatformStats aggregate for the indexed users.
+    """
+
+    def __init__(self, users=()):
+        self.by_id = {}
+        self.by_email = {}
+        self.by_phone = {}
+        self.by_role_name = {}
+        self.by_role_normalized_name = None
+        self.stats = PlatformStats()
+        self.max_id = 0
+        for user in users:
+            self.add(user)
+
+    def add(self, user):
+        try:
+            user_id = int(user.get("id"))
+        except (ValueError, TypeError):
+            return
+        if user_id in self.by_id:
+            self.remove(self.by_id[user_id])
+        self.by_id[user_id] = user
+        self.max_id = max(self.max_id, user_id)
+        self.stats.add_user(user)
+
+        # First registration wins, matching the old linear scans
+        email = utils.normalize_email(user.get("email"))
+        if email:
+            self.by_email.setdefault(email, user_id)
+        phone = utils.normalize_phone(user.get("phone"))
+        if phone:
+            self.by_phone.setdefault(phone, user_id)
+        self.by_role_name.setdefault((user.get("role"), user.get("name")), []).append(user_id)
+        if self.by_role_normalized_name is not None:
+            self._add_normalized_name(user, user_id)
+
+    def remove(self, user):
+        try:
+            user_id = int(user.get("id"))
+        except (ValueError, TypeError):
+            return
+        if self.by_id.pop(user_id, None) is None:
+            return
+        self.stats.remove_user(user)
+        email = utils.normalize_email(user.get("email"))
+        if self.by_email.get(email) == user_id:
+            del self.by_email[email]
+        phone = utils.normalize_phone(user.get("phone"))
+        if self.by_phone.get(phone) == user_id:
+            del self.by_phone[phone]
+        ids = self.by_role_name.get((user.get("role"), user.get("name")), [])
+        if user_id in ids:
+            ids.remove(user_id)
+        if self.by_role_normalized_name is not None:
+            ids = self.by_role_normalized_name.get((user.get("role"), utils.normalize_name(user.get("name"))), [])
+            if user_id in ids:
+                ids.remove(user_id)
+
+    def _add_normalized_name(self, user, user_id):
+        key = (user.get("role"), utils.normalize_name(user.get("name")))
+        self.by_role_normalized_name.setdefault(key, []).append(user_id)
+
+    def find_by_normalized_name(self, name, role):
+        if self.by_role_normalized_name is None:
+            # Only login fallbacks need it, so it's built on the first one
+            self.by_role_normalized_name = {}
+            for user_id, user in self.by_id.items():
+                self._add_normalized_name(user, user_id)
+        key = (role, utils.normalize_name(name))
+        return [self.by_id[i] for i in self.by_role_normalized_name.get(key, [])]
+
+    def replace(self, old_user, new_user):
+        self.remove(old_user)
+        self.add(new_user)
+
+    def get(self, user_id):
+        return self.by_id.get(user_id) if user_id is not None else None
+
+
+class JsonUserStore(utils.JsonStore, UserStore):
+    """User store backed by a single JSON array file (the original format).
+
+    Lookups go through a UserIndex that is built once per file version and
+    updated incrementally on every add/update made through this store. It is
+    only rebuilt when another process changes the file.
+
+    With journal=True new users and updates are appended to the file's
+    JSON Lines journal instead of rewriting the whole file (see
+    utils.JSON_WRITE_MODE).
+    """
+
+    def __init__(self, path=utils.USERS_FILE, journal=None):
+        super().__init__(path, journal)
+        # Built on the first search, then kept in step with the UserIndex
+        self._search_index = None
+
+    def _build_index(self, users):
+        self._search_index = None
+        return UserIndex(users)
+
+    def all_users(self):
+        return self._load()
+
+    def count_users(self, role=None):
+        index = self._get_index()
+        if role is None:
+            return len(index.by_id)
+        return index.stats.role_count(role)
+
+    def get_stats(self):
+        with self._lock:
+            return self._get_index().stats.copy()
+
+    def get_user(self, user_id):
+        try:
+            return self._get_index().get(int(user_id))
+        except (ValueError, TypeError):
+            return None
+
+    def search(self, query, role=None, limit=DEFAULT_LIMIT):
+        with self._lock:
+            index = self._get_index()
+            if self._search_index is None:
+                self._search_index = SearchIndex(index.by_id.values())
+            return [index.by_id[i] for i, _ in self._search_index.search(query, role, limit)]
+
+    def find_by_email(self, email):
+        index = self._get_index()
+        return index.get(index.by_email.get(utils.normalize_email(email)))
+
+    def find_by_phone(self, phone):
+        index = self._get_index()
+        return index.get(index.by_phone.get(utils.normalize_phone(phone)))
+
+    def find_by_name(self, name, role):
+        index = self._get_index()
+        return [index.by_id[i] for i in index.by_role_name.get((role, name), [])]
+
+    def find_by_normalized_name(self, name, role):
+        with self._lock:
+            return self._get_index().find_by_normalized_name(name, role)
+
+    def next_id(self):
+        return utils.peek_next_id(self.path, floor=self._get_index().max_id + 1)
+
+    def reserve_ids(self, count=1):
+        with self._lock, utils.file_lock(self.path):
+            # Never hand out an ID that is already taken, even if the
+            # sequence file was lost
+            floor = self._get_index().max_id + 1
+            return utils.reserve_ids(self.path, count, floor=floor)
+
+    def repair_ids(self):
+        with self._lock, utils.file_lock(self.path):
+            users = self._load(strict=True)
+            repaired = utils.repair_user_ids(users)
+            if repaired and not utils.write_json(self.path, users):
+                raise OSError(f"Could not write repaired users to {self.path}")
+            utils.reset_id_sequence(self.path, utils.get_next_user_id(users))
+            self._index = None
+            return repaired
+
+    def add_users(self, user_records, check_duplicates=True):
+        # The file lock makes index refresh, ID assignment and the write one
+        # atomic step across processes; the index is re-checked against the
+        # file inside it so another process's signups are seen
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            added = []
+            seen_emails = set()
+            seen_phones = set()
+            for record in user_records:
+                if check_duplicates:
+                    check_duplicate(record, self.find_by_email, self.find_by_phone,
+                                    seen_emails, seen_phones)
+                added.append(record)
+            if not added:
+                return 0
+            # One reservation for the whole batch
+            missing = [record for record in added if not record.get("id")]
+            if missing:
+                for record, new_id in zip(missing, self.reserve_ids(len(missing))):
+                    record["id"] = new_id
+            if self.journal:
+                saved = utils.append_json(self.path, added)
+            else:
+                # Refuse to rewrite a corrupt file - it would wipe every user
+                saved = utils.write_json(self.path, self._load(strict=True) + added)
+            if not saved:
+                # Force a rebuild from whatever is on disk now
+                self._index = None
+                return 0
+            for record in added:
+                index.add(record)
+                if self._search_index is not None:
+                    self._search_index.add(record)
+            self._after_write()
+            return len(added)
+
+    def update_user(self, user_id, fields):
+        updated = self.update_users({user_id: fields})
+        return updated[0] if updated else None
+
+    def update_users(self, updates):
+        with self._lock, utils.file_lock(self.path):
+            index = self._get_index()
+            changes = []
+            for user_id, fields in updates.items():
+                user = self.get_user(user_id)
+                if user is not None:
+                    # Records are shared with the read_json cache, so never edit in place
+                    changes.append((user, dict(user, **fields), fields))
+            if not changes:
+                return []
+            if self.journal:
+                saved = utils.update_json_records(
+                    self.path, {user.get("id"): fields for user, _, fields in changes})
+            else:
+                replacements = {user.get("id"): updated for user, updated, _ in changes}
+                users = [replacements.get(u.get("id"), u) for u in self._load(strict=True)]
+                saved = utils.write_json(self.path, users)
+            if not saved:
+                self._index = None
+                return []
+            for user, updated, _ in changes:
+                index.replace(user, updated)
+                if self._search_index is not None:
+                    self._search_index.replace(user, updated)
+            self._after_write()
+            return [updated for _, updated, _ in changes]
+
+
+class SqliteUserStore(UserStore):
+    """User store backed by an embedded SQLite database.
+
+    The full record is kept as JSON in the ``data`` column; the fields used
+    for lookups are copied into indexed columns so logins and duplicate
+    checks never scan the table.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS users (
+            id INTEGER PRIMARY KEY,
+            role TEXT NOT NULL DEFAULT '',
+            name TEXT NOT NULL DEFAULT '',
+            email_key TEXT,
+            phone_key TEXT,
+            data TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_users_email ON users(email_key);
+        CREATE INDEX IF NOT EXISTS idx_users_phone ON users(phone_key);
+        CREATE INDEX IF NOT EXISTS idx_users_role_name ON users(role, name);
+        CREATE TABLE IF NOT EXISTS store_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS user_stats (
+            kind TEXT NOT NULL,
+            key TEXT NOT NULL,
+            count INTEGER NOT NULL,
+            PRIMARY KEY (kind, key)
+        );
+    """
+
+    # Full-text index over the search fields (plus the role, for filtering),
+    # kept current by triggers
+    SEARCH_COLUMNS = ", ".join(list(SEARCH_FIELDS) + ["role"])
+    SEARCH_VALUES = ", ".join([f"json_extract(new.data, '$.{field}')" for field in SEARCH_FIELDS] + ["new.role"])
+    SEARCH_SCHEMA = f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS user_search USING fts5(
+            {", ".join(SEARCH_FIELDS)}, role UNINDEXED, tokenize = 'unicode61 remove_diacritics 2'
+        );
+        CREATE VIRTUAL TABLE IF NOT EXISTS user_search_terms USING fts5vocab(user_search, 'row');
+        CREATE TRIGGER IF NOT EXISTS users_search_insert AFTER INSERT ON users BEGIN
+            INSERT INTO user_search (rowid, {SEARCH_COLUMNS}) VALUES (new.id, {SEARCH_VALUES});
+        END;
+        CREATE TRIGGER IF NOT EXISTS users_search_update AFTER UPDATE OF data ON users BEGIN
+            DELETE FROM user_search WHERE rowid = old.id;
+            INSERT INTO user_search (rowid, {SEARCH_COLUMNS}) VALUES (new.id, {SEARCH_VALUES});
+        END;
+        CREATE TRIGGER IF NOT EXISTS users_search_delete AFTER DELETE ON users BEGIN
+            DELETE FROM user_search WHERE rowid = old.id;
+        END;
+    """
+    SEARCH_WEIGHTS = ", ".join([str(weight) for weight in SEARCH_FIELDS.values()] + ["0"])
+    # Bump when stats.stat_deltas changes its keys, to rebuild user_stats
+    STATS_VERSION = 2
+    # How long the typo matcher's word list may lag other processes' signups
+    TERMS_MAX_AGE = 60
+
+    def __init__(self, path=USERS_DB):
+        self.path = path
+        # Streamlit serves every session on its own thread and sqlite
+        # connections can't be shared between threads
+        self._local = threading.local()
+        self._conn().executescript(self.SCHEMA)
+        self._ensure_stats()
+        self._fts = self._ensure_search()
+        self._search_lock = threading.Lock()
+        self._matcher = None
+        self._matcher_built = 0
+        # Fallback index for SQLite builds without FTS5, keyed on generation
+        self._search_index = None
+        self._search_generation = None
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit mode - transactions are opened explicitly in _transaction
+            conn = sqlite3.connect(self.path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self):
+        """Run a write transaction that holds the database write lock from the start.
+
+        BEGIN IMMEDIATE serializes writers across processes, so the
+        duplicate checks and MAX(id) + 1 done inside can't race.
+        """
+        conn = self._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+            conn.execute(
+                "INSERT INTO store_meta (key, value) VALUES ('generation', 1) "
+                "ON CONFLICT(key) DO UPDATE SET value = value + 1"
+            )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _row_values(record):
+        return (
+            int(record["id"]),
+            record.get("role") or "",
+            record.get("name") or "",
+            utils.normalize_email(record.get("email")) or None,
+            utils.normalize_phone(record.get("phone")) or None,
+            serialization.dumps(record).decode("utf-8"),
+        )
+
+    def _fetch_one(self, query, params):
+        row = self._conn().execute(query, params).fetchone()
+        return serialization.loads(row[0]) if row else None
+
+    def all_users(self):
+        return list(self.iter_users())
+
+    def iter_users(self):
+        # A dedicated connection, so callers can write while iterating
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            for row in conn.execute("SELECT data FROM users ORDER BY id"):
+                yield serialization.loads(row[0])
+        finally:
+            conn.close()
+
+    def count_users(self, role=None):
+        if role is None:
+            row = self._conn().execute(
+                "SELECT COALESCE(SUM(count), 0) FROM user_stats WHERE kind = 'role'"
+            ).fetchone()
+        else:
+            row = self._conn().execute(
+                "SELECT COALESCE(SUM(count), 0) FROM user_stats WHERE kind = 'role' AND key = ?", (role,)
+            ).fetchone()
+        return row[0]
+
+    def get_stats(self):
+        rows = self._conn().execute("SELECT kind, key, count FROM user_stats")
+        return PlatformStats.from_rows(rows)
+
+    def _ensure_stats(self):
+        # Databases created before user_stats existed, or counted under older
+        # keys (before STATS_VERSION), get it built once
+        conn = self._conn()
+        row = conn.execute("SELECT value FROM store_meta WHERE key = 'stats_built'").fetchone()
+        if row and row[0] >= self.STATS_VERSION:
+            return
+        with self._transaction() as conn:
+            stats = PlatformStats.from_users(self.all_users())
+            conn.execute("DELETE FROM user_stats")
+            conn.executemany(
+                "INSERT INTO user_stats (kind, key, count) VALUES (?, ?, ?)",
+                [(kind, key, count) for kind, counts in stats.counts.items() for key, count in counts.items()],
+            )
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('stats_built', ?)",
+                         (self.STATS_VERSION,))
+
+    def _ensure_search(self):
+        """Create and backfill the FTS5 index. Returns False if FTS5 is unavailable"""
+        conn = self._conn()
+        try:
+            conn.executescript(self.SEARCH_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if conn.execute("SELECT 1 FROM store_meta WHERE key = 'search_built'").fetchone():
+            return True
+        columns = ", ".join([f"json_extract(data, '$.{field}')" for field in SEARCH_FIELDS] + ["role"])
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM user_search")
+            conn.execute(f"INSERT INTO user_search (rowid, {self.SEARCH_COLUMNS}) "
+                         f"SELECT id, {columns} FROM users")
+            conn.execute("INSERT OR REPLACE INTO store_meta (key, value) VALUES ('search_built', 1)")
+        return True
+
+    def _get_matcher(self):
+        with self._search_lock:
+            if self._matcher is None or time.monotonic() - self._matcher_built > self.TERMS_MAX_AGE:
+                terms = (row[0] for row in self._conn().execute("SELECT term FROM user_search_terms"))
+                self._matcher = TrigramMatcher(terms)
+                self._matcher_built = time.monotonic()
+            return self._matcher
+
+    def search(self, query, role=None, limit=DEFAULT_LIMIT):
+        if not self._fts:
+            with self._search_lock:
+                generation = self.generation()
+                if self._search_index is None or generation != self._search_generation:
+                    self._search_index = SearchIndex(self.iter_users())
+                    self._search_generation = generation
+                results = self._search_index.search(query, role, limit)
+            return [user for user in (self.get_user(i) for i, _ in results) if user is not None]
+
+        # Every word and its close spellings (unknown words also as a
+        # prefix), any of which may match; bm25 ranks profiles matching more
+        # of them first
+        matcher = self._get_matcher()
+        variants = set()
+        for token in tokenize(query):
+            if token not in matcher.terms:
+                variants.add(f'"{token}"*')
+            variants.update(f'"{term}"' for term, _ in matcher.expand(token))
+        if not variants:
+            return []
+        # Rank inside the FTS table and only join the winners to users
+        sql = (f"SELECT u.data FROM (SELECT rowid, bm25(user_search, {self.SEARCH_WEIGHTS}) AS score "
+               f"FROM user_search WHERE user_search MATCH ?{' AND role = ?' if role is not None else ''} "
+               f"ORDER BY score LIMIT ?) AS hits JOIN users u ON u.id = hits.rowid ORDER BY hits.score")
+        params = [" OR ".join(sorted(variants))] + ([role] if role is not None else []) + [limit]
+        return [serialization.loads(row[0]) for row in self._conn().execute(sql, params)]
+
+    @staticmethod
+    def _apply_stats(conn, deltas):
+        conn.executemany(
+            "INSERT INTO user_stats (kind, key, count) VALUES (?, ?, ?) "
+            "ON CONFLICT(kind, key) DO UPDATE SET count = count + excluded.count",
+            deltas,
+        )
+
+    def get_user(self, user_id):
+        try:
+            user_id = int(user_id)
+        except (ValueError, TypeError):
+            return None
+        return self._fetch_one("SELECT data FROM users WHERE id = ?", (user_id,))
+
+    def find_by_email(self, email):
+        email = utils.normalize_email(email)
+        if not email:
+            return None
+        return self._fetch_one("SELECT data FROM users WHERE email_key = ? LIMIT 1", (email,))
+
+    def find_by_phone(self, phone):
+        phone = utils.normalize_phone(phone)
+        if not phone:
+            return None
+        return self._fetch_one("SELECT data FROM users WHERE phone_key = ? LIMIT 1", (phone,))
+
+    def find_by_name(self, name, role):
+        rows = self._conn().execute(
+            "SELECT data FROM users WHERE role = ? AND name = ? ORDER BY id", (role, name)
+        )
+        return [serialization.loads(row[0]) for row in rows]
+
+    def find_by_normalized_name(self, name, role):
+        if not self._fts:
+            return super().find_by_normalized_name(name, role)
+        # Profiles whose name has all the words (FTS5 folds case), narrowed
+        # down to the ones whose whole name matches
+        words = [word for word in str(name or "").split() if tokenize(word)]
+        if not words:
+            return super().find_by_normalized_name(name, role)
+        match = " AND ".join('name : "{}"'.format(word.replace('"', '""')) for word in words)
+        try:
+            rows = self._conn().execute(
+                "SELECT u.data FROM user_search s JOIN users u ON u.id = s.rowid "
+                "WHERE user_search MATCH ? AND s.role = ? ORDER BY u.id", (match, role))
+            candidates = [serialization.loads(row[0]) for row in rows]
+        except sqlite3.OperationalError:
+            return super().find_by_normalized_name(name, role)
+        wanted = utils.normalize_name(name)
+        return [u for u in candidates if utils.normalize_name(u.get("name")) == wanted]
+
+    def _sequence_start(self, conn):
+        # Stay above MAX(id) (an O(log n) primary key lookup) in case rows
+        # were inserted with explicit IDs
+        row = conn.execute(
+            "SELECT MAX(COALESCE((SELECT value FROM store_meta WHERE key = 'next_id'), 1), "
+            "(SELECT COALESCE(MAX(id), 0) + 1 FROM users))"
+        ).fetchone()
+        return row[0]
+
+    def next_id(self):
+        return self._sequence_start(self._conn())
+
+    def reserve_ids(self, count=1):
+        with self._transaction() as conn:
+            return self._reserve_ids(conn, count)
+
+    def _reserve_ids(self, conn, count):
+        start = self._sequence_start(conn)
+        conn.execute(
+            "INSERT INTO store_meta (key, value) VALUES ('next_id', ?) "
+            "ON CONFLICT(key) DO UPDATE SET value = excluded.value",
+            (start + count,),
+        )
+        return range(start, start + count)
+
+    def repair_ids(self):
+        # The primary key already rules out missing or duplicate IDs, so only
+        # the sequence needs to be brought back in line with the data
+        with self._transaction() as conn:
+            conn.execute(
+                "INSERT INTO store_meta (key, value) "
+                "SELECT 'next_id', COALESCE(MAX(id), 0) + 1 FROM users WHERE true "
+                "ON CONFLICT(key) DO UPDATE SET value = excluded.value"
+            )
+        return 0
+
+    def generation(self):
+        row = self._conn().execute("SELECT value FROM store_meta WHERE key = 'generation'").fetchone()
+        return row[0] if row else 0
+
+    def _insert(self, conn, record):
+        if not record.get("id"):
+            record["id"] = self._reserve_ids(conn, 1)[0]
+        conn.execute(
+            "INSERT INTO users (id, role, name, email_key, phone_key, data) VALUES (?, ?, ?, ?, ?, ?)",
+            self._row_values(record),
+        )
+        self._apply_stats(conn, stat_deltas(record))
+        if self._matcher is not None:
+            # New words become typo targets right away in this process
+            with self._search_lock:
+                for token in tokenize([record.get(field) for field in SEARCH_FIELDS if record.get(field)]):
+                    self._matcher.add(token)
+        return record
+
+    def add_users(self, user_records, check_duplicates=True):
+        count = 0
+        # One transaction for the whole batch; rows inserted earlier in the
+        # batch are visible to the duplicate checks of later ones
+        with self._transaction() as conn:
+            for record in user_records:
+                if check_duplicates:
+                    check_duplicate(record, self.find_by_email, self.find_by_phone)
+                self._insert(conn, record)
+                count += 1
+        return count
+
+    def update_user(self, user_id, fields):
+        with self._transaction() as conn:
+            user = self.get_user(user_id)
+            if user is None:
+                return None
+            self._apply_stats(conn, stat_deltas(user, -1))
+            user.update(fields)
+            self._apply_stats(conn, stat_deltas(user))
+            values = self._row_values(user)
+            conn.execute(
+                "UPDATE users SET role = ?, name = ?, email_key = ?, phone_key = ?, data = ? WHERE id = ?",
+                values[1:] + values[:1],
+            )
+        return user
+
+    def update_users(self, updates):
+        # update_user joins this transaction, so the batch commits once
+        with self._transaction():
+            return super().update_users(updates)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def create_store(backend=None, path=None):
+    """Build a store for the given backend name ("json" or "sqlite")"""
+    backend = (backend or STORAGE_BACKEND).lower()
+    if backend == "sqlite":
+        return SqliteUserStore(path or USERS_DB)
+    if backend == "json":
+        return JsonUserStore(path or utils.USERS_FILE)
+    raise ValueError(f"Unknown storage backend: {backend}")
+
+
+def get_store():
+    """Return the process-wide store for the configured backend"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = create_store()
+    return _store
+
+
+def set_store(store):
+    """Replace the process-wide store (used by maintenance commands)"""
+    global _store
+    with _store_lock:
+        _store = store
+
+
+def _without_id(user):
+    return {key: value for key, value in user.items() if key != "id"}
+
+
+def _already_migrated(target, user):
+    """Whether a user without a usable ID was imported by an earlier run"""
+    record = _without_id(user)
+    return any(_without_id(existing) == record
+               for existing in target.find_by_name(user.get("name") or "", user.get("role") or ""))
+
+
+def migrate_json_to_sqlite(json_path=utils.USERS_FILE, db_path=USERS_DB):
+    """Import every user from a JSON users file into a SQLite store.
+
+    Users already present in the database (same ID) are skipped, so the
+    migration can safely be re-run. Users with a missing, invalid or
+    duplicate ID get a fresh one instead of failing the whole import; on a
+    re-run they're recognised by their other fields. Returns (imported,
+    skipped, reassigned).
+    """
+    source = JsonUserStore(json_path)
+    target = SqliteUserStore(db_path)
+
+    skipped = 0
+    pending = []
+    needs_id = []
+    seen_ids = set()
+    for user in source.all_users():
+        try:
+            user_id = int(user.get("id"))
+        except (ValueError, TypeError):
+            user_id = 0
+        if user_id <= 0 or user_id in seen_ids:
+            if _already_migrated(target, user):
+                skipped += 1
+            else:
+                needs_id.append(user)
+            continue
+        seen_ids.add(user_id)
+        if target.get_user(user_id) is not None:
+            skipped += 1
+            continue
+        pending.append(user)
+    # Fresh IDs come from the sequence, which stays above MAX(id), so these
+    # go in after every user keeping their own ID
+    reassigned = [_without_id(user) for user in needs_id]
+    # Keep legacy data as-is, even if it has duplicate phones or emails
+    imported = target.add_users(pending + reassigned, check_duplicates=False)
+    for old, new in zip(needs_id, reassigned):
+        print(f"Assigned ID {new['id']} to user: {new.get('name', 'Unknown')} (was {old.get('id')!r})")
+    return imported, skipped, len(reassigned)
@@ -0,0 +1,31 @@
+import json
+
+from streamlit.testing.v1 import AppTest
+
+
+def _dashboard():
+    import streamlit as st
+    from views.messages_view import open_conversation, render_messages
+
+    user = {"id": 1, "name": "Employer", "role": "hire"}
+    for other_id in (2, 3):
+        if st.button(f"Message {other_id}", key=f"message_{other_id}"):
+            open_conversation(user, other_id)
+            st.rerun()
+    render_messages(user)
+
+
+def test_message_button_opens_its_conversation_over_an_open_one(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "data").mkdir()
+    users = [{"id": i, "name": f"User {i}", "role": "job" if i > 1 else "hire"} for i in (1, 2, 3)]
+    (tmp_path / "data" / "users.json").write_text(json.dumps(users))
+
+    at = AppTest.from_function(_dashboard, default_timeout=30).run()
+    at.button(key="message_2").click().run()
+    assert at.selectbox(key="conversation_select").value == 1
+
+    at.button(key="message_3").click().run()
+    conversations = at.selectbox(key="conversation_select")
+    assert conversations.value == 2
+    assert "User 3" in conversations.format_func(conversations.value)
@@ -1,39 +1,581 @@
 # utils.py
 import json
 import os
-import re
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
 from datetime import datetime
 
+import serialization
+from instrumentation import timed
+from models import normalize_user
+from passwords import hash_password, needs_rehash, verify_password_pooled
+from vocab import AVAILABILITY, CITY, EXPERIENCE, WORK_TYPE
+from validation import (  # noqa: F401 - re-exported for existing callers
+    AADHAAR_LENGTH,
+    PASSWORD_MIN_LENGTH,
+    PHONE_LENGTH,
+    normalize_email,
+    normalize_name,
+    normalize_phone,
+    password_strength,
+    validate_aadhaar,
+    validate_email,
+    validate_many,
+    validate_password,
+    validate_phone,
+    validate_record,
+)
+
+try:
+    import fcntl
+except ImportError:  # Windows - file_lock falls back to a lock file
+    fcntl = None
+
 DATA_FOLDER = "data"
+USERS_FILE = os.path.join(DATA_FOLDER, "users.json")
 os.makedirs(DATA_FOLDER, exist_ok=True)
 
-def read_json(filename):
-    """Read JSON file, return empty list if file doesn't exist"""
-    if not os.path.exists(filename):
-        return []
+# os.umask can only be read by setting it, so read it once at import
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+# How write-heavy JSON files are persisted. "atomic" rewrites the whole file
+# through a temp file + fsync + rename. "journal" appends new records to a
+# JSON Lines journal next to the file (an O(1) append per signup) and folds
+# the journal back into the snapshot once it grows past JOURNAL_COMPACT_BYTES.
+JSON_WRITE_MODE = os.environ.get("KAAMBAZAAR_JSON_WRITE_MODE", "atomic").lower()
+JOURNAL_SUFFIX = ".journal"
+LOCK_SUFFIX = ".lock"
+META_SUFFIX = ".meta"
+JOURNAL_COMPACT_BYTES = int(os.environ.get("KAAMBAZAAR_JOURNAL_COMPACT_BYTES", 1024 * 1024))
+
+# Process-wide cache of parsed JSON files, shared by all Streamlit sessions.
+# Entries are keyed by absolute path and revalidated with os.stat, so a file
+# is only parsed again when its mtime, size or inode changes. Journal growth
+# is applied incrementally from the last offset read.
+_json_cache = {}
+_json_cache_lock = threading.Lock()
+_json_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+class _CacheEntry:
+    __slots__ = ("signature", "data", "positions", "journal_offset", "error")
+
+    def __init__(self, signature, data, positions, journal_offset, error):
+        self.signature = signature
+        self.data = data
+        # record id -> index in data, so journal replay finds records in O(1)
+        self.positions = positions
+        self.journal_offset = journal_offset
+        self.error = error
+
+def _file_signature(stat_result):
+    return (stat_result.st_mtime_ns, stat_result.st_size, stat_result.st_ino)
+
+def get_file_signature(filename):
+    """Return (mtime_ns, size, inode) for a file, or None if it doesn't exist"""
+    try:
+        return _file_signature(os.stat(filename))
+    except OSError:
+        return None
+
+def get_json_signature(filename):
+    """Return the combined signature of a JSON file and its journal"""
+    return (get_file_signature(filename), get_file_signature(filename + JOURNAL_SUFFIX))
+
+def invalidate_json_cache(filename=None):
+    """Drop the cached contents of one file, or of every file if filename is None"""
+    with _json_cache_lock:
+        if filename is None:
+            _json_cache.clear()
+        else:
+            _json_cache.pop(os.path.abspath(filename), None)
+        _json_cache_stats["invalidations"] += 1
+
+def get_json_cache_stats():
+    """Return hit/miss counters for the read_json cache"""
+    with _json_cache_lock:
+        stats = dict(_json_cache_stats)
+        stats["entries"] = len(_json_cache)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+    return stats
+
+def _read_msgpack_snapshot(filename):
+    """Return the data of a current msgpack snapshot of filename, or None"""
+    signature = get_file_signature(filename)
+    if signature is None:
+        return None
     try:
-        with open(filename, "r", encoding='utf-8') as file:
-            data = json.load(file)
-            # Ensure we return a list
-            if isinstance(data, list):
-                return data
-            return []
-    except (json.JSONDecodeError, FileNotFoundError, Exception):
+        with open(filename + serialization.MSGPACK_SUFFIX, "rb") as file:
+            raw = file.read()
+    except OSError:
+        return None
+    data = serialization.unpack_snapshot(raw, signature)
+    return data if isinstance(data, list) else None
+
+def _read_snapshot(filename):
+    """Parse a JSON array file. Returns (data, error)"""
+    if serialization.msgpack_enabled():
+        data = _read_msgpack_snapshot(filename)
+        if data is not None:
+            return data, None
+    try:
+        with open(filename, "rb") as file:
+            content = file.read()
+    except FileNotFoundError:
+        return [], None
+    except Exception as e:
+        return [], str(e)
+    # An empty file (like a freshly created data/job.json) is just an empty list
+    if not content.strip():
+        return [], None
+    try:
+        data = serialization.loads(content)
+    except ValueError as e:
+        print(f"Error reading {filename}: {e}")
+        return [], str(e)
+    # Ensure we return a list
+    if not isinstance(data, list):
+        return [], "expected a JSON array"
+    return data, None
+
+def _record_positions(data):
+    """Map each record id to the index of its first record in data"""
+    positions = {}
+    for position, record in enumerate(data):
+        if isinstance(record, dict):
+            positions.setdefault(record.get("id"), position)
+    return positions
+
+def _apply_journal(data, positions, journal_path, offset):
+    """Replay journal entries written after offset. Returns the new offset.
+
+    positions (record id -> index in data) is kept up to date, so each
+    entry costs O(1) however many records the file holds.
+    """
+    try:
+        with open(journal_path, "rb") as file:
+            file.seek(offset)
+            chunk = file.read()
+    except FileNotFoundError:
+        return 0
+
+    # Only consume complete lines; a torn last line from a crash (or an
+    # append still in progress) is picked up on the next read
+    end = chunk.rfind(b"\n") + 1
+    for line in chunk[:end].splitlines():
+        if not line.strip():
+            continue
+        try:
+            entry = serialization.loads(line)
+        except ValueError:
+            continue
+        op = entry.get("op")
+        if op == "append":
+            record = entry.get("record")
+            record_id = record.get("id") if isinstance(record, dict) else None
+            if record_id is not None:
+                # Replays are idempotent, so a journal that outlived its
+                # compaction can't duplicate records
+                if record_id in positions:
+                    continue
+                positions[record_id] = len(data)
+            data.append(record)
+        elif op == "update":
+            position = positions.get(entry.get("id"))
+            if position is not None:
+                data[position] = dict(data[position], **entry.get("fields", {}))
+    return offset + end
+
+@timed()
+def read_json(filename, strict=False):
+    """Read JSON file, return empty list if file doesn't exist.
+
+    Parsed contents are cached per process. The returned list is a fresh
+    shallow copy, but the records inside are shared - copy a record before
+    changing it and save the change with write_json.
+
+    With strict=True a corrupt file raises ValueError instead of reading as
+    an empty list, so callers about to rewrite the file don't wipe it.
+    """
+    key = os.path.abspath(filename)
+    journal_path = filename + JOURNAL_SUFFIX
+    signature = get_json_signature(filename)
+    if signature == (None, None):
+        with _json_cache_lock:
+            _json_cache.pop(key, None)
         return []
 
-def write_json(filename, data):
-    """Write data to JSON file"""
+    with _json_cache_lock:
+        cached = _json_cache.get(key)
+        if cached is not None and cached.signature == signature:
+            _json_cache_stats["hits"] += 1
+            if strict and cached.error:
+                raise ValueError(f"{filename} is corrupt: {cached.error}")
+            return list(cached.data)
+        _json_cache_stats["misses"] += 1
+
+    snapshot_signature, journal_signature = signature
+    cached_journal = cached.signature[1] if cached is not None else None
+    if (cached is not None and cached.signature[0] == snapshot_signature
+            and journal_signature is not None
+            and (cached_journal is None or (journal_signature[2] == cached_journal[2]
+                                            and journal_signature[1] >= cached.journal_offset))):
+        # Only the journal grew - replay the new tail on top of the cached data
+        data = list(cached.data)
+        positions = dict(cached.positions)
+        error = cached.error
+        offset = _apply_journal(data, positions, journal_path, cached.journal_offset)
+    else:
+        data, error = _read_snapshot(filename)
+        positions = _record_positions(data)
+        offset = _apply_journal(data, positions, journal_path, 0)
+
+    with _json_cache_lock:
+        _json_cache[key] = _CacheEntry(signature, data, positions, offset, error)
+    if strict and error:
+        raise ValueError(f"{filename} is corrupt: {error}")
+    return list(data)
+
+def _fsync_directory(directory):
+    # Make the rename itself durable; not supported on every platform
     try:
-        os.makedirs(os.path.dirname(filename), exist_ok=True)
-        with open(filename, "w", encoding='utf-8') as file:
-            json.dump(data, file, indent=4, ensure_ascii=False)
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+def _file_mode(filename):
+    """Permissions for a rewrite of filename: its current mode, else the umask default"""
+    try:
+        return os.stat(filename).st_mode & 0o7777
+    except OSError:
+        return 0o666 & ~_UMASK
+
+def _atomic_write(filename, write_content, binary=False):
+    """Write a file through a temp file + fsync + rename"""
+    directory = os.path.dirname(filename) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(prefix=".tmp-", dir=directory)
+    try:
+        # mkstemp creates 0600 files; keep the permissions a plain open() would give
+        if hasattr(os, "fchmod"):
+            os.fchmod(fd, _file_mode(filename))
+        with (os.fdopen(fd, "wb") if binary else os.fdopen(fd, "w", encoding='utf-8')) as file:
+            write_content(file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, filename)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    _fsync_directory(directory)
+
+
+class WriteConflictError(Exception):
+    """Raised when a file changed since the generation a writer read"""
+
+
+# Per-thread count of file locks held, so file_lock is reentrant
+_held_file_locks = threading.local()
+_thread_file_locks = {}
+_thread_file_locks_guard = threading.Lock()
+
+@contextmanager
+def file_lock(filename, timeout=30):
+    """Hold an exclusive cross-process lock on filename for a read-modify-write.
+
+    Uses an fcntl advisory lock on filename + ".lock" where available and an
+    O_EXCL lock file elsewhere. Reentrant within a thread.
+    """
+    key = os.path.abspath(filename)
+    held = getattr(_held_file_locks, "counts", None)
+    if held is None:
+        held = _held_file_locks.counts = {}
+    if held.get(key):
+        held[key] += 1
+        try:
+            yield
+        finally:
+            held[key] -= 1
+        return
+
+    # Threads of this process queue here first, then processes queue on the file
+    with _thread_file_locks_guard:
+        thread_lock = _thread_file_locks.setdefault(key, threading.Lock())
+    with thread_lock:
+        lock_path = filename + LOCK_SUFFIX
+        os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+        if fcntl is not None:
+            with open(lock_path, "a") as lock_file:
+                fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                held[key] = 1
+                try:
+                    yield
+                finally:
+                    held.pop(key, None)
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        else:
+            deadline = time.monotonic() + timeout
+            while True:
+                try:
+                    fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                    break
+                except FileExistsError:
+                    # Break locks left behind by a crashed process
+                    try:
+                        if time.time() - os.path.getmtime(lock_path) > timeout:
+                            os.remove(lock_path)
+                            continue
+                    except OSError:
+                        continue
+                    if time.monotonic() > deadline:
+                        raise TimeoutError(f"Timed out waiting for lock on {filename}")
+                    time.sleep(0.01)
+            held[key] = 1
+            try:
+                yield
+            finally:
+                held.pop(key, None)
+                os.close(fd)
+                os.remove(lock_path)
+
+def _read_meta(filename):
+    try:
+        with open(filename + META_SUFFIX, "r", encoding='utf-8') as file:
+            meta = json.load(file)
+            return meta if isinstance(meta, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+def _write_meta(filename, meta):
+    _atomic_write(filename + META_SUFFIX, lambda file: json.dump(meta, file))
+
+def get_json_generation(filename):
+    """Return the write generation of a JSON file (bumped on every write)"""
+    return int(_read_meta(filename).get("generation", 0))
+
+def _bump_generation(filename):
+    meta = _read_meta(filename)
+    meta["generation"] = int(meta.get("generation", 0)) + 1
+    _write_meta(filename, meta)
+    return meta["generation"]
+
+def _check_generation(filename, expected_generation):
+    if expected_generation is None:
+        return
+    current = get_json_generation(filename)
+    if current != expected_generation:
+        raise WriteConflictError(
+            f"{filename} changed (generation {current}, expected {expected_generation})"
+        )
+
+def read_json_versioned(filename):
+    """Read a JSON file together with its generation, for optimistic writes"""
+    while True:
+        generation = get_json_generation(filename)
+        data = read_json(filename)
+        # A writer bumps the generation after replacing the data, so an
+        # unchanged generation means data belongs to it
+        if get_json_generation(filename) == generation:
+            return data, generation
+
+@timed()
+def write_json(filename, data, atomic=True, expected_generation=None):
+    """Write data to JSON file.
+
+    By default the data is written to a temp file, fsynced and renamed over
+    the original, so a crash mid-write leaves the previous version intact.
+    A successful write also folds away any journal, since data is the full
+    new contents.
+
+    Pass the generation from read_json_versioned as expected_generation to
+    raise WriteConflictError instead of overwriting someone else's write.
+
+    The codec and on-disk format (pretty or compact JSON, plus an optional
+    msgpack snapshot) are configured in serialization.py.
+    """
+    try:
+        with file_lock(filename):
+            _check_generation(filename, expected_generation)
+            content = serialization.dumps_snapshot(data)
+            if not atomic:
+                os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+                with open(filename, "wb") as file:
+                    file.write(content)
+            else:
+                _atomic_write(filename, lambda file: file.write(content), binary=True)
+            if serialization.msgpack_enabled():
+                packed = serialization.pack_snapshot(data, get_file_signature(filename))
+                _atomic_write(filename + serialization.MSGPACK_SUFFIX, lambda file: file.write(packed), binary=True)
+            if os.path.exists(filename + JOURNAL_SUFFIX):
+                os.remove(filename + JOURNAL_SUFFIX)
+            _bump_generation(filename)
         return True
+    except WriteConflictError:
+        raise
     except Exception as e:
         print(f"Error writing to {filename}: {e}")
         return False
+    finally:
+        invalidate_json_cache(filename)
+
+def update_json(filename, mutate, retries=5):
+    """Optimistic read-modify-write of a JSON file.
+
+    mutate receives a fresh copy of the data and returns the new data. If
+    another writer got in first the cycle is retried up to retries times.
+    """
+    for _ in range(retries):
+        data, generation = read_json_versioned(filename)
+        try:
+            return write_json(filename, mutate(data), expected_generation=generation)
+        except WriteConflictError:
+            continue
+    raise WriteConflictError(f"Gave up updating {filename} after {retries} conflicts")
+
+def _append_journal_entries(filename, entries, expected_generation=None):
+    journal_path = filename + JOURNAL_SUFFIX
+    try:
+        with file_lock(filename):
+            _check_generation(filename, expected_generation)
+            os.makedirs(os.path.dirname(filename) or ".", exist_ok=True)
+            lines = b"".join(serialization.dumps_line(entry) for entry in entries)
+            with open(journal_path, "ab") as file:
+                file.write(lines)
+                file.flush()
+                os.fsync(file.fileno())
+            _bump_generation(filename)
+
+            # Compact once the journal gets big enough to slow down cold reads
+            journal_signature = get_file_signature(journal_path)
+            if journal_signature and journal_signature[1] >= JOURNAL_COMPACT_BYTES:
+                compact_json(filename)
+    except WriteConflictError:
+        raise
+    except Exception as e:
+        print(f"Error appending to {journal_path}: {e}")
+        return False
+    return True
+
+def append_json(filename, records, expected_generation=None):
+    """Append records to a JSON file's journal without rewriting the file"""
+    entries = [{"op": "append", "record": r} for r in records]
+    return _append_journal_entries(filename, entries, expected_generation)
+
+def update_json_record(filename, record_id, fields, expected_generation=None):
+    """Journal an update of the record with the given id"""
+    entries = [{"op": "update", "id": record_id, "fields": fields}]
+    return _append_journal_entries(filename, entries, expected_generation)
 
-def get_next_user_id(users):
-    """Get next available user ID - handles missing IDs gracefully"""
+def update_json_records(filename, updates, expected_generation=None):
+    """Journal updates of many records at once. updates maps record id -> fields"""
+    entries = [{"op": "update", "id": record_id, "fields": fields} for record_id, fields in updates.items()]
+    return _append_journal_entries(filename, entries, expected_generation)
+
+def compact_json(filename):
+    """Fold a JSON file's journal back into its snapshot"""
+    with file_lock(filename):
+        if not os.path.exists(filename + JOURNAL_SUFFIX):
+            return True
+        try:
+            data = read_json(filename, strict=True)
+        except ValueError as e:
+            print(f"Not compacting {filename}: {e}")
+            return False
+        return write_json(filename, data)
+
+class JsonStore:
+    """Base for stores backed by one JSON array file and an in-memory index.
+
+    The index is built by _build_index() once per file version and
+    subclasses update it in place on their own writes, then call
+    _after_write(). It is only rebuilt when another process changes the
+    file. With journal=True records are appended and updated through the
+    file's journal instead of rewriting it (see JSON_WRITE_MODE).
+    """
+
+    def __init__(self, path, journal=None):
+        self.path = path
+        self.journal = JSON_WRITE_MODE == "journal" if journal is None else journal
+        self._lock = threading.RLock()
+        self._index = None
+        self._index_signature = None
+
+    def _build_index(self, records):
+        raise NotImplementedError
+
+    def _load(self, strict=False):
+        return [r for r in read_json(self.path, strict=strict) if isinstance(r, dict)]
+
+    def _get_index(self):
+        with self._lock:
+            signature = get_json_signature(self.path)
+            if self._index is None or signature != self._index_signature:
+                self._index = self._build_index(self._load())
+                self._index_signature = signature
+            return self._index
+
+    def _after_write(self):
+        # Our own write changed the file; the index was already updated
+        # incrementally, so just remember the new file version
+        self._index_signature = get_json_signature(self.path)
+
+    def _save(self, record, fields=None):
+        """Persist a new record (fields=None) or an update to an existing one"""
+        if self.journal:
+            if fields is None:
+                return append_json(self.path, [record])
+            return update_json_record(self.path, record["id"], fields)
+        records = self._load(strict=True)
+        if fields is None:
+            records.append(record)
+        else:
+            records = [record if r.get("id") == record["id"] else r for r in records]
+        return write_json(self.path, records)
+
+    def generation(self):
+        """Return a counter that changes on every write to the store"""
+        return get_json_generation(self.path)
+
+def get_user_store():
+    """Return the configured user storage backend (see storage.py)"""
+    from storage import get_store
+    return get_store()
+
+def get_all_users():
+    """Return every registered user from the configured store"""
+    return get_user_store().all_users()
+
+def search_users(query, role=None, limit=20):
+    """Ranked, typo-tolerant search over names, skills, cities and company details"""
+    return get_user_store().search(query, role=role, limit=limit)
+
+def get_platform_stats():
+    """Return user counts by role, city and work type (see stats.py)"""
+    return get_user_store().get_stats()
+
+def count_users(role=None):
+    """Count registered users, optionally only those with the given role"""
+    return get_user_store().count_users(role)
+
+def get_next_user_id(users=None):
+    """Get next available user ID - handles missing IDs gracefully.
+
+    Pass users=None to ask the configured user store, which keeps a
+    persisted sequence, instead of scanning a list.
+    """
+    if users is None:
+        return get_user_store().next_id()
     if not users or not isinstance(users, list):
         return 1
     
@@ -50,128 +592,162 @@ def get_next_user_id(users):
     
     # Return next available ID
     return max(valid_ids) + 1 if valid_ids else 1
-    
+
+def repair_user_ids(users):
+    """Assign fresh IDs to users with missing, invalid or duplicate IDs.
+
+    Offline maintenance only (see `python manage.py repair-ids`). Repaired
+    records are replaced with copies, since read_json shares cached
+    records. Returns the number of repaired users.
+    """
     # Collect all valid IDs
-    valid_ids = []
+    valid_ids = set()
     users_needing_repair = []
     
     for i, user in enumerate(users):
         if not isinstance(user, dict):
             continue
             
-        if 'id' in user:
-            try:
-                user_id = int(user['id'])
-                if user_id > 0:
-                    valid_ids.append(user_id)
-                else:
-                    users_needing_repair.append(i)
-            except (ValueError, TypeError):
+        try:
+            user_id = int(user['id'])
+            if user_id > 0 and user_id not in valid_ids:
+                valid_ids.add(user_id)
+            else:
                 users_needing_repair.append(i)
-        else:
+        except (KeyError, ValueError, TypeError):
             users_needing_repair.append(i)
     
-    # Auto-repair users without valid IDs
+    # Repair users without valid IDs
     next_repair_id = max(valid_ids) + 1 if valid_ids else 1
     for user_index in users_needing_repair:
-        users[user_index]['id'] = next_repair_id
-        valid_ids.append(next_repair_id)
+        users[user_index] = dict(users[user_index], id=next_repair_id)
         next_repair_id += 1
-        print(f"Auto-assigned ID {users[user_index]['id']} to user: {users[user_index].get('name', 'Unknown')}")
+        print(f"Assigned ID {users[user_index]['id']} to user: {users[user_index].get('name', 'Unknown')}")
     
-    # Return next available ID
-    return max(valid_ids) + 1 if valid_ids else 1
+    return len(users_needing_repair)
 
-def validate_password(password):
-    """Validate password strength - returns None if valid, error message if invalid"""
-    if not password or not isinstance(password, str):
-        return "Password is required."
-    
-    if len(password) < 8:
-        return "Password must be at least 8 characters long."
-    if not re.search(r"[A-Z]", password):
-        return "Password must include at least one uppercase letter."
-    if not re.search(r"[a-z]", password):
-        return "Password must include at least one lowercase letter."
-    if not re.search(r"\d", password):
-        return "Password must include at least one digit."
-    if not re.search(r"[!@#$%^&*(),.?\":{}|<>]", password):
-        return "Password must include at least one special character."
-    return None  # Valid password
-
-def validate_phone(phone):
-    """Validate 10-digit phone number"""
-    if not phone:
-        return False
-    # Remove any spaces, dashes, or other non-digit characters except +
-    cleaned_phone = re.sub(r'[^\d+]', '', str(phone))
-    
-    # Handle international format (+91)
-    if cleaned_phone.startswith('+91'):
-        cleaned_phone = cleaned_phone[3:]
-    elif cleaned_phone.startswith('91') and len(cleaned_phone) == 12:
-        cleaned_phone = cleaned_phone[2:]
-    
-    return cleaned_phone.isdigit() and len(cleaned_phone) == 10
+def _seed_id_sequence(filename):
+    """Start a JSON file's ID sequence from its data if it has none. Returns its next ID"""
+    with file_lock(filename):
+        meta = _read_meta(filename)
+        if meta.get("next_id") is None:
+            meta["next_id"] = get_next_user_id(read_json(filename, strict=True))
+            _write_meta(filename, meta)
+        return int(meta["next_id"])
 
-def validate_aadhaar(aadhaar):
-    """Validate 12-digit Aadhaar number"""
-    if not aadhaar:
-        return False
-    # Remove any spaces or dashes
-    cleaned_aadhaar = re.sub(r'[^\d]', '', str(aadhaar))
-    return cleaned_aadhaar.isdigit() and len(cleaned_aadhaar) == 12
+def peek_next_id(filename, floor=1):
+    """Return the next ID a JSON file's sequence would hand out, without reserving it.
 
-def validate_email(email):
-    """Validate email format"""
-    if not email or not isinstance(email, str):
-        return False
-    
-    email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return bool(re.match(email_pattern, email.strip()))
+    The first peek at a file without a sequence seeds it, so only that one
+    scans the data.
+    """
+    next_id = _read_meta(filename).get("next_id")
+    if next_id is None:
+        try:
+            next_id = _seed_id_sequence(filename)
+        except ValueError:
+            # Don't persist a sequence computed from an unreadable file
+            next_id = get_next_user_id(read_json(filename))
+    return max(int(next_id), floor)
+
+def reserve_ids(filename, count=1, floor=1):
+    """Reserve count consecutive IDs from a JSON file's persisted sequence.
+
+    The sequence lives in the file's .meta sidecar next to the write
+    generation and is seeded from the data once. Never returns IDs below
+    floor. Returns a range of the reserved IDs.
+    """
+    with file_lock(filename):
+        meta = _read_meta(filename)
+        start = meta.get("next_id")
+        if start is None:
+            start = get_next_user_id(read_json(filename, strict=True))
+        start = max(int(start), floor)
+        meta["next_id"] = start + count
+        _write_meta(filename, meta)
+    return range(start, start + count)
+
+def reset_id_sequence(filename, next_id):
+    """Point a JSON file's ID sequence at next_id"""
+    with file_lock(filename):
+        meta = _read_meta(filename)
+        meta["next_id"] = int(next_id)
+        _write_meta(filename, meta)
 
+@timed()
 def authenticate_user(name, password, role):
-    """Authenticate user by name, password and role"""
+    """Authenticate user by name, password and role.
+
+    Falls back to names that differ only in case or spacing ("Amit  Jaat"
+    for "amit jaat").
+    """
     if not all([name, password, role]):
         return None
         
-    users = read_json("data/users.json")
-    for user in users:
-        if (isinstance(user, dict) and 
-            user.get("name") == name and 
-            user.get("password") == password and 
-            user.get("role") == role):
-            return user
+    store = get_user_store()
+    candidates = store.find_by_name(name, role) or store.find_by_normalized_name(name, role)
+    for user in candidates:
+        if verify_password_pooled(password, user.get("password")):
+            return _rehash_if_needed(user, password)
+    return None
+
+@timed()
+def authenticate_user_by_phone(phone, password, role):
+    """Authenticate user by phone number, password and role"""
+    if not all([phone, password, role]):
+        return None
+
+    user = get_user_store().find_by_phone(phone)
+    if user and user.get("role") == role and verify_password_pooled(password, user.get("password")):
+        return _rehash_if_needed(user, password)
     return None
 
+def _rehash_if_needed(user, password):
+    """Upgrade a plaintext or outdated password hash after a successful login"""
+    if not needs_rehash(user.get("password")):
+        return user
+    updated = get_user_store().update_user(user.get("id"), {"password": hash_password(password)})
+    if updated:
+        # Tell the matching engine, so the rehash doesn't cost a full matrix rebuild
+        from matching import get_matching_engine
+        get_matching_engine().apply_write(updated)
+    return updated or user
+
 def find_user_by_email(users, email):
-    """Find user by email address"""
-    if not users or not email:
+    """Find user by email address.
+
+    Pass users=None to look the email up through the configured user store.
+    """
+    if not email:
+        return None
+    if users is None:
+        return get_user_store().find_by_email(email)
+    if not users:
         return None
     
-    email = email.lower().strip()
+    email = normalize_email(email)
     for user in users:
-        if isinstance(user, dict) and user.get("email", "").lower().strip() == email:
+        if isinstance(user, dict) and normalize_email(user.get("email", "")) == email:
             return user
     return None
 
 def find_user_by_phone(users, phone):
-    """Find user by phone number"""
-    if not users or not phone:
+    """Find user by phone number.
+
+    Pass users=None to look the phone up through the configured user store.
+    """
+    if not phone:
+        return None
+    if users is None:
+        return get_user_store().find_by_phone(phone)
+    if not users:
         return None
     
     # Normalize phone number for comparison
-    normalized_phone = re.sub(r'[^\d]', '', str(phone))
-    if normalized_phone.startswith('91') and len(normalized_phone) == 12:
-        normalized_phone = normalized_phone[2:]
-    
+    normalized_phone = normalize_phone(phone)
     for user in users:
-        if isinstance(user, dict):
-            user_phone = re.sub(r'[^\d]', '', str(user.get("phone", "")))
-            if user_phone.startswith('91') and len(user_phone) == 12:
-                user_phone = user_phone[2:]
-            if user_phone == normalized_phone:
-                return user
+        if isinstance(user, dict) and normalize_phone(user.get("phone", "")) == normalized_phone:
+            return user
     return None
 
 def sanitize_user_input(data):
@@ -196,12 +772,11 @@ def sanitize_user_input(data):
     return sanitized
 
 def create_user_record(user_data, user_id=None):
-    """Create a complete user record with all required fields"""
-    # Load existing users to get next ID if not provided
-    if user_id is None:
-        users = read_json("data/users.json")
-        user_id = get_next_user_id(users)
-    
+    """Create a complete user record with all required fields.
+
+    Without a user_id the record gets its ID from the user store when it is
+    saved, under the store's write lock.
+    """
     # Sanitize input data
     clean_data = sanitize_user_input(user_data)
     
@@ -211,7 +786,7 @@ def create_user_record(user_data, user_id=None):
         "name": clean_data.get("name", ""),
         "email": clean_data.get("email", "").lower(),
         "phone": clean_data.get("phone", ""),
-        "password": clean_data.get("password", ""),
+        "password": hash_password(clean_data.get("password", "")),
         "role": clean_data.get("role", ""),
         "created_at": datetime.now().isoformat(),
         "updated_at": datetime.now().isoformat(),
@@ -235,13 +810,16 @@ def create_user_record(user_data, user_id=None):
     elif clean_data.get("role") == "hire":
         user_record.update({
             "company_name": clean_data.get("company_name", ""),
+            "company_type": clean_data.get("company_type", ""),
             "city": clean_data.get("city", ""),
-            "address": clean_data.get("address", ""),
+            "company_address": clean_data.get("company_address") or clean_data.get("address", ""),
             "job_postings": [],
             "profile_completed": True
         })
     
-    return user_record
+    # Same schema as registration: canonical vocabulary, list availability,
+    # numeric age/salary
+    return normalize_user(user_record)
 
 def save_user(user_data):
     """Save user to database with proper validation"""
@@ -265,25 +843,23 @@ def save_user(user_data):
         if password_error:
             return False, password_error
         
-        # Load existing users
-        users = read_json("data/users.json")
-        
         # Check for duplicate email
-        if find_user_by_email(users, user_data["email"]):
+        if find_user_by_email(None, user_data["email"]):
             return False, "Email already registered"
         
         # Check for duplicate phone
-        if find_user_by_phone(users, user_data["phone"]):
+        if find_user_by_phone(None, user_data["phone"]):
             return False, "Phone number already registered"
         
         # Create user record
         user_record = create_user_record(user_data)
         
-        # Add to users list
-        users.append(user_record)
-        
-        # Save to file
-        success = write_json("data/users.json", users)
+        # Save through the user store; it re-checks duplicates under its
+        # write lock in case another session registered them meanwhile
+        try:
+            success = get_user_store().add_user(user_record)
+        except ValueError as e:
+            return False, str(e)
         
         if success:
             return True, user_record
@@ -293,35 +869,43 @@ def save_user(user_data):
     except Exception as e:
         return False, f"Error saving user: {str(e)}"
 
-def update_user_data(filepath="data/users.json"):
+def add_user(user_data):
+    """Store an already validated user record, assigning the next ID if missing.
+
+    Returns (True, record) on success, or (False, error message) if the
+    phone/email is already registered or the record could not be saved.
+    """
+    try:
+        record = get_user_store().add_user(normalize_user(user_data))
+    except ValueError as e:
+        return False, str(e)
+    if not record:
+        return False, "Failed to save user data"
+    return True, record
+
+def update_user_data(filepath=USERS_FILE):
     """Update existing user data to ensure all users have proper IDs"""
-    users = read_json(filepath)
-    if not users:
+    with file_lock(filepath):
+        users = read_json(filepath, strict=True)
+        if not users:
+            return True
+        
+        # Fix any users with missing, invalid or duplicate IDs
+        if repair_user_ids(users) == 0:
+            return True
+        
+        # Save the updated data and move the sequence past the new IDs
+        if not write_json(filepath, users):
+            return False
+        reset_id_sequence(filepath, get_next_user_id(users))
         return True
-    
-    # This will automatically fix any users missing IDs
-    get_next_user_id(users)
-    
-    # Save the updated data
-    return write_json(filepath, users)
 
 # Constants
 ROLES = ["job", "hire"]  # Using lowercase for consistency
 ROLE_LABELS = {"job": "Job Seeker", "hire": "Employer"}
-WORK_TYPES = [
-    "Maid", "Cook", "Driver", "Cleaner", "Babysitter", "Gardener", 
-    "Security Guard", "Caretaker", "Housekeeper", "Nanny", "Butler",
-    "Personal Assistant", "Laundry Service", "Pet Care"
-]
-CITIES = [
-    "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata",
-    "Pune", "Ahmedabad", "Jaipur", "Surat", "Lucknow", "Kanpur",
-    "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Pimpri-Chinchwad"
-]
-EXPERIENCE_LEVELS = ["Entry Level (0-1 years)", "Mid Level (2-5 years)", "Senior Level (5+ years)"]
-AVAILABILITY_OPTIONS = ["Full Time", "Part Time", "Weekends Only", "Flexible Hours"]
+# Option lists come from the canonical vocabularies in vocab.py
+WORK_TYPES = WORK_TYPE.builtin
+CITIES = CITY.builtin
+EXPERIENCE_LEVELS = EXPERIENCE.builtin
+AVAILABILITY_OPTIONS = AVAILABILITY.builtin
 LANGUAGES = ["Hindi", "English", "Tamil", "Telugu", "Bengali", "Marathi", "Gujarati", "Kannada", "Malayalam", "Punjabi"]
-
-PASSWORD_MIN_LENGTH = 8
-PHONE_LENGTH = 10
-AADHAAR_LENGTH = 12
\ No newline at end of file
@@ -0,0 +1,166 @@
+# validation.py
+"""Field validators shared by registration, save_user and bulk imports.
+
+Patterns are compiled once at import time and the password rules are
+checked in a single pass, so validating a record costs a handful of
+C-level operations. utils re-exports the validators for existing callers.
+"""
+import re
+
+from instrumentation import timed
+
+PASSWORD_MIN_LENGTH = 8
+PHONE_LENGTH = 10
+AADHAAR_LENGTH = 12
+
+_NON_DIGITS = re.compile(r'[^\d]')
+_NON_PHONE_CHARS = re.compile(r'[^\d+]')
+_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
+_UPPERCASE = frozenset("ABCDEFGHIJKLMNOPQRSTUVWXYZ")
+_LOWERCASE = frozenset("abcdefghijklmnopqrstuvwxyz")
+PASSWORD_SPECIAL_CHARACTERS = frozenset('!@#$%^&*(),.?":{}|<>')
+
+# Password rules in the order they are reported:
+# (rule, validate_password error, strength meter hint)
+PASSWORD_RULES = [
+    ("length", f"Password must be at least {PASSWORD_MIN_LENGTH} characters long.",
+     f"At least {PASSWORD_MIN_LENGTH} characters"),
+    ("upper", "Password must include at least one uppercase letter.", "One uppercase letter"),
+    ("lower", "Password must include at least one lowercase letter.", "One lowercase letter"),
+    ("digit", "Password must include at least one digit.", "One number"),
+    ("special", "Password must include at least one special character.", "One special character"),
+]
+_PASSWORD_ERRORS = {rule: error for rule, error, _ in PASSWORD_RULES}
+_PASSWORD_HINTS = {rule: hint for rule, _, hint in PASSWORD_RULES}
+
+
+def classify_password(password):
+    """Return the password rules the password misses, in PASSWORD_RULES order.
+
+    The characters are scanned once into a set and each rule is a set
+    intersection, instead of one regex search per rule.
+    """
+    chars = frozenset(password)
+    missing = []
+    if len(password) < PASSWORD_MIN_LENGTH:
+        missing.append("length")
+    if chars.isdisjoint(_UPPERCASE):
+        missing.append("upper")
+    if chars.isdisjoint(_LOWERCASE):
+        missing.append("lower")
+    # isdecimal() is exactly the \d class: superscripts like "²" aren't digits
+    if not any(c.isdecimal() for c in chars):
+        missing.append("digit")
+    if chars.isdisjoint(PASSWORD_SPECIAL_CHARACTERS):
+        missing.append("special")
+    return missing
+
+
+def password_strength(password):
+    """Return (score out of 5, hints for the missing rules) for the strength meter"""
+    missing = classify_password(password or "")
+    return len(PASSWORD_RULES) - len(missing), [_PASSWORD_HINTS[rule] for rule in missing]
+
+
+@timed()
+def validate_password(password):
+    """Validate password strength - returns None if valid, error message if invalid"""
+    if not password or not isinstance(password, str):
+        return "Password is required."
+    missing = classify_password(password)
+    if missing:
+        return _PASSWORD_ERRORS[missing[0]]
+    return None  # Valid password
+
+
+@timed()
+def validate_phone(phone):
+    """Validate 10-digit phone number"""
+    if not phone:
+        return False
+    # Remove any spaces, dashes, or other non-digit characters except +
+    cleaned_phone = _NON_PHONE_CHARS.sub('', str(phone))
+
+    # Handle international format (+91)
+    if cleaned_phone.startswith('+91'):
+        cleaned_phone = cleaned_phone[3:]
+    elif cleaned_phone.startswith('91') and len(cleaned_phone) == 12:
+        cleaned_phone = cleaned_phone[2:]
+
+    return cleaned_phone.isdigit() and len(cleaned_phone) == PHONE_LENGTH
+
+
+@timed()
+def validate_aadhaar(aadhaar):
+    """Validate 12-digit Aadhaar number"""
+    if not aadhaar:
+        return False
+    # Remove any spaces or dashes
+    cleaned_aadhaar = _NON_DIGITS.sub('', str(aadhaar))
+    return cleaned_aadhaar.isdigit() and len(cleaned_aadhaar) == AADHAAR_LENGTH
+
+
+@timed()
+def validate_email(email):
+    """Validate email format"""
+    if not email or not isinstance(email, str):
+        return False
+    return _EMAIL_PATTERN.match(email.strip()) is not None
+
+
+def normalize_email(email):
+    """Normalize an email address for comparison"""
+    if not email or not isinstance(email, str):
+        return ""
+    return email.lower().strip()
+
+
+def normalize_name(name):
+    """Normalize a name for comparison, ignoring case and spacing"""
+    if not name:
+        return ""
+    return " ".join(str(name).split()).casefold()
+
+
+def normalize_phone(phone):
+    """Normalize a phone number to its 10 local digits for comparison"""
+    if not phone:
+        return ""
+    normalized = _NON_DIGITS.sub('', str(phone))
+    if normalized.startswith('91') and len(normalized) == 12:
+        normalized = normalized[2:]
+    return normalized
+
+
+@timed()
+def validate_record(record, roles=("job", "hire"), require_email=False, check_password=True):
+    """Validate one registration-shaped user dict.
+
+    Returns a dict of field -> error message; an empty dict means valid.
+    Set check_password=False for records whose password is already hashed.
+    """
+    errors = {}
+    if not record.get("name"):
+        errors["name"] = "Name is required."
+    role = record.get("role")
+    if role not in roles:
+        errors["role"] = f"Role must be one of {', '.join(roles)}."
+    if not validate_phone(record.get("phone")):
+        errors["phone"] = "Invalid phone number. Must be exactly 10 digits."
+    email = record.get("email")
+    if email or require_email:
+        if not validate_email(email):
+            errors["email"] = "Invalid email format."
+    if role == "job" and not validate_aadhaar(record.get("aadhaar")):
+        errors["aadhaar"] = "Invalid Aadhaar number. Must be exactly 12 digits."
+    if check_password:
+        password_error = validate_password(record.get("password"))
+        if password_error:
+            errors["password"] = password_error
+    return errors
+
+
+def validate_many(records, **options):
+    """Validate a batch of records. Returns one errors dict per record, in order"""
+    return [validate_record(record, **options) for record in records]
@@ -0,0 +1,45 @@
+import os
+import streamlit as st
+import instrumentation
+from views.components import fragment
+
+# Phone numbers of the users allowed to see the performance stats page
+ADMIN_PHONES = {phone.strip() for phone in os.environ.get("KAAMBAZAAR_ADMIN_PHONES", "").split(",") if phone.strip()}
+
+def is_admin(user):
+    return bool(user) and str(user.get("phone", "")).strip() in ADMIN_PHONES
+
+def _render_stats():
+    stats = instrumentation.snapshot()
+    if not stats:
+        st.info("No calls recorded yet.")
+        return
+    st.table([
+        {"name": name, "calls": summary["count"], "total s": f"{summary['total_s']:.3f}",
+         "mean ms": f"{summary['mean_ms']:.2f}", "p50 ms": f"{summary['p50_ms']:.2f}",
+         "p95 ms": f"{summary['p95_ms']:.2f}", "p99 ms": f"{summary['p99_ms']:.2f}"}
+        for name, summary in stats.items()
+    ])
+
+# Rerun just the stats table on a timer where fragments exist
+_live_stats = fragment(run_every=5)(_render_stats) if fragment is not None else _render_stats
+
+def render_admin_stats(user):
+    st.title("📈 Performance Stats")
+    if not is_admin(user):
+        st.error("❌ This page is only available to administrators.")
+        return
+    if not instrumentation.ENABLED:
+        st.warning("Instrumentation is off. Start the app with KAAMBAZAAR_INSTRUMENT=1 to record timings.")
+        return
+    st.caption(f"Percentiles over the last {instrumentation.SAMPLE_SIZE} calls of each name")
+    _live_stats()
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.download_button("⬇️ Prometheus metrics", instrumentation.prometheus_text(),
+                           file_name="kaambazaar.prom", mime="text/plain", use_container_width=True)
+    with col2:
+        if st.button("🔄 Reset stats", key="admin_reset_stats", use_container_width=True):
+            instrumentation.reset()
+            st.rerun()
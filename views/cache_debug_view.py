@@ -0,0 +1,29 @@
+import streamlit as st
+import caching
+from views.admin_view import is_admin
+
+def cache_debug_enabled():
+    """Shown with KAAMBAZAAR_CACHE_DEBUG=1, or to an admin with ?debug=cache in the URL"""
+    if caching.CACHE_DEBUG:
+        return True
+    query_params = getattr(st, "query_params", None)
+    return (query_params is not None and query_params.get("debug") == "cache"
+            and is_admin(st.session_state.get("current_user")))
+
+def render_cache_debug():
+    with st.sidebar.expander("🧰 Cache debug", expanded=True):
+        st.caption(f"TTL {caching.CACHE_TTL or 'none'}s • max {caching.CACHE_MAX_ENTRIES} entries per function")
+        st.write(f"Generations: users {caching.users_generation()} • "
+                 f"applications {caching.applications_generation()}")
+        page_stats = caching.get_page_stats()
+        if page_stats:
+            st.table([
+                {"page": page, "hits": counts["hits"], "misses": counts["misses"],
+                 "hit rate": f"{counts['hit_rate']:.0%}"}
+                for page, counts in sorted(page_stats.items())
+            ])
+        else:
+            st.write("No cached lookups yet.")
+        if st.button("🗑️ Clear caches", key="cache_debug_clear"):
+            caching.clear()
+            st.rerun()
@@ -0,0 +1,22 @@
+import streamlit as st
+
+# st.fragment reruns just part of the page, e.g. on a timer with run_every
+# (Streamlit 1.37+). None on older versions, which need a full rerun
+fragment = getattr(st, "fragment", None)
+
+def render_pagination(state_key, page, total, page_size=10):
+    """Previous/next buttons that keep the current page in st.session_state[state_key]"""
+    pages = max(1, (total + page_size - 1) // page_size)
+    if pages == 1:
+        return
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if page > 1 and st.button("← Previous", key=f"{state_key}_prev"):
+            st.session_state[state_key] = page - 1
+            st.rerun()
+    with col2:
+        st.write(f"Page {page} of {pages}")
+    with col3:
+        if page < pages and st.button("Next →", key=f"{state_key}_next"):
+            st.session_state[state_key] = page + 1
+            st.rerun()
@@ -1,8 +1,133 @@
 import streamlit as st
+from applications import STATUS_LABELS, STATUS_TRANSITIONS, get_application_store
+from caching import get_user
+from jobs import get_job_store
+from matching import get_matching_engine
+from utils import AVAILABILITY_OPTIONS, CITIES, WORK_TYPES, search_users
+from views.components import render_pagination
+from views.messages_view import open_conversation
+
+def render_matches(user, job, k=10):
+    """Show the best-matching job seekers for an open posting"""
+    matches = get_matching_engine().match(job, k=k)
+    if not matches:
+        st.info("No job seekers with this skill yet.")
+        return
+    for seeker, score in matches:
+        skills = seeker.get("work_type") or []
+        if isinstance(skills, list):
+            skills = ", ".join(skills)
+        salary = seeker.get("expected_salary")
+        salary_text = f" • expects ₹{salary:,}/month" if isinstance(salary, int) else ""
+        st.markdown(f"**{seeker.get('name', '')}** — {skills} • {seeker.get('city', '')} • "
+                    f"{seeker.get('experience', '')}{salary_text} • score {score:.1f}")
+        if st.button("💬 Message", key=f"message_seeker_{job['id']}_{seeker['id']}"):
+            open_conversation(user, seeker["id"])
+            st.rerun()
+
+def render_applicants(user, job):
+    """List a posting's applicants with buttons to move them along"""
+    application_store = get_application_store()
+    for application in application_store.for_job(job["id"]):
+        seeker = get_user(application["seeker_id"]) or {}
+        status = application["status"]
+        st.markdown(f"**{seeker.get('name', 'Unknown')}** • 📞 {seeker.get('phone', '')} • "
+                    f"{STATUS_LABELS.get(status, status)}")
+        actions = [s for s in ("shortlisted", "hired", "rejected") if s in STATUS_TRANSITIONS.get(status, ())]
+        columns = st.columns(len(actions) + 1)
+        for column, action in zip(columns, actions):
+            with column:
+                if st.button(STATUS_LABELS[action], key=f"application_{application['id']}_{action}"):
+                    changed, result = application_store.set_status(application["id"], action)
+                    if changed:
+                        st.rerun()
+                    st.error(f"❌ {result}")
+        with columns[-1]:
+            if st.button("💬 Message", key=f"message_applicant_{application['id']}"):
+                open_conversation(user, application["seeker_id"])
+                st.rerun()
 
 def render_hire_view(user):
     st.title(f"Welcome, {user['name']} (Employer) 👷‍♂️")
     st.write("📌 This is the Hire Dashboard.")
     
-    # Placeholder for future features
-    st.success("You can post jobs, view job seekers, and send messages.")
+    job_store = get_job_store()
+    
+    # Post a new job
+    with st.expander("➕ Post a new job", expanded=False):
+        with st.form(key="post_job_form", clear_on_submit=True):
+            title = st.text_input("📝 Job Title *", placeholder="e.g. Full-time cook for family of four")
+            col1, col2 = st.columns(2)
+            with col1:
+                work_type = st.selectbox("🛠️ Work Type *", WORK_TYPES)
+            with col2:
+                city = st.selectbox("🏙️ City *", CITIES)
+            salary = st.number_input("💰 Monthly Salary (₹) *", min_value=1000, max_value=200000,
+                                     value=15000, step=500)
+            availability = st.multiselect("⏰ Availability", AVAILABILITY_OPTIONS)
+            description = st.text_area("📋 Description", placeholder="Duties, timings, location details...")
+            
+            if st.form_submit_button("🚀 Post Job", type="primary"):
+                if not title.strip():
+                    st.error("❌ Please enter a job title.")
+                else:
+                    job = job_store.create_job(user["id"], {
+                        "title": title,
+                        "work_type": work_type,
+                        "city": city,
+                        "salary": salary,
+                        "availability": availability,
+                        "description": description,
+                    })
+                    if job:
+                        st.success(f"🎉 Job '{job['title']}' posted!")
+                    else:
+                        st.error("❌ Could not post the job. Please try again.")
+    
+    # Free-text search over seekers' names, skills and cities (typos are fine)
+    query = st.text_input("🔍 Search job seekers", placeholder="e.g. cook indore, ravi kumar",
+                          key="seeker_search")
+    if query.strip():
+        results = search_users(query, role="job", limit=10)
+        if not results:
+            st.info("No job seekers found.")
+        for seeker in results:
+            skills = seeker.get("work_type") or []
+            if isinstance(skills, list):
+                skills = ", ".join(skills)
+            col1, col2 = st.columns([4, 1])
+            with col1:
+                st.markdown(f"**{seeker.get('name', '')}** — {skills} • {seeker.get('city', '')} • "
+                            f"{seeker.get('experience', '')}")
+            with col2:
+                if st.button("💬 Message", key=f"message_search_{seeker['id']}"):
+                    open_conversation(user, seeker["id"])
+                    st.rerun()
+    
+    # Existing postings, newest first
+    st.subheader("📋 Your Job Postings")
+    page = st.session_state.get("hire_jobs_page", 1)
+    jobs, total = job_store.search(employer_id=user["id"], include_closed=True, page=page)
+    
+    if total == 0:
+        st.info("You haven't posted any jobs yet.")
+        return
+    
+    for job in jobs:
+        with st.container():
+            status = "🟢 Open" if job.get("status") == "open" else "⚪ Closed"
+            st.markdown(f"**{job['title']}** — {job['work_type']} in {job['city']} • ₹{job['salary']:,}/month • {status}")
+            if job.get("description"):
+                st.caption(job["description"])
+            applicants = get_application_store().count_for_job(job["id"])
+            if applicants:
+                with st.expander(f"📨 Applicants ({applicants})"):
+                    render_applicants(user, job)
+            if job.get("status") == "open":
+                if st.button("Close posting", key=f"close_job_{job['id']}"):
+                    job_store.close_job(job["id"])
+                    st.rerun()
+                with st.expander("🔎 Find matching candidates"):
+                    render_matches(user, job)
+    
+    render_pagination("hire_jobs_page", page, total)
@@ -1,8 +1,93 @@
 import streamlit as st
+from applications import STATUS_LABELS, get_application_store
+from feed import get_feed_engine
+from jobs import get_job_store
+from utils import CITIES, WORK_TYPES
+from views.components import render_pagination
+from views.messages_view import open_conversation
+
+def render_job(user, job, section):
+    with st.container():
+        st.markdown(f"**{job['title']}** — {job['work_type']} in {job['city']} • ₹{job['salary']:,}/month")
+        if job.get("availability"):
+            st.caption("⏰ " + ", ".join(job["availability"]))
+        if job.get("description"):
+            st.caption(job["description"])
+        col1, col2 = st.columns(2)
+        with col1:
+            application = get_application_store().find(job["id"], user["id"])
+            if application:
+                st.write(STATUS_LABELS.get(application["status"], application["status"]))
+            elif st.button("📨 Apply", key=f"apply_{section}_{job['id']}", type="primary"):
+                applied, result = get_application_store().apply(job, user["id"])
+                if applied:
+                    st.rerun()
+                st.error(f"❌ {result}")
+        with col2:
+            if st.button("💬 Message employer", key=f"message_employer_{section}_{job['id']}"):
+                open_conversation(user, job["employer_id"])
+                st.rerun()
+
+def render_applications(user):
+    """The seeker's applications and where each one stands"""
+    applications = get_application_store().for_seeker(user["id"])
+    st.subheader(f"📨 My Applications ({len(applications)})")
+    if not applications:
+        st.info("You haven't applied to any jobs yet.")
+        return
+    job_store = get_job_store()
+    for application in applications:
+        job = job_store.get_job(application["job_id"])
+        title = f"{job['title']} — {job['city']}" if job else "Job no longer available"
+        st.write(f"**{title}** • {STATUS_LABELS.get(application['status'], application['status'])}")
 
 def render_job_view(user):
     st.title(f"Welcome, {user['name']} (Job Seeker) 👨‍🔧")
     st.write("📌 This is the Job Seeker Dashboard.")
     
-    # Placeholder for future features
-    st.success("You can browse job posts, express interest, and message employers.")
+    # Personalized feed: postings for the seeker's city and skills
+    st.subheader("⭐ Recommended for You")
+    feed_page = st.session_state.get("job_feed_page", 1)
+    feed_jobs, feed_total = get_feed_engine().get_feed(user, page=feed_page)
+    if feed_total == 0:
+        st.info("No open jobs match your city or skills yet.")
+    for job in feed_jobs:
+        render_job(user, job, "feed")
+    render_pagination("job_feed_page", feed_page, feed_total, page_size=5)
+    
+    # Search filters
+    st.subheader("🔍 Find Jobs")
+    col1, col2 = st.columns(2)
+    with col1:
+        default_city = user.get("city", "").strip().title()
+        cities = ["Any"] + CITIES
+        city = st.selectbox("🏙️ City", cities,
+                            index=cities.index(default_city) if default_city in cities else 0,
+                            key="job_search_city")
+    with col2:
+        work_type = st.selectbox("🛠️ Work Type", ["Any"] + WORK_TYPES, key="job_search_work_type")
+    min_salary, max_salary = st.slider("💰 Monthly Salary (₹)", min_value=0, max_value=100000,
+                                       value=(0, 100000), step=1000, key="job_search_salary")
+    
+    # Reset to the first page whenever the filters change
+    filters = (city, work_type, min_salary, max_salary)
+    if st.session_state.get("job_search_filters") != filters:
+        st.session_state.job_search_filters = filters
+        st.session_state.job_search_page = 1
+    page = st.session_state.get("job_search_page", 1)
+    
+    jobs, total = get_job_store().search(
+        city=None if city == "Any" else city,
+        work_type=None if work_type == "Any" else work_type,
+        min_salary=min_salary or None,
+        max_salary=max_salary if max_salary < 100000 else None,
+        page=page,
+    )
+    
+    st.write(f"**{total}** open job{'s' if total != 1 else ''} found")
+    for job in jobs:
+        render_job(user, job, "search")
+    
+    render_pagination("job_search_page", page, total)
+    
+    render_applications(user)
@@ -0,0 +1,47 @@
+import streamlit as st
+from caching import get_user
+from messages import get_message_store
+
+def open_conversation(user, other_id):
+    """Start (or reopen) a conversation with another user and show it"""
+    conversation = get_message_store().get_or_create_conversation(user["id"], other_id)
+    if conversation:
+        # The selectbox's key is its state; an index= would be ignored once it has one
+        st.session_state.conversation_select = conversation["id"]
+
+def _other_name(user, conversation):
+    for user_id in conversation.get("participants", []):
+        if user_id != user["id"]:
+            other = get_user(user_id)
+            return other.get("name", "Unknown") if other else "Unknown"
+    return "Unknown"
+
+def render_messages(user):
+    message_store = get_message_store()
+    unread = message_store.unread_count(user["id"])
+    st.subheader(f"💬 Messages{f' ({unread} unread)' if unread else ''}")
+
+    conversations = message_store.conversations_for(user["id"])
+    if not conversations:
+        st.info("No conversations yet.")
+        return
+
+    labels = {}
+    for conversation in conversations:
+        count = message_store.unread_count(user["id"], conversation["id"])
+        labels[conversation["id"]] = _other_name(user, conversation) + (f" 🔴 {count}" if count else "")
+    conversation_id = st.selectbox("Conversation", list(labels), format_func=labels.get,
+                                   key="conversation_select")
+
+    for message in message_store.last_messages(conversation_id, n=50):
+        mine = message.get("sender_id") == user["id"]
+        with st.chat_message("user" if mine else "assistant"):
+            st.write(message.get("text", ""))
+            st.caption(message.get("sent_at", "")[:16].replace("T", " "))
+    message_store.mark_read(conversation_id, user["id"])
+
+    with st.form(key="send_message_form", clear_on_submit=True):
+        text = st.text_input("Message", placeholder="Type a message...", label_visibility="collapsed")
+        if st.form_submit_button("Send ➤") and text.strip():
+            message_store.send_message(conversation_id, user["id"], text)
+            st.rerun()
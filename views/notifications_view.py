@@ -0,0 +1,39 @@
+import streamlit as st
+from notifications import POLL_SECONDS, get_broker
+from views.components import fragment
+
+ICONS = {"message": "💬", "application": "📨"}
+
+def _check_notifications(user):
+    """Rerun the page only when the user's notification sequence moved"""
+    broker = get_broker()
+    sequence = broker.sequence(user["id"])
+    key = f"notify_sequence_{user['id']}"
+    seen = st.session_state.get(key)
+    if seen is None or sequence < seen:
+        st.session_state[key] = sequence
+        return
+    if sequence == seen:
+        return
+    events, st.session_state[key] = broker.events_since(user["id"], seen)
+    if events:
+        # Toasts are shown after the full rerun that refreshes the page
+        st.session_state.pending_toasts = [(e.get("text", ""), ICONS.get(e.get("kind"))) for e in events]
+        st.rerun()
+
+# A fragment reruns just the poller on a timer; without one the check only
+# runs on a normal rerun or the refresh button
+if fragment is not None:
+    _poll = fragment(run_every=POLL_SECONDS)(_check_notifications)
+else:
+    _poll = None
+
+def render_notifications(user):
+    for text, icon in st.session_state.pop("pending_toasts", []):
+        st.toast(text, icon=icon)
+    if _poll is not None:
+        _poll(user)
+    else:
+        _check_notifications(user)
+        if st.button("🔄 Check for updates", key="notify_refresh"):
+            st.rerun()
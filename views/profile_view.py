@@ -0,0 +1,37 @@
+import os
+import streamlit as st
+import profiling
+from views.admin_view import is_admin
+
+# Show the last profile to every session, for local development
+SHOW_PANEL = os.environ.get("KAAMBAZAAR_PROFILE_PANEL", "0").lower() in ("1", "true", "yes")
+
+def _profile_requested(user):
+    """?profile=1 profiles every rerun of an admin's session"""
+    query_params = getattr(st, "query_params", None)
+    return query_params is not None and query_params.get("profile") == "1" and is_admin(user)
+
+def _store_report(report):
+    st.session_state.last_profile = report
+
+def run_profiled(run):
+    """Run one page rerun, under the profilers if it is sampled or requested"""
+    user = st.session_state.get("current_user")
+    if profiling.should_profile(_profile_requested(user)):
+        with profiling.profile(st.session_state.get("page", "landing"), on_report=_store_report):
+            run()
+    else:
+        run()
+    if SHOW_PANEL or is_admin(user):
+        render_profile_panel()
+
+def render_profile_panel():
+    report = st.session_state.get("last_profile")
+    if report is None:
+        return
+    with st.expander(f"🔬 Profile: {report.label} rerun at {report.created_at} ({report.duration * 1000:.0f} ms)"):
+        st.caption(f"Saved to {report.prof_path} and {report.snapshot_path}")
+        st.markdown(f"**Top {profiling.TOP_N} functions by cumulative time**")
+        st.code(report.top_functions, language=None)
+        st.markdown(f"**Top {profiling.TOP_N} allocation sites** ({report.allocated / 1024:.0f} KiB still allocated)")
+        st.code("\n".join(report.top_allocations) or "No allocations traced", language=None)
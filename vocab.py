@@ -0,0 +1,159 @@
+# vocab.py
+"""Canonical vocabularies for cities, work types, experience and availability.
+
+Free text is folded (case, spacing, hyphens, dots) and looked up among the
+canonical labels and their aliases, so "bombay", " Mumbai" and "MUMBAI"
+are all stored as "Mumbai". Records are canonicalized once at write time
+(registration, imports, job postings) and `python manage.py normalize`
+rewrites existing data the same way.
+
+Every canonical label also has a small integer ID (its position in the
+vocabulary), which in-memory encodings such as matching.SeekerMatrix use
+instead of comparing strings. IDs of the built-in labels are fixed;
+values outside the vocabulary (a city not in the list) are interned on
+first sight and get the next free ID for the life of the process. The
+JSON files keep labels, not IDs.
+"""
+import re
+import string
+import threading
+
+_FOLD = re.compile(r"[\s\-_.,/]+")
+
+
+def fold(value):
+    """Case- and punctuation-insensitive lookup key for a label"""
+    if not isinstance(value, str):
+        return ""
+    return _FOLD.sub(" ", value.casefold()).strip()
+
+
+class Vocabulary:
+    """Canonical labels with aliases, each label interned to a small int ID"""
+
+    def __init__(self, name, labels, aliases=None, extensible=True):
+        self.name = name
+        self.labels = []
+        self.extensible = extensible
+        self._ids = {}
+        self._lock = threading.Lock()
+        for label in labels:
+            self._intern(label)
+        for alias, label in (aliases or {}).items():
+            self._ids[fold(alias)] = self._ids[fold(label)]
+        # The built-in labels, for option lists
+        self.builtin = list(self.labels)
+
+    def _intern(self, label):
+        key = fold(label)
+        if key not in self._ids:
+            self._ids[key] = len(self.labels)
+            self.labels.append(label)
+        return self._ids[key]
+
+    def id_of(self, value):
+        """Return the ID of a label or alias, interning unknown values. -1 if blank/unknown"""
+        key = fold(value)
+        if not key:
+            return -1
+        label_id = self._ids.get(key)
+        if label_id is not None:
+            return label_id
+        if not self.extensible:
+            return -1
+        with self._lock:
+            return self._intern(string.capwords(key))
+
+    def label(self, label_id):
+        return self.labels[label_id] if 0 <= label_id < len(self.labels) else ""
+
+    def canonical(self, value):
+        """Return the canonical label for free text (unknown text is tidied up)"""
+        label_id = self.id_of(value)
+        if label_id < 0:
+            return value.strip() if isinstance(value, str) else value
+        return self.labels[label_id]
+
+    def canonical_list(self, values):
+        """Canonicalize a list of labels, dropping blanks and duplicates"""
+        if isinstance(values, str):
+            values = [values]
+        result = []
+        for value in values or []:
+            label = self.canonical(value)
+            if label and label not in result:
+                result.append(label)
+        return result
+
+
+CITY = Vocabulary("city", [
+    "Mumbai", "Delhi", "Bangalore", "Hyderabad", "Chennai", "Kolkata",
+    "Pune", "Ahmedabad", "Jaipur", "Surat", "Lucknow", "Kanpur",
+    "Nagpur", "Indore", "Thane", "Bhopal", "Visakhapatnam", "Pimpri-Chinchwad",
+], aliases={
+    "Bombay": "Mumbai",
+    "New Delhi": "Delhi",
+    "Bengaluru": "Bangalore",
+    "Calcutta": "Kolkata",
+    "Madras": "Chennai",
+    "Poona": "Pune",
+    "Vizag": "Visakhapatnam",
+    "Pimpri": "Pimpri-Chinchwad",
+    "Chinchwad": "Pimpri-Chinchwad",
+})
+
+WORK_TYPE = Vocabulary("work_type", [
+    "Maid", "Cook", "Driver", "Cleaner", "Babysitter", "Gardener",
+    "Security Guard", "Caretaker", "Housekeeper", "Nanny", "Butler",
+    "Personal Assistant", "Laundry Service", "Pet Care", "Electrician", "Plumber", "Other",
+], aliases={
+    "Housemaid": "Maid",
+    "Chef": "Cook",
+    "Chauffeur": "Driver",
+    "Cleaning": "Cleaner",
+    "Babysitting": "Babysitter",
+    "Mali": "Gardener",
+    "Guard": "Security Guard",
+    "Watchman": "Security Guard",
+    "Housekeeping": "Housekeeper",
+    "Laundry": "Laundry Service",
+    "Pet Sitter": "Pet Care",
+})
+
+# Ordered by seniority, so IDs compare as experience levels
+EXPERIENCE = Vocabulary("experience", [
+    "Fresher (0-1 years)", "Experienced (1-3 years)", "Senior (3-5 years)", "Expert (5+ years)",
+], aliases={
+    "Fresher": "Fresher (0-1 years)",
+    "Entry Level (0-1 years)": "Fresher (0-1 years)",
+    "Experienced": "Experienced (1-3 years)",
+    "Mid Level (2-5 years)": "Experienced (1-3 years)",
+    "Senior": "Senior (3-5 years)",
+    "Expert": "Expert (5+ years)",
+    "Senior Level (5+ years)": "Expert (5+ years)",
+}, extensible=False)
+
+AVAILABILITY = Vocabulary("availability", [
+    "Full Time", "Part Time", "Weekends Only", "Flexible Hours", "Night Shifts",
+], aliases={
+    "Weekends": "Weekends Only",
+    "Flexible": "Flexible Hours",
+    "Night Shift": "Night Shifts",
+}, extensible=False)
+
+
+def canonicalize_record(record):
+    """Return a copy of a user or job record with canonical vocabulary fields"""
+    record = dict(record)
+    if isinstance(record.get("city"), str):
+        record["city"] = CITY.canonical(record["city"])
+    work_type = record.get("work_type")
+    if isinstance(work_type, list):
+        record["work_type"] = WORK_TYPE.canonical_list(work_type)
+    elif isinstance(work_type, str):
+        record["work_type"] = WORK_TYPE.canonical(work_type)
+    if isinstance(record.get("experience"), str):
+        record["experience"] = EXPERIENCE.canonical(record["experience"])
+    if "availability" in record and record["availability"] not in (None, ""):
+        record["availability"] = AVAILABILITY.canonical_list(record["availability"])
+    return record